@@ -5,20 +5,33 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.config import settings
+from app.db import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.models import audit_log, password_reset_token, two_factor_auth  # noqa: F401
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# The URL comes from the app settings (DATABASE_URL / .env), not alembic.ini
+config.set_main_option("sqlalchemy.url", str(settings.DATABASE_URL).replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # The search index is maintained outside the metadata (app/utils/search.py, revision 0004)
+    if type_ == "table" and name.startswith("transactions_fts"):
+        return False
+    if name in ("search_vector", "ix_transactions_search"):
+        return False
+    return True
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -42,8 +55,10 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
     )
 
     with context.begin_transaction():
@@ -65,7 +80,11 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite can only add columns in place; batch mode rebuilds tables for the rest
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
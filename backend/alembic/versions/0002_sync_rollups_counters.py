@@ -0,0 +1,129 @@
+"""Columns and tables added since the baseline: rollups, change feed, import fingerprints, counters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:10:00.000000
+
+Also backfills the daily rollups and the unread notification counters from
+the existing rows. The indexes that serve these columns are in 0003.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The PostgreSQL type already exists; it was created with the transactions table
+transaction_type = sa.Enum("income", "expense", name="transactiontype").with_variant(
+    postgresql.ENUM("income", "expense", name="transactiontype", create_type=False), "postgresql"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('type', transaction_type, nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('min_amount', sa.Float(), nullable=False),
+    sa.Column('max_amount', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'category', 'type', 'day', name='uq_rollup_bucket')
+    )
+    op.create_index(op.f('ix_transaction_daily_rollups_id'), 'transaction_daily_rollups', ['id'], unique=False)
+    op.create_table('transaction_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transaction_tombstones_id'), 'transaction_tombstones', ['id'], unique=False)
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('unread_notifications', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+        batch_op.add_column(sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('import_hash', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_transactions_import_hash', ['user_id', 'import_hash'])
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.add_column(sa.Column('revoked_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('export_logs') as batch_op:
+        # Exports written before background jobs existed all finished synchronously
+        batch_op.add_column(sa.Column('status', sa.String(length=20), server_default='completed', nullable=False))
+    with op.batch_alter_table('export_logs') as batch_op:
+        batch_op.alter_column('status', server_default=None)
+    with op.batch_alter_table('family_members') as batch_op:
+        batch_op.create_unique_constraint('uq_family_member', ['family_group_id', 'user_id'])
+
+    _backfill()
+
+
+def _backfill() -> None:
+    transactions = sa.table(
+        'transactions', sa.column('user_id'), sa.column('category'), sa.column('type'),
+        sa.column('date'), sa.column('amount'),
+    )
+    rollups = sa.table(
+        'transaction_daily_rollups', sa.column('user_id'), sa.column('category'), sa.column('type'),
+        sa.column('day'), sa.column('total'), sa.column('count'), sa.column('min_amount'), sa.column('max_amount'),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        day = sa.cast(transactions.c.date, sa.Date)
+    else:
+        day = sa.func.date(transactions.c.date)
+    grouped = sa.select(
+        transactions.c.user_id, transactions.c.category, transactions.c.type, day,
+        sa.func.sum(transactions.c.amount), sa.func.count(), sa.func.min(transactions.c.amount),
+        sa.func.max(transactions.c.amount),
+    ).group_by(transactions.c.user_id, transactions.c.category, transactions.c.type, day)
+    op.execute(rollups.insert().from_select(
+        ['user_id', 'category', 'type', 'day', 'total', 'count', 'min_amount', 'max_amount'], grouped
+    ))
+
+    users = sa.table('users', sa.column('id'), sa.column('unread_notifications'))
+    notifications = sa.table('notifications', sa.column('id'), sa.column('user_id'), sa.column('is_read', sa.Boolean))
+    unread = (
+        sa.select(sa.func.count(notifications.c.id))
+        .where(notifications.c.user_id == users.c.id, notifications.c.is_read == sa.false())
+        .scalar_subquery()
+    )
+    op.execute(users.update().values(unread_notifications=unread))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('family_members') as batch_op:
+        batch_op.drop_constraint('uq_family_member', type_='unique')
+    with op.batch_alter_table('export_logs') as batch_op:
+        batch_op.drop_column('status')
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.drop_column('revoked_at')
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.drop_constraint('uq_transactions_import_hash', type_='unique')
+        batch_op.drop_column('import_hash')
+        batch_op.drop_column('change_seq')
+        batch_op.drop_column('updated_at')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('unread_notifications')
+        batch_op.drop_column('data_version')
+    op.drop_index(op.f('ix_transaction_tombstones_id'), table_name='transaction_tombstones')
+    op.drop_table('transaction_tombstones')
+    op.drop_index(op.f('ix_transaction_daily_rollups_id'), table_name='transaction_daily_rollups')
+    op.drop_table('transaction_daily_rollups')
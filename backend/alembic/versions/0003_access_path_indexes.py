@@ -0,0 +1,63 @@
+"""Indexes matched to the route filters: every per-user read starts with user_id
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:20:00.000000
+
+On PostgreSQL the indexes are built CONCURRENTLY, outside a transaction, so
+large tables stay writable while this runs. IF NOT EXISTS skips indexes that
+were already created by hand.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name, table, columns, extra create_index kwargs
+INDEXES = [
+    ("ix_transactions_user_date", "transactions", ["user_id", "date", "id"], {}),
+    ("ix_transactions_user_category_date", "transactions", ["user_id", "category", "date"], {}),
+    ("ix_transactions_user_change_seq", "transactions", ["user_id", "change_seq"], {}),
+    ("ix_transaction_tombstones_user_seq", "transaction_tombstones", ["user_id", "change_seq"], {}),
+    ("ix_transaction_tombstones_deleted_at", "transaction_tombstones", ["deleted_at"], {}),
+    ("ix_rollups_user_day", "transaction_daily_rollups", ["user_id", "day"], {}),
+    ("ix_budgets_user", "budgets", ["user_id", "id"], {}),
+    ("ix_reminders_user_remind_at", "reminders", ["user_id", "remind_at"], {}),
+    ("ix_reminders_pending_due", "reminders", ["remind_at"], {
+        "postgresql_where": sa.text("is_completed = false"), "sqlite_where": sa.text("is_completed = 0"),
+    }),
+    ("ix_notifications_user_newest", "notifications", ["user_id", "id"], {}),
+    ("ix_notifications_user_unread", "notifications", ["user_id", "id"], {
+        "postgresql_where": sa.text("is_read = false"), "sqlite_where": sa.text("is_read = 0"),
+    }),
+    ("ix_export_logs_user", "export_logs", ["user_id", "id"], {}),
+    ("ix_family_members_user", "family_members", ["user_id"], {}),
+    ("ix_sessions_user_id", "sessions", ["user_id"], {}),
+    ("ix_sessions_expired_at", "sessions", ["expired_at"], {}),
+    ("ix_sessions_revoked_at", "sessions", ["revoked_at"], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # An earlier hand-made version of this index was (is_completed, remind_at), not partial
+        op.drop_index("ix_reminders_pending_due", table_name="reminders", if_exists=True)
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True, **kwargs
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
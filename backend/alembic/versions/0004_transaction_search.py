@@ -0,0 +1,81 @@
+"""Full-text search over transaction descriptions and categories
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:40:00.000000
+
+SQLite gets an FTS5 table kept in sync by triggers, built from the existing
+rows. PostgreSQL gets a stored generated tsvector column (adding it rewrites
+the transactions table under an exclusive lock, so run this in a quiet
+window on large ledgers) and a GIN index built CONCURRENTLY. Neither is on
+Base.metadata; see app/utils/search.py, which this revision mirrors.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE transactions_fts USING fts5(
+        description, category, user_id,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, category, user_id)
+        VALUES (new.id, new.description, new.category, new.user_id);
+    END""",
+    """CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, category, user_id)
+        VALUES ('delete', old.id, old.description, old.category, old.user_id);
+    END""",
+    """CREATE TRIGGER transactions_fts_update AFTER UPDATE OF description, category, user_id ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, category, user_id)
+        VALUES ('delete', old.id, old.description, old.category, old.user_id);
+        INSERT INTO transactions_fts(rowid, description, category, user_id)
+        VALUES (new.id, new.description, new.category, new.user_id);
+    END""",
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS transactions_fts_update",
+    "DROP TRIGGER IF EXISTS transactions_fts_delete",
+    "DROP TRIGGER IF EXISTS transactions_fts_insert",
+    "DROP TABLE IF EXISTS transactions_fts",
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        exists = bind.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'").first()
+        if not exists:  # init_db may already have installed it
+            for statement in SQLITE_UPGRADE:
+                op.execute(statement)
+    elif bind.dialect.name == "postgresql":
+        op.execute(
+            """ALTER TABLE transactions ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(description, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(category, '')), 'B')
+            ) STORED"""
+        )
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_search ON transactions USING gin (search_vector)"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_transactions_search")
+        op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,44 @@
+"""Stored spending forecasts
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:00:00.000000
+
+Empty at first: forecasts are computed on the first request for them, or by
+`python -m app.refresh_forecasts`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('spending_forecasts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.String(length=10), nullable=False),
+    sa.Column('horizon', sa.Integer(), nullable=False),
+    sa.Column('data_version', sa.Integer(), nullable=False),
+    sa.Column('start', sa.Date(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'bucket', 'horizon', name='uq_spending_forecast')
+    )
+    op.create_index(op.f('ix_spending_forecasts_id'), 'spending_forecasts', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_spending_forecasts_id'), table_name='spending_forecasts')
+    op.drop_table('spending_forecasts')
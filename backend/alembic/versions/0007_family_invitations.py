@@ -0,0 +1,42 @@
+"""Family invitations: members join a group by accepting
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 18:00:00.000000
+
+Adding someone to a family used to take only their email, and their totals
+showed up in the group summary straight away. Membership rows now stay
+pending (accepted_at NULL) until the invitee accepts. Group admins created
+their groups and stay accepted; everyone else added before this revision
+never agreed to join, so their rows become pending invitations.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('family_members') as batch_op:
+        batch_op.add_column(sa.Column('accepted_at', sa.DateTime(timezone=True), nullable=True))
+    members = sa.table(
+        'family_members',
+        sa.column('is_admin', sa.Boolean()),
+        sa.column('joined_at', sa.DateTime(timezone=True)),
+        sa.column('accepted_at', sa.DateTime(timezone=True)),
+    )
+    op.execute(members.update().where(members.c.is_admin == sa.true()).values(accepted_at=members.c.joined_at))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('family_members') as batch_op:
+        batch_op.drop_column('accepted_at')
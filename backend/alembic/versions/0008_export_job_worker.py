@@ -0,0 +1,34 @@
+"""Record which worker process runs each export job
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 19:00:00.000000
+
+A starting worker fails only the pending jobs whose worker process on the same
+host has exited, instead of every pending job, so it no longer fails the jobs
+its siblings are still writing. Jobs created before this revision have no
+worker and are left to the EXPORT_JOB_TIMEOUT_SECONDS sweep.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('export_logs') as batch_op:
+        batch_op.add_column(sa.Column('worker', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('export_logs') as batch_op:
+        batch_op.drop_column('worker')
@@ -1,10 +1,10 @@
 from pydantic_settings import BaseSettings
-from pydantic import Field, PostgresDsn
-from typing import List
+from pydantic import Field
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
-    DATABASE_URL: PostgresDsn = Field(..., env="DATABASE_URL")
+    DATABASE_URL: str = Field("sqlite:///./sql_app.db", env="DATABASE_URL")
     JWT_SECRET_KEY: str = Field(..., env="JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -12,8 +12,161 @@ class Settings(BaseSettings):
         "http://localhost:3000",
     ]
 
-    # Rate limit for login attempts per IP (optional add-on)
+    # Serve the migrated routes with AsyncSession (asyncpg / aiosqlite) instead of the threadpool
+    DB_ASYNC: bool = False
+
+    # Connection pool, per worker process: connections kept open, extra ones
+    # allowed under load, seconds to wait for a free one, maximum connection age
+    # and a liveness check on checkout. With N workers the database sees up to
+    # N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections (twice that with DB_ASYNC).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Create missing tables at startup. Convenient for development; deployments
+    # run `alembic upgrade head` and turn this off.
+    DB_CREATE_TABLES: bool = True
+
+    # FastAPI debug mode (tracebacks in error responses); never in production
+    DEBUG: bool = False
+
+    # Production server (python -m app.serve): worker processes (0 = one per
+    # CPU), how long a stopping worker may spend finishing in-flight requests,
+    # idle keep-alive, and an optional request count after which a worker is
+    # replaced (0 = never)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    SERVER_ACCESS_LOG: bool = False
+
+    # Authentication caches: decoded tokens (never kept past their exp) and user
+    # principals. A worker drops its own cached principal when it changes the
+    # user, but other workers keep theirs for up to AUTH_PRINCIPAL_CACHE_TTL_SECONDS:
+    # that is how long a deactivated or deleted user can still be authorised
+    # there, the same bound SESSION_REVOCATION_REFRESH_SECONDS puts on revocations.
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 5
+
+    # Token revocation: how often each worker's background job polls the sessions
+    # table for new revocations (the longest another worker can still accept a
+    # revoked token), and how often each worker's background sweep deletes expired sessions
+    SESSION_REVOCATION_REFRESH_SECONDS: int = 5
+    SESSION_SWEEP_INTERVAL_SECONDS: int = 3600
+
+    # Password hashing: bcrypt cost, worker processes (0 = hash inline) and the
+    # queue depth beyond which login/register answer 503 immediately
+    BCRYPT_ROUNDS: int = 12
+    HASH_POOL_WORKERS: int = 2
+    HASH_POOL_MAX_PENDING: int = 16
+
+    # Rate limit for login/register/forgot-password: attempts per window, counted
+    # separately per client IP and per email (0 disables). Set RATE_LIMIT_REDIS_URL
+    # to share the counters between workers: it needs the redis package
+    # (pip install redis, not in requirements.txt) and any Redis server from
+    # 2.6.12 on. While Redis is unreachable each worker counts on its own.
     LOGIN_RATE_LIMIT: int = 5
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+
+    # Transaction listing: default/maximum page size, streaming chunk size and batch write limit
+    TRANSACTIONS_PAGE_SIZE: int = 50
+    TRANSACTIONS_MAX_PAGE_SIZE: int = 500
+    TRANSACTIONS_STREAM_CHUNK_SIZE: int = 1000
+    TRANSACTIONS_BATCH_MAX_ITEMS: int = 1000
+
+    # Transaction search: page size, how many of the newest matches are ranked
+    # and paged through (the bound on offset), and how many words of a query are used
+    SEARCH_PAGE_SIZE: int = 50
+    SEARCH_MAX_PAGE_SIZE: int = 200
+    SEARCH_WINDOW: int = 1000
+    SEARCH_MAX_TERMS: int = 8
+
+    # Transaction change feed: page size, and how long deletions are remembered
+    # (older cursors get 410 and must resync from scratch)
+    SYNC_PAGE_SIZE: int = 500
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+
+    # Budget status cache, keyed on the user's data_version so writes in any worker make it miss
+    BUDGET_STATUS_CACHE_TTL_SECONDS: int = 300
+    BUDGET_STATUS_CACHE_SIZE: int = 10000
+
+    # Bulk statement import: rows per insert transaction, and how many row errors to report
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    # Request instrumentation: /metrics, N+1 flagging (more than this many SQL
+    # statements in one request) and the slow-request log (0 = off)
+    METRICS_ENABLED: bool = True
+    METRICS_N_PLUS_ONE_THRESHOLD: int = 20
+    METRICS_SLOW_REQUEST_MS: int = 0
+
+    # Reminder scheduler: reminders due within the horizon are kept in memory,
+    # the window is re-read every RELOAD seconds, and notifications are
+    # written BATCH_SIZE at a time
+    REMINDER_SCHEDULER_ENABLED: bool = True
+    REMINDER_SCHEDULER_HORIZON_SECONDS: int = 3600
+    REMINDER_SCHEDULER_RELOAD_SECONDS: int = 60
+    REMINDER_SCHEDULER_BATCH_SIZE: int = 500
+
+    # Notifications: list page size, and the Server-Sent Events stream (how
+    # often each worker looks for new rows, how long it waits for an id skipped
+    # by a not-yet-committed insert, keep-alive interval, events buffered per
+    # connection before it is dropped, and rows replayed on reconnect)
+    NOTIFICATIONS_PAGE_SIZE: int = 50
+    NOTIFICATIONS_MAX_PAGE_SIZE: int = 200
+    SSE_POLL_SECONDS: float = 2.0
+    SSE_POLL_BATCH_SIZE: int = 1000
+    SSE_GAP_SECONDS: float = 10.0
+    SSE_HEARTBEAT_SECONDS: float = 20.0
+    SSE_QUEUE_SIZE: int = 100
+    SSE_CATCHUP_LIMIT: int = 200
+
+    # Family group summaries, cached per group and range until a member's data changes
+    FAMILY_SUMMARY_CACHE_TTL_SECONDS: int = 600
+    FAMILY_SUMMARY_CACHE_SIZE: int = 10000
+
+    # Spending forecasts: days of rollup history fitted, the longest horizon a
+    # client may ask for, and the batch refresh (python -m app.refresh_forecasts):
+    # worker processes (0 = one per CPU) and users read and fitted per task
+    FORECAST_HISTORY_DAYS: int = 730
+    FORECAST_MAX_HORIZON: int = 90
+    FORECAST_WORKERS: int = 0
+    FORECAST_BATCH_USERS: int = 200
+
+    # Spending insights: a transaction is an outlier at INSIGHTS_OUTLIER_Z
+    # standard deviations above the mean of the INSIGHTS_ROLLING_WINDOW earlier
+    # ones in its category (once there are INSIGHTS_MIN_HISTORY of them); a
+    # category spikes when its last INSIGHTS_SPIKE_DAYS days are INSIGHTS_SPIKE_Z
+    # deviations above its earlier windows. Refreshed in the background after writes.
+    INSIGHTS_ROLLING_WINDOW: int = 50
+    INSIGHTS_MIN_HISTORY: int = 8
+    INSIGHTS_OUTLIER_Z: float = 3.0
+    INSIGHTS_SPIKE_DAYS: int = 30
+    INSIGHTS_SPIKE_Z: float = 2.0
+    INSIGHTS_MAX_OUTLIERS: int = 20
+    INSIGHTS_REFRESH_ON_WRITE: bool = True
+
+    # Background export jobs write their files here. Finished files are deleted
+    # after EXPORT_RETENTION_HOURS, and jobs pending for longer than
+    # EXPORT_JOB_TIMEOUT_SECONDS are failed (their worker is gone); each worker
+    # sweeps every EXPORT_SWEEP_INTERVAL_SECONDS. With EXPORT_FAIL_PENDING_ON_STARTUP
+    # on, a starting worker fails the pending jobs whose worker process on this
+    # host has exited; jobs still being written by sibling workers are left alone.
+    EXPORT_DIR: str = "./exports"
+    EXPORT_RETENTION_HOURS: int = 24
+    EXPORT_JOB_TIMEOUT_SECONDS: int = 3600
+    EXPORT_SWEEP_INTERVAL_SECONDS: int = 600
+    EXPORT_FAIL_PENDING_ON_STARTUP: bool = True
 
     class Config:
         env_file = ".env"
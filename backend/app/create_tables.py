@@ -1,6 +1,6 @@
 from app.db import Base, engine
 # Import ALL models so they are registered with SQLAlchemy's metadata
-from app.models import user, session, two_factor_auth, transaction, budget, reminder, notification, export_log, family_group, family_member, password_reset_token, audit_log
+from app.models import user, session, two_factor_auth, transaction, budget, reminder, notification, export_log, family_group, family_member, password_reset_token, audit_log, transaction_rollup, transaction_tombstone
 
 print("Creating tables...")
 Base.metadata.create_all(bind=engine)
@@ -1,20 +0,0 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-
-# If using environment variable for DB URL
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")  # or PostgreSQL URL
-
-# Use connect_args only for SQLite
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-
-engine = create_engine(
-    DATABASE_URL,
-    connect_args=connect_args
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Base class for all models
-Base = declarative_base()
@@ -1,19 +1,112 @@
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+DATABASE_URL = str(settings.DATABASE_URL)
 
 Base = declarative_base()
 
 
+def engine_options(url: str) -> dict:
+    """Pool settings shared by the sync and async engines."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}  # in-memory SQLite uses a single-connection pool that takes no sizing
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+_engine: Optional[Engine] = None
+
+
+def get_engine() -> Engine:
+    # Created on first use, so importing the app (or forking workers from a
+    # preloaded parent) never opens or inherits a connection.
+    global _engine
+    if _engine is None:
+        # Use connect_args only for SQLite
+        connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+        _engine = create_engine(DATABASE_URL, connect_args=connect_args, **engine_options(DATABASE_URL))
+    return _engine
+
+
+def __getattr__(name: str):
+    # `from app.db import engine` keeps working for scripts; the engine is created at that point.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+
+
+def init_db() -> None:
+    """Create any missing tables (DB_CREATE_TABLES); deployments use `alembic upgrade head`."""
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+    from app.utils.search import install_search_index
+
+    Base.metadata.create_all(bind=get_engine())
+    with get_engine().begin() as connection:
+        install_search_index(connection)
+
+
 # Dependency for FastAPI routes to get DB session
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+
+def async_database_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith(("postgresql", "postgres:")):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    # Created on first use so the sync-only mode never needs asyncpg/aiosqlite installed.
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        _async_engine = create_async_engine(async_database_url(DATABASE_URL), **engine_options(DATABASE_URL))
+        _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
+# Dependency for async routes
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections at shutdown; an engine reconnects if it is used again."""
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
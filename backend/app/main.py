@@ -1,18 +1,57 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import auth, transactions, budgets, reminders, export_api, notifications, family
+from starlette.concurrency import run_in_threadpool
+from app.routes import auth, transactions, budgets, reminders, export_api, notifications, family, forecast, insights
 from app.config import settings
-from app.db import engine, Base
-import uvicorn
+from app.db import dispose_engines, init_db
+from app.utils.export_jobs import fail_orphaned_exports, sweep_exports
+from app.utils.hash import shutdown_hash_pool
+from app.utils.insights import shutdown_insights_refresher
+from app.utils.maintenance import periodic_jobs
+from app.utils.metrics import MetricsMiddleware, registry
+from app.utils.notifications import notification_hub
+from app.utils.reminder_scheduler import reminder_scheduler
+from app.utils.sessions import refresh_revocations, sweep_sessions
+
+periodic_jobs.add("export sweep", settings.EXPORT_SWEEP_INTERVAL_SECONDS, sweep_exports)
+periodic_jobs.add("session sweep", settings.SESSION_SWEEP_INTERVAL_SECONDS, sweep_sessions)
+periodic_jobs.add("revocation refresh", settings.SESSION_REVOCATION_REFRESH_SECONDS, refresh_revocations)
+
+
+# Nothing above touches the database: importing this module stays cheap and
+# side-effect free, and everything that connects happens here, per worker.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_CREATE_TABLES:
+        await run_in_threadpool(init_db)
+    if settings.EXPORT_FAIL_PENDING_ON_STARTUP:
+        # Export jobs run inside the process that accepted them; fail those whose process has exited
+        await run_in_threadpool(fail_orphaned_exports)
+    await notification_hub.start()
+    if settings.REMINDER_SCHEDULER_ENABLED:
+        # Push reminder notifications to open streams without waiting for the next poll
+        reminder_scheduler.listeners.append(notification_hub.wake)
+        await reminder_scheduler.start()
+    await periodic_jobs.start()
+    yield
+    await periodic_jobs.stop()
+    await reminder_scheduler.stop()
+    await notification_hub.stop()
+    # Stop the password hashing worker processes with the server
+    shutdown_hash_pool()
+    shutdown_insights_refresher()
+    await dispose_engines()
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Personal Finance Management API",
     description="FastAPI backend with JWT auth, PostgreSQL, SQLAlchemy ORM",
     version="1.0.0",
-    debug=True
+    debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 @app.get("/")
@@ -28,14 +67,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include API routers
+# Per-route latency, SQL and response size metrics, exposed for Prometheus
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# Include API routers. In async mode the AsyncSession versions are registered
+# first so they win for the paths they cover; everything else stays on the
+# sync routers below.
+if settings.DB_ASYNC:
+    from app.routes import async_auth, async_budgets, async_reminders, async_transactions
+
+    app.include_router(async_auth.router, prefix="/auth", tags=["auth"])
+    app.include_router(async_transactions.router, prefix="/transactions", tags=["transactions"])
+    app.include_router(async_budgets.router, prefix="/budgets", tags=["budgets"])
+    app.include_router(async_reminders.router, prefix="/reminders", tags=["reminders"])
+
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
 app.include_router(budgets.router, prefix="/budgets", tags=["budgets"])
 app.include_router(reminders.router, prefix="/reminders", tags=["reminders"])
 app.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 app.include_router(family.router, prefix="/family", tags=["family"])
+app.include_router(forecast.router, prefix="/forecast", tags=["forecast"])
+app.include_router(insights.router, prefix="/insights", tags=["insights"])
 app.include_router(export_api.router, prefix="/export", tags=["export"])
 
+# Development server with auto-reload; production uses `python -m app.serve`
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
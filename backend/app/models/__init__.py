@@ -0,0 +1,19 @@
+# Import every model whose relationships are complete, so the User mapper can
+# resolve its relationship targets whichever model a script imports first.
+# audit_log, password_reset_token and two_factor_auth stay out until their
+# back-references on User are enabled.
+from app.models import (  # noqa: F401
+    budget,
+    export_log,
+    family_group,
+    family_member,
+    notification,
+    reminder,
+    session,
+    spending_forecast,
+    spending_insights,
+    transaction,
+    transaction_rollup,
+    transaction_tombstone,
+    user,
+)
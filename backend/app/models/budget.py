@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum, Index
 from sqlalchemy.orm import relationship
 from app.db import Base
 import enum
@@ -11,6 +11,7 @@ class BudgetCycle(str, enum.Enum):
 
 class Budget(Base):
     __tablename__ = "budgets"
+    __table_args__ = (Index("ix_budgets_user", "user_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
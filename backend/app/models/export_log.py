@@ -1,15 +1,18 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import relationship
 from app.db import Base
 
 
 class ExportLog(Base):
     __tablename__ = "export_logs"
+    __table_args__ = (Index("ix_export_logs_user", "user_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    format = Column(String(10), nullable=False)  # csv, pdf
+    format = Column(String(10), nullable=False)  # csv, ndjson, xlsx
     file_path = Column(String(1024), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, completed, failed, expired (file deleted)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    worker = Column(String(255), nullable=True)  # "host:pid" of the process running the job
 
     user = relationship("User", back_populates="export_logs") 
\ No newline at end of file
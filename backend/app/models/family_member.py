@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, func, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, func, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -11,6 +11,14 @@ class FamilyMember(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     is_admin = Column(Boolean, default=False)
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
+    # NULL while the invitation is pending: only accepted members see the group or appear in its summary
+    accepted_at = Column(DateTime(timezone=True), nullable=True)
 
     family_group = relationship("FamilyGroup", back_populates="members")
-    user = relationship("User", back_populates="family_memberships") 
\ No newline at end of file
+    user = relationship("User", back_populates="family_memberships")
+
+    __table_args__ = (
+        UniqueConstraint("family_group_id", "user_id", name="uq_family_member"),
+        Index("ix_family_members_user", "user_id"),
+    )
+ 
\ No newline at end of file
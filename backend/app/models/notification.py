@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -13,4 +13,14 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    user = relationship("User", back_populates="notifications") 
\ No newline at end of file
+    user = relationship("User", back_populates="notifications")
+
+    # Newest-first keyset pages of one user's notifications, and of the unread ones
+    __table_args__ = (
+        Index("ix_notifications_user_newest", "user_id", "id"),
+        Index(
+            "ix_notifications_user_unread", "user_id", "id",
+            postgresql_where=text("is_read = false"), sqlite_where=text("is_read = 0"),
+        ),
+    )
+ 
\ No newline at end of file
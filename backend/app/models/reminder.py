@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.db import Base
 
 
 class Reminder(Base):
     __tablename__ = "reminders"
+    __table_args__ = (
+        Index("ix_reminders_user_remind_at", "user_id", "remind_at"),
+        # Only pending reminders, which is all the scheduler ever reads
+        Index(
+            "ix_reminders_pending_due", "remind_at",
+            postgresql_where=text("is_completed = false"), sqlite_where=text("is_completed = 0"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
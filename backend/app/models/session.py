@@ -6,10 +6,11 @@ class SessionModel(Base):
     __tablename__ = "sessions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     jti = Column(String(255), unique=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    expired_at = Column(DateTime, nullable=True)
+    expired_at = Column(DateTime, nullable=True, index=True)
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(String(255), nullable=True)
     is_active = Column(Boolean, default=True)
+    revoked_at = Column(DateTime, nullable=True, index=True)
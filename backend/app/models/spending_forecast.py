@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, JSON, UniqueConstraint, func
+from app.db import Base
+
+
+class SpendingForecast(Base):
+    """A computed forecast, valid while the user's data_version and the first forecast period are unchanged."""
+
+    __tablename__ = "spending_forecasts"
+    __table_args__ = (UniqueConstraint("user_id", "bucket", "horizon", name="uq_spending_forecast"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    bucket = Column(String(10), nullable=False)  # day, week, month
+    horizon = Column(Integer, nullable=False)
+    data_version = Column(Integer, nullable=False)
+    start = Column(Date, nullable=False)
+    payload = Column(JSON, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
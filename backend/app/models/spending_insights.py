@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, JSON, func
+from app.db import Base
+
+
+class SpendingInsights(Base):
+    """A user's computed insights, valid while their data_version and the day they were computed on are unchanged."""
+
+    __tablename__ = "spending_insights"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True)
+    data_version = Column(Integer, nullable=False)
+    computed_on = Column(Date, nullable=False)
+    payload = Column(JSON, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db import Base
 import enum
@@ -11,6 +11,13 @@ class TransactionType(str, enum.Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "import_hash", name="uq_transactions_import_hash"),
+        Index("ix_transactions_user_change_seq", "user_id", "change_seq"),
+        # Listing, keyset pages and date-range summaries; category filters and budget windows
+        Index("ix_transactions_user_date", "user_id", "date", "id"),
+        Index("ix_transactions_user_category_date", "user_id", "category", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -20,5 +27,8 @@ class Transaction(Base):
     description = Column(String(255), nullable=True)
     date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0")  # users.data_version of the last write
+    import_hash = Column(String(64), nullable=True)  # Fingerprint of bulk-imported rows, for idempotent re-imports
 
     user = relationship("User", back_populates="transactions") 
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Enum, Index, UniqueConstraint
+from app.db import Base
+from app.models.transaction import TransactionType
+
+
+class TransactionDailyRollup(Base):
+    __tablename__ = "transaction_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category", "type", "day", name="uq_rollup_bucket"),
+        Index("ix_rollups_user_day", "user_id", "day"),  # timeseries and family summaries over a date range
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category = Column(String(100), nullable=False)
+    type = Column(Enum(TransactionType), nullable=False)
+    day = Column(Date, nullable=False)
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+    min_amount = Column(Float, nullable=False)
+    max_amount = Column(Float, nullable=False)
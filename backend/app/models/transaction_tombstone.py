@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, func
+from app.db import Base
+
+
+class TransactionTombstone(Base):
+    """Marks a deleted transaction for the change feed; purged after SYNC_TOMBSTONE_RETENTION_DAYS."""
+
+    __tablename__ = "transaction_tombstones"
+    __table_args__ = (Index("ix_transaction_tombstones_user_seq", "user_id", "change_seq"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    transaction_id = Column(Integer, nullable=False)
+    change_seq = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -10,6 +10,8 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on every write; drives ETags
+    unread_notifications = Column(Integer, nullable=False, default=0, server_default="0")  # Counter cache for the badge
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -19,8 +21,8 @@ class User(Base):
     transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
     budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan")
     reminders = relationship("Reminder", back_populates="user", cascade="all, delete-orphan")
-    #notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
-    #export_logs = relationship("ExportLog", back_populates="user", cascade="all, delete-orphan")
-    #family_memberships = relationship("FamilyMember", back_populates="user", cascade="all, delete-orphan")
+    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+    export_logs = relationship("ExportLog", back_populates="user", cascade="all, delete-orphan")
+    family_memberships = relationship("FamilyMember", back_populates="user", cascade="all, delete-orphan")
     #password_reset_tokens = relationship("PasswordResetToken", back_populates="user", cascade="all, delete-orphan")
     #audit_logs = relationship("AuditLog", back_populates="user", cascade="all, delete-orphan") 
\ No newline at end of file
@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app.config import settings
+from app.db import Base, SessionLocal, engine
+from app.models import budget, export_log, reminder, transaction, user  # noqa: F401
+from app.models.transaction_tombstone import TransactionTombstone
+
+# Run daily (cron). Change-feed cursors older than the retention period are
+# rejected with 410, so their clients never miss a purged deletion.
+Base.metadata.create_all(bind=engine, tables=[TransactionTombstone.__table__])
+cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+db = SessionLocal()
+try:
+    result = db.execute(delete(TransactionTombstone).filter(TransactionTombstone.deleted_at < cutoff))
+    db.commit()
+    print(f"Done. {result.rowcount} tombstones older than {cutoff:%Y-%m-%d} removed.")
+finally:
+    db.close()
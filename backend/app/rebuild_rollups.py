@@ -0,0 +1,24 @@
+import argparse
+
+from app.db import Base, SessionLocal, engine
+from app.models import transaction_rollup
+from app.utils.rollups import find_rollup_mismatches, rebuild_rollups
+
+parser = argparse.ArgumentParser(description="Backfill or verify the transaction daily rollups.")
+parser.add_argument("--user-id", type=int, default=None, help="Only process this user")
+parser.add_argument("--check", action="store_true", help="Compare rollups with the raw table instead of rebuilding")
+args = parser.parse_args()
+
+Base.metadata.create_all(bind=engine, tables=[transaction_rollup.TransactionDailyRollup.__table__])
+db = SessionLocal()
+try:
+    if args.check:
+        mismatches = find_rollup_mismatches(db, args.user_id)
+        for key, expected, actual in mismatches:
+            print("Mismatch", key, "expected", expected, "got", actual)
+        print(f"{len(mismatches)} mismatched buckets.")
+        raise SystemExit(1 if mismatches else 0)
+    print("Rebuilding rollups...")
+    print(f"Done. {rebuild_rollups(db, args.user_id)} buckets written.")
+finally:
+    db.close()
@@ -0,0 +1,13 @@
+from app.db import SessionLocal
+from app.models import budget, export_log, notification, reminder, transaction, user  # noqa: F401
+from app.utils.notifications import recount_unread
+
+# Rebuild users.unread_notifications from the notifications table: once after
+# adding the column, and whenever the badge and the list disagree.
+db = SessionLocal()
+try:
+    changed = recount_unread(db)
+    db.commit()
+    print(f"Done. {changed} unread counters corrected.")
+finally:
+    db.close()
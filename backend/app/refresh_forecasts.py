@@ -0,0 +1,30 @@
+import argparse
+import time
+
+from app.db import Base, SessionLocal, engine
+from app.models import spending_forecast
+from app.schemas.transaction import SummaryBucket
+from app.utils.forecast import DEFAULT_HORIZON, refresh_forecasts
+
+# Run after hours (cron) so that /forecast is answered from the table; a
+# forecast that goes stale in between is recomputed by the first request for it.
+# The guard matters: the worker processes import this module again.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the stale spending forecasts of every user.")
+    parser.add_argument("--bucket", action="append", choices=[b.value for b in SummaryBucket],
+                        help="Bucket to forecast (repeatable; default: all, each with its default horizon)")
+    parser.add_argument("--horizon", type=int, default=None, help="Periods to forecast (default: the bucket's default)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: FORECAST_WORKERS)")
+    parser.add_argument("--force", action="store_true", help="Recompute current forecasts too")
+    args = parser.parse_args()
+
+    buckets = [SummaryBucket(b) for b in args.bucket] if args.bucket else list(SummaryBucket)
+    targets = [(bucket, args.horizon or DEFAULT_HORIZON[bucket]) for bucket in buckets]
+    Base.metadata.create_all(bind=engine, tables=[spending_forecast.SpendingForecast.__table__])
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = refresh_forecasts(db, targets, args.workers, args.force)
+        print(f"Done. {written} forecasts written in {time.perf_counter() - started:.1f}s.")
+    finally:
+        db.close()
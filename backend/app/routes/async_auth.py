@@ -0,0 +1,89 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Security
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_db
+from app.models.user import User
+from app.routes.auth import api_key_header, ensure_active, user_id_from_token
+from app.schemas.auth import UserCreate, UserLogin, Token, UserOut
+from app.utils.auth_cache import Principal, cache_principal, get_cached_principal
+from app.utils.etag import data_version_stmt, etag_matches, make_etag
+from app.utils.hash import submit_hash, submit_verify_and_update
+from app.utils.rate_limit import enforce_rate_limit
+from app.utils.sessions import issue_session_token
+
+router = APIRouter()
+
+
+async def get_current_user_async(
+    token: str = Security(api_key_header), db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    user_id = user_id_from_token(token)
+    principal = get_cached_principal(user_id)
+    if principal is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal = cache_principal(user)
+    return ensure_active(principal)
+
+
+async def conditional_get_async(
+    request: Request,
+    response: Response,
+    user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> str:
+    etag = make_etag(request, user.id, await db.scalar(data_version_stmt(user.id)) or 0)
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
+
+
+@router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
+async def register(user_in: UserCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
+    enforce_rate_limit("register", request, user_in.email)
+    existing = await db.scalar(select(User.id).filter(User.email == user_in.email))
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    # bcrypt is CPU-bound; it runs in the hashing process pool. The rollback
+    # hands the pooled connection back while it does.
+    await db.rollback()
+    hashed = await asyncio.wrap_future(submit_hash(user_in.password))
+    new_user = User(email=user_in.email, hashed_password=hashed, is_active=True, is_superuser=False)
+    db.add(new_user)
+    await db.commit()
+    return new_user
+
+
+@router.post("/login", response_model=Token)
+async def login(user_in: UserLogin, request: Request, db: AsyncSession = Depends(get_async_db)):
+    enforce_rate_limit("login", request, user_in.email)
+    user = await db.scalar(select(User).filter(User.email == user_in.email))
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    user_id, hashed_password, is_active = user.id, user.hashed_password, user.is_active
+    await db.rollback()
+    verified, new_hash = await asyncio.wrap_future(submit_verify_and_update(user_in.password, hashed_password))
+    if not verified:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+
+    if not is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+    if new_hash:
+        await db.execute(update(User).filter(User.id == user_id).values(hashed_password=new_hash))
+
+    access_token = await db.run_sync(
+        issue_session_token, user_id, request.client.host if request.client else None, request.headers.get("user-agent")
+    )
+    return Token(access_token=access_token)
+
+
+@router.get("/me", response_model=UserOut)
+async def get_profile(current_user: Principal = Depends(get_current_user_async)):
+    return current_user
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.db import get_async_db
+from app.models.budget import Budget
+from app.models.user import User
+from app.routes.async_auth import conditional_get_async, get_current_user_async
+from app.schemas.budget import BudgetCreate, BudgetOut, BudgetStatus
+from app.routes.budgets import BUDGET_COLUMNS
+from app.utils.budget_status import get_budget_status
+from app.utils.etag import bump_data_version
+from app.utils.fast_read import FastJSONResponse, as_dicts
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[BudgetOut])
+async def get_budgets(
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+    etag: str = Depends(conditional_get_async),
+):
+    budgets = as_dicts(await db.execute(select(*BUDGET_COLUMNS).filter(Budget.user_id == user.id)))
+    return FastJSONResponse(budgets, headers={"ETag": etag})
+
+
+@router.get("/status", response_model=List[BudgetStatus], dependencies=[Depends(conditional_get_async)])
+async def get_budgets_status(user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(get_budget_status, user.id)
+
+
+@router.post("", response_model=BudgetOut, status_code=status.HTTP_201_CREATED)
+async def create_budget(
+    budget_in: BudgetCreate,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    existing = await db.scalar(
+        select(Budget.id).filter(
+            Budget.user_id == user.id,
+            Budget.category == budget_in.category,
+            Budget.cycle == budget_in.cycle,
+        )
+    )
+    if existing:
+        raise HTTPException(status_code=409, detail="Budget for this category and cycle already exists")
+
+    budget = Budget(
+        user_id=user.id,
+        amount_limit=budget_in.amount_limit,
+        cycle=budget_in.cycle,
+        category=budget_in.category,
+    )
+    db.add(budget)
+    await db.run_sync(bump_data_version, user.id)
+    await db.commit()
+    return budget
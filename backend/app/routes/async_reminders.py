@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.db import get_async_db
+from app.models.reminder import Reminder
+from app.models.user import User
+from app.routes.async_auth import conditional_get_async, get_current_user_async
+from app.routes.reminders import REMINDER_COLUMNS
+from app.schemas.reminder import ReminderCreate, ReminderOut
+from app.utils.etag import bump_data_version
+from app.utils.fast_read import FastJSONResponse, as_dicts
+from app.utils.reminder_scheduler import reminder_scheduler
+
+router = APIRouter()
+
+
+@router.post("", response_model=ReminderOut, status_code=status.HTTP_201_CREATED)
+async def add_reminder(
+    reminder_in: ReminderCreate,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    reminder = Reminder(
+        user_id=user.id,
+        title=reminder_in.title,
+        description=reminder_in.description,
+        remind_at=reminder_in.remind_at,
+    )
+    db.add(reminder)
+    await db.run_sync(bump_data_version, user.id)
+    await db.commit()
+    await db.refresh(reminder)
+    reminder_scheduler.schedule(reminder.id, reminder.remind_at)
+    return reminder
+
+
+@router.get("", response_model=List[ReminderOut])
+async def list_reminders(
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+    etag: str = Depends(conditional_get_async),
+):
+    stmt = select(*REMINDER_COLUMNS).filter(Reminder.user_id == user.id).order_by(Reminder.remind_at)
+    return FastJSONResponse(as_dicts(await db.execute(stmt)), headers={"ETag": etag})
+
+
+@router.delete("/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_reminder(
+    reminder_id: int,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    reminder = await db.scalar(select(Reminder).filter(Reminder.id == reminder_id, Reminder.user_id == user.id))
+    if not reminder:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    await db.delete(reminder)
+    await db.run_sync(bump_data_version, user.id)
+    await db.commit()
+    reminder_scheduler.unschedule(reminder_id)
+    return None
@@ -0,0 +1,140 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.config import settings
+from app.db import get_async_db, get_async_sessionmaker
+from app.models.transaction import Transaction
+from app.models.transaction_tombstone import TransactionTombstone
+from app.models.user import User
+from app.routes.async_auth import conditional_get_async, get_current_user_async
+from app.routes.transactions import TRANSACTION_COLUMNS, after_cursor, apply_filters, transaction_filters
+from app.schemas.transaction import TransactionCreate, TransactionOut, TransactionPage, TransactionUpdate
+from app.utils.cache import transactions_changed
+from app.utils.etag import bump_data_version
+from app.utils.fast_read import FastJSONResponse, as_dicts, ndjson_line
+from app.utils.metrics import count_rows
+from app.utils.pagination import encode_cursor
+from app.utils.rollups import add_to_rollup, refresh_rollup
+
+router = APIRouter()
+
+
+async def _stream_transactions(stmt):
+    # Own session: the request-scoped one is closed before the body is sent.
+    count = 0
+    try:
+        async with get_async_sessionmaker()() as db:
+            result = await db.stream(stmt.execution_options(yield_per=settings.TRANSACTIONS_STREAM_CHUNK_SIZE))
+            keys = list(result.keys())
+            async for row in result:
+                count += 1
+                yield ndjson_line(keys, row)
+    finally:
+        count_rows(count)
+
+
+@router.get("", response_model=TransactionPage)
+async def list_transactions(
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+    filters: dict = Depends(transaction_filters),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(settings.TRANSACTIONS_PAGE_SIZE, ge=1, le=settings.TRANSACTIONS_MAX_PAGE_SIZE),
+    stream: bool = Query(False, description="Stream every matching row as NDJSON instead of a single page"),
+    etag: str = Depends(conditional_get_async),
+):
+    stmt = apply_filters(select(*TRANSACTION_COLUMNS), user.id, filters)
+    if cursor:
+        stmt = after_cursor(stmt, cursor)
+    stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    if stream:
+        return StreamingResponse(
+            _stream_transactions(stmt), media_type="application/x-ndjson", headers={"ETag": etag}
+        )
+
+    transactions = as_dicts(await db.execute(stmt.limit(limit + 1)))
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = encode_cursor(transactions[-1]["date"], transactions[-1]["id"])
+    return FastJSONResponse({"items": transactions, "next_cursor": next_cursor}, headers={"ETag": etag})
+
+
+@router.post("", response_model=TransactionOut, status_code=status.HTTP_201_CREATED)
+async def add_transaction(
+    transaction_in: TransactionCreate,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    transaction = Transaction(
+        user_id=user.id,
+        amount=transaction_in.amount,
+        category=transaction_in.category,
+        type=transaction_in.type,
+        description=transaction_in.description,
+        date=transaction_in.date or None,
+        change_seq=await db.run_sync(bump_data_version, user.id),
+    )
+    db.add(transaction)
+    await db.flush()
+    await db.refresh(transaction)
+    await db.run_sync(add_to_rollup, transaction)
+    await db.commit()
+    transactions_changed(user.id)
+    return transaction
+
+
+async def _get_owned(db: AsyncSession, transaction_id: int, user_id: int) -> Transaction:
+    transaction = await db.scalar(
+        select(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user_id)
+    )
+    if not transaction:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return transaction
+
+
+@router.put("/{transaction_id}", response_model=TransactionOut)
+async def edit_transaction(
+    transaction_id: int,
+    transaction_in: TransactionUpdate,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # The users row lock first; see transactions.edit_transaction
+    change_seq = await db.run_sync(bump_data_version, user.id)
+    transaction = await _get_owned(db, transaction_id, user.id)
+    old_bucket = (transaction.category, transaction.type, transaction.date.date())
+    for attr, value in transaction_in.dict(exclude_unset=True).items():
+        setattr(transaction, attr, value)
+    await db.flush()
+    await db.refresh(transaction)
+    new_bucket = (transaction.category, transaction.type, transaction.date.date())
+    await db.run_sync(refresh_rollup, user.id, *old_bucket)
+    if new_bucket != old_bucket:
+        await db.run_sync(refresh_rollup, user.id, *new_bucket)
+    transaction.change_seq = change_seq
+    await db.commit()
+    transactions_changed(user.id)
+    return transaction
+
+
+@router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_transaction(
+    transaction_id: int,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    change_seq = await db.run_sync(bump_data_version, user.id)
+    transaction = await _get_owned(db, transaction_id, user.id)
+    bucket = (transaction.category, transaction.type, transaction.date.date())
+    await db.delete(transaction)
+    await db.flush()
+    await db.run_sync(refresh_rollup, user.id, *bucket)
+    db.add(TransactionTombstone(user_id=user.id, transaction_id=transaction_id, change_seq=change_seq))
+    await db.commit()
+    transactions_changed(user.id)
+    return None
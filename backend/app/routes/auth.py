@@ -1,97 +1,186 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Security
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response, Security
 from sqlalchemy.orm import Session
 from app.schemas.auth import UserCreate, UserLogin, Token, UserOut, ChangePasswordRequest, ForgotPasswordRequest, ResetPasswordRequest
-from app.utils.hash import hash_password, verify_password
+from app.utils.hash import hash_password, verify_and_update, verify_password
 from app.db import get_db
 from app.models.user import User
-from app.utils.jwt import create_access_token, decode_access_token
+from app.utils.sessions import is_revoked, issue_session_token, revoke_sessions
+from app.utils.auth_cache import Principal, cache_principal, decode_token_cached, get_cached_principal, invalidate_user
+from app.utils.etag import data_version_stmt, etag_matches, make_etag
+from app.utils.rate_limit import enforce_rate_limit
 from fastapi.security import APIKeyHeader
 from typing import Optional
 from datetime import timedelta, datetime
+import logging
 import uuid
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Use APIKeyHeader for Bearer token authentication in Swagger UI
 api_key_header = APIKeyHeader(name="Authorization")
 
-def get_current_user(token: str = Security(api_key_header), db: Session = Depends(get_db)):
+def token_payload(token: str) -> dict:
     if not token.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing Bearer token")
     jwt_token = token.split(" ", 1)[1]
     try:
-        payload = decode_access_token(jwt_token)
+        payload = decode_token_cached(jwt_token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    if payload.get("jti") and is_revoked(payload["jti"]):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    return payload
+
+
+def user_id_from_token(token: str) -> int:
+    return int(token_payload(token)["sub"])
+
+
+def ensure_active(principal: Principal) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return principal
+
+
+def get_current_user(token: str = Security(api_key_header), db: Session = Depends(get_db)) -> Principal:
+    # Returns a cached Principal rather than the ORM User, so the common path
+    # costs neither a JWT decode nor a DB round trip.
+    user_id = user_id_from_token(token)
+    principal = get_cached_principal(user_id)
+    if principal is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal = cache_principal(user)
+    return ensure_active(principal)
+
+
+def get_stream_user(
+    request: Request,
+    access_token: Optional[str] = Query(None, description="For EventSource, which cannot send an Authorization header"),
+    db: Session = Depends(get_db),
+) -> Principal:
+    token = request.headers.get("Authorization") or (f"Bearer {access_token}" if access_token else "")
+    return get_current_user(token, db)
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> str:
+    """Answer If-None-Match with 304 before the route runs its query; otherwise return the ETag.
+
+    The header is set on the injected response; routes that return a Response
+    object themselves must pass it along.
+    """
+    etag = make_etag(request, user.id, db.scalar(data_version_stmt(user.id)) or 0)
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
 
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    print("🔥 Register called with:", user_in.dict())
-    
+def register(user_in: UserCreate, request: Request, db: Session = Depends(get_db)):
+    enforce_rate_limit("register", request, user_in.email)
+    logger.debug("Register called for %s", user_in.email)
+
     user = db.query(User).filter(User.email == user_in.email).first()
     if user:
-        print("🚫 Email already exists:", user_in.email)
+        logger.debug("Register refused, email already exists: %s", user_in.email)
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    # Outside the try: a saturated hashing pool must surface as 503, not 500.
+    # The rollback hands the pooled connection back while bcrypt runs.
+    db.rollback()
+    hashed_password = hash_password(user_in.password)
     try:
         new_user = User(
             email=user_in.email,
-            hashed_password=hash_password(user_in.password),
+            hashed_password=hashed_password,
             is_active=True,
             is_superuser=False
         )
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
-        print("✅ User created:", new_user)
+        logger.debug("User %s created for %s", new_user.id, new_user.email)
         return new_user
     except Exception as e:
-        print("❌ Error during register:", e)
+        logger.exception("Register failed for %s", user_in.email)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/login", response_model=Token)
-def login(user_in: UserLogin, db: Session = Depends(get_db)):
+def login(user_in: UserLogin, request: Request, db: Session = Depends(get_db)):
+    # Checked before the user lookup so throttled attempts never reach the DB or bcrypt
+    enforce_rate_limit("login", request, user_in.email)
     user = db.query(User).filter(User.email == user_in.email).first()
-    if not user or not verify_password(user_in.password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    user_id, hashed_password, is_active = user.id, user.hashed_password, user.is_active
+    # Don't hold a pooled connection while bcrypt runs in the hashing pool.
+    db.rollback()
+    verified, new_hash = verify_and_update(user_in.password, hashed_password)
+    if not verified:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
-    if not user.is_active:
+    if not is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
 
-    # Create JWT token with user id as subject
-    access_token = create_access_token(data={"sub": str(user.id)})
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS; upgrade it transparently
+        # (committed together with the session row below).
+        db.query(User).filter(User.id == user_id).update({User.hashed_password: new_hash})
+
+    # Create JWT token with user id as subject and a session row keyed by its jti
+    access_token = issue_session_token(
+        db, user_id, request.client.host if request.client else None, request.headers.get("user-agent")
+    )
 
     return Token(access_token=access_token)
 
 @router.post("/logout")
-def logout(current_user: str = Depends(get_current_user)):
-    # Token revocation implementation can be done here:
-    # For simplicity, you can implement blocklist session based on JWT jti
-    return {"msg": "Logout endpoint placeholder - implement token revocation"}
+def logout(token: str = Security(api_key_header), current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    jti = token_payload(token).get("jti")
+    if jti:
+        revoke_sessions(db, current_user.id, jti)
+    return {"msg": "Logged out"}
+
+@router.post("/logout-all")
+def logout_all(current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    revoked = revoke_sessions(db, current_user.id)
+    return {"msg": f"Logged out of {revoked} sessions"}
 
 @router.get("/me", response_model=UserOut)
-def get_profile(current_user: User = Depends(get_current_user)):
+def get_profile(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 @router.post("/change-password", status_code=status.HTTP_204_NO_CONTENT)
-def change_password(data: ChangePasswordRequest, current_user: User = Depends(), db: Session = Depends(get_db)):
-    if not verify_password(data.old_password, current_user.hashed_password):
+def change_password(
+    data: ChangePasswordRequest,
+    token: str = Security(api_key_header),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not verify_password(data.old_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Old password incorrect")
 
-    current_user.hashed_password = hash_password(data.new_password)
-    db.add(current_user)
+    user.hashed_password = hash_password(data.new_password)
     db.commit()
+    invalidate_user(user.id)
+    # Every other session was opened with the old password; only the one changing it stays signed in
+    revoke_sessions(db, user.id, keep_jti=token_payload(token).get("jti"))
     return None
 
 @router.post("/forgot-password")
-def forgot_password(data: ForgotPasswordRequest, db: Session = Depends(get_db)):
+def forgot_password(data: ForgotPasswordRequest, request: Request, db: Session = Depends(get_db)):
+    enforce_rate_limit("forgot-password", request, data.email)
     # TODO: Generate reset token, send email with reset link
     return {"msg": "Password reset link sent if email exists"}
 
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from fastapi.security import OAuth2PasswordBearer
@@ -6,9 +7,12 @@ from fastapi import Security
 
 from app.db import get_db
 from app.models.budget import Budget, BudgetCycle
-from app.schemas.budget import BudgetCreate, BudgetOut
-from app.routes.auth import get_current_user
+from app.schemas.budget import BudgetCreate, BudgetOut, BudgetStatus
+from app.routes.auth import conditional_get, get_current_user
 from app.models.user import User
+from app.utils.budget_status import get_budget_status
+from app.utils.etag import bump_data_version
+from app.utils.fast_read import FastJSONResponse, as_dicts, columns_for
 from app.schemas.auth import UserCreate, UserLogin, Token
 from app.utils.hash import hash_password, verify_password
 from app.utils.jwt import create_access_token, decode_access_token
@@ -18,10 +22,19 @@ from app.schemas.auth import UserOut
 
 router = APIRouter()
 
+BUDGET_COLUMNS = columns_for(Budget, BudgetOut)
+
 @router.get("", response_model=List[BudgetOut])
-def get_budgets(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    budgets = db.query(Budget).filter(Budget.user_id == user.id).all()
-    return budgets
+def get_budgets(
+    user: User = Depends(get_current_user), db: Session = Depends(get_db), etag: str = Depends(conditional_get)
+):
+    budgets = as_dicts(db.execute(select(*BUDGET_COLUMNS).filter(Budget.user_id == user.id)))
+    return FastJSONResponse(budgets, headers={"ETag": etag})
+
+
+@router.get("/status", response_model=List[BudgetStatus], dependencies=[Depends(conditional_get)])
+def get_budgets_status(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return get_budget_status(db, user.id)
 
 
 @router.post("", response_model=BudgetOut, status_code=status.HTTP_201_CREATED)
@@ -46,6 +59,7 @@ def create_budget(budget_in: BudgetCreate, user: User = Depends(get_current_user
         category=budget_in.category,
     )
     db.add(budget)
+    bump_data_version(db, user.id)
     db.commit()
     db.refresh(budget)
     return budget 
\ No newline at end of file
@@ -1,9 +1,95 @@
 # app/routes/export_api.py
 
-from fastapi import APIRouter
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_db, SessionLocal
+from app.models.export_log import ExportLog
+from app.models.user import User
+from app.routes.auth import get_current_user
+from app.schemas.export import ExportFormat, ExportLogOut
+from app.utils.export_jobs import worker_id
+from app.utils.exporters import EXPORT_FORMATS, export_statement, stream_rows
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _filename(user_id: int, format: str, export_id: Optional[int] = None) -> str:
+    # Jobs started in the same second are told apart by their id
+    job = f"-{export_id}" if export_id is not None else ""
+    return f"transactions-{user_id}-{datetime.utcnow():%Y%m%d%H%M%S}{job}.{format}"
+
 
 @router.get("/")
-def export_data():
-    return {"message": "Exported data"}
+def export_data(format: ExportFormat = Query(ExportFormat.csv), user: User = Depends(get_current_user)):
+    media_type, writer = EXPORT_FORMATS[format.value]
+    return StreamingResponse(
+        writer(stream_rows(export_statement(user.id))),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{_filename(user.id, format.value)}"'},
+    )
+
+
+def run_export_job(export_id: int):
+    db = SessionLocal()
+    try:
+        export = db.query(ExportLog).filter(ExportLog.id == export_id).first()
+        _, writer = EXPORT_FORMATS[export.format]
+        partial = export.file_path + ".part"
+        try:
+            with open(partial, "wb") as out:
+                for chunk in writer(stream_rows(export_statement(export.user_id))):
+                    out.write(chunk)
+            os.replace(partial, export.file_path)
+            export.status = "completed"
+        except Exception:
+            logger.exception("Export %s failed", export_id)
+            if os.path.exists(partial):
+                os.remove(partial)
+            export.status = "failed"
+        db.commit()
+    finally:
+        db.close()
+
+
+@router.post("/jobs", response_model=ExportLogOut, status_code=status.HTTP_202_ACCEPTED)
+def create_export_job(
+    background_tasks: BackgroundTasks,
+    format: ExportFormat = Query(ExportFormat.csv),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    os.makedirs(settings.EXPORT_DIR, exist_ok=True)
+    export = ExportLog(user_id=user.id, format=format.value, file_path="", status="pending", worker=worker_id())
+    db.add(export)
+    db.flush()
+    export.file_path = os.path.join(os.path.abspath(settings.EXPORT_DIR), _filename(user.id, format.value, export.id))
+    db.commit()
+    db.refresh(export)
+    background_tasks.add_task(run_export_job, export.id)
+    return export
+
+
+@router.get("/jobs", response_model=List[ExportLogOut])
+def list_export_jobs(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return db.query(ExportLog).filter(ExportLog.user_id == user.id).order_by(ExportLog.id.desc()).all()
+
+
+@router.get("/jobs/{export_id}/download")
+def download_export(export_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    export = db.query(ExportLog).filter(ExportLog.id == export_id, ExportLog.user_id == user.id).first()
+    if not export:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if export.status != "completed" or not os.path.exists(export.file_path):
+        raise HTTPException(status_code=409, detail=f"Export is {export.status}")
+    media_type, _ = EXPORT_FORMATS[export.format]
+    # FileResponse answers Range requests, so interrupted downloads can resume.
+    return FileResponse(export.file_path, media_type=media_type, filename=os.path.basename(export.file_path))
@@ -1,8 +1,135 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+
+from app.db import get_db
+from app.models.family_group import FamilyGroup
+from app.models.family_member import FamilyMember
+from app.models.user import User
+from app.routes.auth import get_current_user
+from app.schemas.family import FamilyCreate, FamilyGroupOut, FamilyInvite, FamilyMemberOut, FamilySummary
+from app.schemas.transaction import SummaryBucket
+from app.utils.family_summary import get_family_summary, get_members
 
 router = APIRouter()
 
-@router.get("/")
-def get_family_info():
-    return {"message": "This will be your family endpoint"}
 
+def _member_of(db: Session, group_id: int, user_id: int, admin: bool = False) -> List[dict]:
+    """The group's accepted members, or 404 if the user is not one of them (403 if `admin` and they are not an admin)."""
+    members = get_members(db, group_id)
+    me = next((m for m in members if m["user_id"] == user_id), None)
+    if me is None:
+        raise HTTPException(status_code=404, detail="Family group not found")
+    if admin and not me["is_admin"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only a family admin can do this")
+    return members
+
+
+@router.post("", response_model=FamilyGroupOut, status_code=status.HTTP_201_CREATED)
+def create_family(family_in: FamilyCreate, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    group = FamilyGroup(name=family_in.name)
+    group.members.append(FamilyMember(user_id=user.id, is_admin=True, accepted_at=func.now()))
+    db.add(group)
+    db.commit()
+    db.refresh(group)
+    return group
+
+
+@router.get("", response_model=List[FamilyGroupOut])
+def list_families(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return db.scalars(
+        select(FamilyGroup)
+        .join(FamilyMember, FamilyMember.family_group_id == FamilyGroup.id)
+        .filter(FamilyMember.user_id == user.id, FamilyMember.accepted_at.isnot(None))
+        .order_by(FamilyGroup.id)
+    ).all()
+
+
+@router.get("/invitations", response_model=List[FamilyGroupOut])
+def list_invitations(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Groups the user has been invited to and not joined yet."""
+    return db.scalars(
+        select(FamilyGroup)
+        .join(FamilyMember, FamilyMember.family_group_id == FamilyGroup.id)
+        .filter(FamilyMember.user_id == user.id, FamilyMember.accepted_at.is_(None))
+        .order_by(FamilyGroup.id)
+    ).all()
+
+
+@router.post("/{group_id}/accept", response_model=FamilyMemberOut)
+def accept_invitation(group_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    member = db.scalar(
+        select(FamilyMember).filter(
+            FamilyMember.family_group_id == group_id,
+            FamilyMember.user_id == user.id,
+            FamilyMember.accepted_at.is_(None),
+        )
+    )
+    if member is None:
+        raise HTTPException(status_code=404, detail="Invitation not found")
+    member.accepted_at = func.now()
+    db.commit()
+    db.refresh(member)
+    return member
+
+
+@router.get("/{group_id}/members", response_model=List[FamilyMemberOut])
+def list_members(group_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    _member_of(db, group_id, user.id)
+    return db.scalars(select(FamilyMember).filter(FamilyMember.family_group_id == group_id).order_by(FamilyMember.id)).all()
+
+
+@router.post("/members", response_model=FamilyMemberOut, status_code=status.HTTP_201_CREATED)
+def add_member(invite: FamilyInvite, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Invite a user by email; they join, and their totals count, only once they accept."""
+    _member_of(db, invite.family_group_id, user.id, admin=True)
+    invitee = db.scalar(select(User.id).filter(User.email == invite.email))
+    if invitee is None:
+        raise HTTPException(status_code=404, detail="No user with that email")
+    member = FamilyMember(family_group_id=invite.family_group_id, user_id=invitee, is_admin=False)
+    db.add(member)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already a member of or invited to this family")
+    db.refresh(member)
+    return member
+
+
+@router.delete("/{group_id}/members/{member_user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_member(
+    group_id: int, member_user_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)
+):
+    # Anyone may leave or decline an invitation; removing someone else takes an admin
+    if member_user_id != user.id:
+        _member_of(db, group_id, user.id, admin=True)
+    member = db.scalar(
+        select(FamilyMember).filter(FamilyMember.family_group_id == group_id, FamilyMember.user_id == member_user_id)
+    )
+    if member is None:
+        raise HTTPException(status_code=404, detail="Member not found")
+    db.delete(member)
+    db.commit()
+    return None
+
+
+@router.get("/{group_id}/summary", response_model=FamilySummary)
+def family_summary(
+    group_id: int,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    bucket: SummaryBucket = Query(SummaryBucket.month),
+):
+    """Household spending per member, per category and per period.
+
+    Computed with one grouped query over every member's daily rollups and
+    cached until a member's data_version or the membership changes.
+    """
+    members = _member_of(db, group_id, user.id)
+    return get_family_summary(db, group_id, members, start_date, end_date, bucket)
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_db
+from app.models.user import User
+from app.routes.auth import conditional_get, get_current_user
+from app.schemas.forecast import SpendingForecastOut
+from app.schemas.transaction import SummaryBucket
+from app.utils.fast_read import FastJSONResponse
+from app.utils.forecast import DEFAULT_HORIZON, get_forecast
+
+router = APIRouter()
+
+
+@router.get("", response_model=SpendingForecastOut)
+def spending_forecast(
+    bucket: SummaryBucket = Query(SummaryBucket.month),
+    horizon: Optional[int] = Query(None, ge=1, le=settings.FORECAST_MAX_HORIZON, description="Periods to forecast; defaults to 30 days, 8 weeks or 3 months"),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    etag: str = Depends(conditional_get),
+):
+    """Expected spending per category for the current period and the ones after it.
+
+    Fitted from the daily rollups and kept until the user's transactions
+    change or a new period starts.
+    """
+    payload = get_forecast(db, user.id, bucket, horizon or DEFAULT_HORIZON[bucket])
+    return FastJSONResponse(payload, headers={"ETag": etag})
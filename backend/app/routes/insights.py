@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.user import User
+from app.routes.auth import conditional_get, get_current_user
+from app.schemas.insights import SpendingInsightsOut
+from app.utils.fast_read import FastJSONResponse
+from app.utils.insights import get_insights
+
+router = APIRouter()
+
+
+@router.get("", response_model=SpendingInsightsOut)
+def spending_insights(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    etag: str = Depends(conditional_get),
+):
+    """Per-category statistics, unusual transactions, category spikes and recurring charges.
+
+    Recomputed in the background after each transaction write and once a
+    day, so this is normally a single stored row.
+    """
+    return FastJSONResponse(get_insights(db, user.id), headers={"ETag": etag})
@@ -1,7 +1,156 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.config import settings
+from app.db import get_db
+from app.models.notification import Notification
+from app.models.user import User
+from app.routes.auth import conditional_get, get_current_user, get_stream_user
+from app.schemas.notification import MarkReadResult, NotificationIds, NotificationOut, NotificationPage, UnreadCount
+from app.utils.auth_cache import Principal
+from app.utils.fast_read import FastJSONResponse, as_dicts, columns_for
+from app.utils.notifications import NOTIFICATION_STREAM_COLUMNS, add_unread, notification_hub, sse_event
+from app.utils.pagination import decode_id_cursor, encode_id_cursor
 
 router = APIRouter()
 
-@router.get("/") 
-def get_notifications():
-    return {"message": "This will be your notifications endpoint"}
+NOTIFICATION_COLUMNS = columns_for(Notification, NotificationOut)
+
+
+def _unread_count(db: Session, user_id: int) -> int:
+    return db.scalar(select(User.unread_notifications).filter(User.id == user_id)) or 0
+
+
+def _mark_read(db: Session, user_id: int, *filters) -> dict:
+    # Only rows that flip from unread count against the counter, so repeating
+    # a request (or racing another tab) never takes it below the real number.
+    marked = db.execute(
+        update(Notification)
+        .filter(Notification.user_id == user_id, Notification.is_read == False, *filters)  # noqa: E712
+        .values(is_read=True)
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    add_unread(db, {user_id: -len(marked)} if marked else {})
+    unread = _unread_count(db, user_id)
+    db.commit()
+    return {"updated": len(marked), "unread": unread}
+
+
+@router.get("", response_model=NotificationPage)
+def list_notifications(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(settings.NOTIFICATIONS_PAGE_SIZE, ge=1, le=settings.NOTIFICATIONS_MAX_PAGE_SIZE),
+    unread_only: bool = Query(False),
+    etag: str = Depends(conditional_get),
+):
+    stmt = select(*NOTIFICATION_COLUMNS).filter(Notification.user_id == user.id)
+    if unread_only:
+        stmt = stmt.filter(Notification.is_read == False)  # noqa: E712
+    if cursor:
+        stmt = stmt.filter(Notification.id < decode_id_cursor(cursor))
+    # Ids are handed out in creation order, so newest first is id descending
+    stmt = stmt.order_by(Notification.id.desc())
+
+    notifications = as_dicts(db.execute(stmt.limit(limit + 1)))
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        last = notifications[-1]
+        next_cursor = encode_id_cursor(last["id"])
+    return FastJSONResponse({"items": notifications, "next_cursor": next_cursor}, headers={"ETag": etag})
+
+
+@router.get("/unread-count", response_model=UnreadCount)
+def unread_count(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    # A primary-key read of the counter cache, not a COUNT(*) over notifications
+    return {"unread": _unread_count(db, user.id)}
+
+
+@router.post("/{notification_id}/read", response_model=MarkReadResult)
+def mark_read(notification_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    result = _mark_read(db, user.id, Notification.id == notification_id)
+    if not result["updated"]:
+        exists = db.scalar(
+            select(Notification.id).filter(Notification.id == notification_id, Notification.user_id == user.id)
+        )
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Notification not found")
+    return result
+
+
+@router.post("/read", response_model=MarkReadResult)
+def mark_many_read(body: NotificationIds, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Mark the given notifications read; ids that are unknown or already read are ignored."""
+    if len(body.ids) > settings.NOTIFICATIONS_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.NOTIFICATIONS_MAX_PAGE_SIZE} ids per request",
+        )
+    return _mark_read(db, user.id, Notification.id.in_(body.ids))
+
+
+@router.post("/read-all", response_model=MarkReadResult)
+def mark_all_read(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return _mark_read(db, user.id)
+
+
+def _missed_notifications(db: Session, user_id: int, after_id: int) -> list:
+    rows = as_dicts(db.execute(
+        select(*NOTIFICATION_STREAM_COLUMNS)
+        .filter(Notification.user_id == user_id, Notification.id > after_id)
+        .order_by(Notification.id.desc())
+        .limit(settings.SSE_CATCHUP_LIMIT)
+    ))
+    rows.reverse()
+    return rows
+
+
+async def _event_stream(user_id: int, queue, missed: list):
+    replayed = {row["id"] for row in missed}
+    try:
+        yield b"retry: 5000\n\n"
+        for row in missed:
+            yield sse_event(row)
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            event_id, event = item
+            if event_id in replayed:
+                continue  # already replayed above
+            yield event
+    finally:
+        notification_hub.unsubscribe(user_id, queue)
+
+
+@router.get("/stream")
+async def stream_notifications(
+    user: Principal = Depends(get_stream_user),
+    db: Session = Depends(get_db),
+    last_event_id: Optional[int] = Header(None),
+):
+    """Server-Sent Events: one `notification` event per new notification, with its id as the event id.
+
+    Browsers reconnect on their own and send Last-Event-ID, and whatever was
+    created in between (up to SSE_CATCHUP_LIMIT rows) is replayed first.
+    """
+    queue = notification_hub.subscribe(user.id)
+    try:
+        missed = await run_in_threadpool(_missed_notifications, db, user.id, last_event_id) if last_event_id else []
+    except Exception:
+        notification_hub.unsubscribe(user.id, queue)
+        raise
+    finally:
+        db.close()  # give the connection back now; the stream may stay open for hours
+    return StreamingResponse(
+        _event_stream(user.id, queue, missed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,15 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.db import get_db
 from app.models.reminder import Reminder
 from app.schemas.reminder import ReminderCreate, ReminderOut
-from app.routes.auth import get_current_user
+from app.routes.auth import conditional_get, get_current_user
 from app.models.user import User
+from app.utils.etag import bump_data_version
+from app.utils.fast_read import FastJSONResponse, as_dicts, columns_for
+from app.utils.reminder_scheduler import reminder_scheduler
 
 router = APIRouter()
 
+REMINDER_COLUMNS = columns_for(Reminder, ReminderOut)
+
 
 @router.post("", response_model=ReminderOut, status_code=status.HTTP_201_CREATED)
 def add_reminder(reminder_in: ReminderCreate, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -20,15 +26,19 @@ def add_reminder(reminder_in: ReminderCreate, user: User = Depends(get_current_u
         remind_at=reminder_in.remind_at,
     )
     db.add(reminder)
+    bump_data_version(db, user.id)
     db.commit()
     db.refresh(reminder)
+    reminder_scheduler.schedule(reminder.id, reminder.remind_at)
     return reminder
 
 
 @router.get("", response_model=List[ReminderOut])
-def list_reminders(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    reminders = db.query(Reminder).filter(Reminder.user_id == user.id).order_by(Reminder.remind_at).all()
-    return reminders
+def list_reminders(
+    user: User = Depends(get_current_user), db: Session = Depends(get_db), etag: str = Depends(conditional_get)
+):
+    stmt = select(*REMINDER_COLUMNS).filter(Reminder.user_id == user.id).order_by(Reminder.remind_at)
+    return FastJSONResponse(as_dicts(db.execute(stmt)), headers={"ETag": etag})
 
 
 @router.delete("/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -37,5 +47,7 @@ def delete_reminder(reminder_id: int, user: User = Depends(get_current_user), db
     if not reminder:
         raise HTTPException(status_code=404, detail="Reminder not found")
     db.delete(reminder)
+    bump_data_version(db, user.id)
     db.commit()
+    reminder_scheduler.unschedule(reminder_id)
     return None 
\ No newline at end of file
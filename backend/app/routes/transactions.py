@@ -1,38 +1,312 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import and_, case, delete, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+import logging
+from collections import namedtuple
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, time, timezone
 
-from app.db import get_db
+from app.config import settings
+from app.db import get_db, SessionLocal
 from app.models.transaction import Transaction, TransactionType
-from app.schemas.transaction import TransactionCreate, TransactionOut, TransactionUpdate
-from app.routes.auth import get_current_user
+from app.models.transaction_rollup import TransactionDailyRollup as Rollup
+from app.models.transaction_tombstone import TransactionTombstone
+from app.schemas.transaction import (
+    BatchMode,
+    CategoryTotal,
+    ImportReport,
+    PeriodTotal,
+    SearchOrder,
+    SummaryBucket,
+    TransactionChange,
+    TransactionBatch,
+    TransactionBatchResult,
+    TransactionChanges,
+    TransactionCreate,
+    TransactionOut,
+    TransactionPage,
+    TransactionSearchPage,
+    TransactionTotals,
+    TransactionUpdate,
+)
+from app.routes.auth import conditional_get, get_current_user
 from app.models.user import User
+from app.utils.pagination import decode_change_cursor, decode_cursor, encode_change_cursor, encode_cursor
+from app.utils.cache import transactions_changed
+from app.utils.etag import bump_data_version
+from app.utils.fast_read import FastJSONResponse, as_dicts, columns_for, ndjson_line
+from app.utils.metrics import bulk_request, count_rows
+from app.utils.importers import PARSERS, detect_format, import_fingerprint, import_key
+from app.utils.rollups import add_to_rollup, add_to_rollups, period_expr, refresh_rollup
+from app.utils.search import newest_matches, search_statement, search_terms
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
+TRANSACTION_COLUMNS = columns_for(Transaction, TransactionOut)
+CHANGE_COLUMNS = columns_for(Transaction, TransactionChange)
 
-@router.get("", response_model=List[TransactionOut])
-def list_transactions(
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+
+def transaction_filters(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     category: Optional[str] = Query(None),
     type: Optional[TransactionType] = Query(None),
+) -> dict:
+    return {"start_date": start_date, "end_date": end_date, "category": category, "type": type}
+
+
+def apply_filters(query, user_id, filters: dict):
+    query = query.filter(Transaction.user_id == user_id)
+    if filters["start_date"]:
+        query = query.filter(Transaction.date >= filters["start_date"])
+    if filters["end_date"]:
+        query = query.filter(Transaction.date <= filters["end_date"])
+    if filters["category"]:
+        query = query.filter(Transaction.category == filters["category"])
+    if filters["type"]:
+        query = query.filter(Transaction.type == filters["type"])
+    return query
+
+
+SummarySource = namedtuple("SummarySource", "date category type amount count criteria")
+
+
+def _summary_source(user_id, filters: dict) -> SummarySource:
+    """Read the daily rollups when the date range covers whole days, the raw rows otherwise."""
+    start, end = filters["start_date"], filters["end_date"]
+    day_aligned = (
+        (start is None or (start.tzinfo is None and start.time() == time.min))
+        and (end is None or (end.tzinfo is None and end.time() >= time(23, 59, 59)))
+    )
+    if not day_aligned:
+        return SummarySource(
+            Transaction.date,
+            Transaction.category,
+            Transaction.type,
+            Transaction.amount,
+            func.count(Transaction.id),
+            apply_filters(select(Transaction), user_id, filters).whereclause,
+        )
+
+    criteria = [Rollup.user_id == user_id]
+    if start:
+        criteria.append(Rollup.day >= start.date())
+    if end:
+        criteria.append(Rollup.day <= end.date())
+    if filters["category"]:
+        criteria.append(Rollup.category == filters["category"])
+    if filters["type"]:
+        criteria.append(Rollup.type == filters["type"])
+    return SummarySource(
+        Rollup.day, Rollup.category, Rollup.type, Rollup.total, func.coalesce(func.sum(Rollup.count), 0), and_(*criteria)
+    )
+
+
+def _sum_of(source: SummarySource, tx_type: TransactionType):
+    return func.coalesce(func.sum(case((source.type == tx_type, source.amount), else_=0)), 0)
+
+
+def after_cursor(query, cursor: str):
+    cursor_date, cursor_id = decode_cursor(cursor)
+    return query.filter(
+        or_(
+            Transaction.date < cursor_date,
+            and_(Transaction.date == cursor_date, Transaction.id < cursor_id),
+        )
+    )
+
+
+def _stream_transactions(stmt):
+    # Own session: the request-scoped one is closed before the body is sent.
+    db = SessionLocal()
+    count = 0
+    try:
+        result = db.execute(stmt.execution_options(yield_per=settings.TRANSACTIONS_STREAM_CHUNK_SIZE))
+        keys = list(result.keys())
+        for row in result:
+            count += 1
+            yield ndjson_line(keys, row)
+    finally:
+        db.close()
+        count_rows(count)
+
+
+@router.get("", response_model=TransactionPage)
+def list_transactions(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    filters: dict = Depends(transaction_filters),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(settings.TRANSACTIONS_PAGE_SIZE, ge=1, le=settings.TRANSACTIONS_MAX_PAGE_SIZE),
+    stream: bool = Query(False, description="Stream every matching row as NDJSON instead of a single page"),
+    etag: str = Depends(conditional_get),
+):
+    stmt = apply_filters(select(*TRANSACTION_COLUMNS), user.id, filters)
+    if cursor:
+        stmt = after_cursor(stmt, cursor)
+    stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    if stream:
+        return StreamingResponse(
+            _stream_transactions(stmt), media_type="application/x-ndjson", headers={"ETag": etag}
+        )
+
+    transactions = as_dicts(db.execute(stmt.limit(limit + 1)))
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last["date"], last["id"])
+    return FastJSONResponse({"items": transactions, "next_cursor": next_cursor}, headers={"ETag": etag})
+
+
+@router.get("/search", response_model=TransactionSearchPage)
+def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in the description or category; each one matches as a prefix"),
+    order: SearchOrder = Query(SearchOrder.rank),
+    limit: int = Query(settings.SEARCH_PAGE_SIZE, ge=1, le=settings.SEARCH_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, lt=settings.SEARCH_WINDOW, description="Only the newest SEARCH_WINDOW matches are paged through"),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    filters: dict = Depends(transaction_filters),
+    etag: str = Depends(conditional_get),
 ):
-    query = db.query(Transaction).filter(Transaction.user_id == user.id)
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
-    if category:
-        query = query.filter(Transaction.category == category)
-    if type:
-        query = query.filter(Transaction.type == type)
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="The search has no words to match")
+    dialect = db.bind.dialect.name
+    matches = apply_filters(search_statement(dialect, user.id, terms, TRANSACTION_COLUMNS), user.id, filters)
+    hits = newest_matches(matches, dialect)
+    stmt = select(hits)
+    if order == SearchOrder.rank:
+        stmt = stmt.order_by(hits.c.score.desc(), hits.c.date.desc(), hits.c.id.desc())
+    else:
+        stmt = stmt.order_by(hits.c.date.desc(), hits.c.id.desc())
+
+    rows = as_dicts(db.execute(stmt.limit(limit + 1).offset(offset)))
+    next_offset = offset + limit if len(rows) > limit else None
+    return FastJSONResponse({"items": rows[:limit], "next_offset": next_offset}, headers={"ETag": etag})
 
-    transactions = query.order_by(Transaction.date.desc()).all()
-    return transactions
+
+@router.get("/summary", response_model=TransactionTotals, dependencies=[Depends(conditional_get)])
+def summarize_transactions(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    filters: dict = Depends(transaction_filters),
+):
+    source = _summary_source(user.id, filters)
+    stmt = select(
+        _sum_of(source, TransactionType.income), _sum_of(source, TransactionType.expense), source.count
+    ).filter(source.criteria)
+    income, expense, count = db.execute(stmt).one()
+    return {"income": income, "expense": expense, "net": income - expense, "count": count}
+
+
+@router.get("/summary/categories", response_model=List[CategoryTotal], dependencies=[Depends(conditional_get)])
+def summarize_by_category(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    filters: dict = Depends(transaction_filters),
+):
+    source = _summary_source(user.id, filters)
+    total = func.sum(source.amount)
+    stmt = (
+        select(source.category, source.type, total, source.count)
+        .filter(source.criteria)
+        .group_by(source.category, source.type)
+        .order_by(total.desc())
+    )
+    return [
+        {"category": category, "type": tx_type, "total": total, "count": count}
+        for category, tx_type, total, count in db.execute(stmt)
+    ]
+
+
+@router.get("/summary/timeseries", response_model=List[PeriodTotal], dependencies=[Depends(conditional_get)])
+def summarize_by_period(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    filters: dict = Depends(transaction_filters),
+    bucket: SummaryBucket = Query(SummaryBucket.day),
+):
+    source = _summary_source(user.id, filters)
+    period = period_expr(db.bind.dialect.name, bucket, source.date).label("period")
+    stmt = (
+        select(period, _sum_of(source, TransactionType.income), _sum_of(source, TransactionType.expense))
+        .filter(source.criteria)
+        .group_by(period)
+        .order_by(period)
+    )
+    return [{"period": p, "income": income, "expense": expense} for p, income, expense in db.execute(stmt)]
+
+
+def _after_change(seq_column, id_column, change_seq: int, row_id: int):
+    return or_(seq_column > change_seq, and_(seq_column == change_seq, id_column > row_id))
+
+
+@router.get("/changes", response_model=TransactionChanges)
+def transaction_changes(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    since: Optional[str] = Query(None, description="next_cursor of the previous call; omit for a full initial sync"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.TRANSACTIONS_MAX_PAGE_SIZE * 10),
+    etag: str = Depends(conditional_get),
+):
+    """Rows created or updated, and ids deleted, after the cursor, in change order.
+
+    Both scans walk the (user_id, change_seq) indexes, so a sync costs
+    O(changes) no matter how long the ledger is.
+    """
+    now = int(datetime.now(timezone.utc).timestamp())
+    if since:
+        change_seq, row_id, issued_at = decode_change_cursor(since)
+        if now - issued_at > settings.SYNC_TOMBSTONE_RETENTION_DAYS * 86400:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="Cursor expired, a full resync is required")
+    else:
+        change_seq, row_id, issued_at = 0, 0, now
+
+    rows = db.execute(
+        select(*CHANGE_COLUMNS)
+        .filter(Transaction.user_id == user.id, _after_change(Transaction.change_seq, Transaction.id, change_seq, row_id))
+        .order_by(Transaction.change_seq, Transaction.id)
+        .limit(limit + 1)
+    )
+    entries = [(row["change_seq"], row["id"], row) for row in as_dicts(rows)]
+    if since:
+        # An initial sync has nothing to delete on the client, so it skips the tombstones.
+        tombstones = db.execute(
+            select(TransactionTombstone.change_seq, TransactionTombstone.transaction_id)
+            .filter(
+                TransactionTombstone.user_id == user.id,
+                _after_change(TransactionTombstone.change_seq, TransactionTombstone.transaction_id, change_seq, row_id),
+            )
+            .order_by(TransactionTombstone.change_seq, TransactionTombstone.transaction_id)
+            .limit(limit + 1)
+        )
+        entries += [(seq, transaction_id, None) for seq, transaction_id in tombstones]
+        entries.sort(key=lambda entry: entry[:2])
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if entries:
+        change_seq, row_id = entries[-1][:2]
+    # While paging, keep the original timestamp: tombstones past this position
+    # may already be old. Once caught up, everything up to now has been seen.
+    next_cursor = encode_change_cursor(change_seq, row_id, issued_at if has_more else now)
+    return FastJSONResponse(
+        {
+            "changes": [row for _, _, row in entries if row is not None],
+            "deleted": [transaction_id for _, transaction_id, row in entries if row is None],
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        },
+        headers={"ETag": etag},
+    )
 
 
 @router.post("", response_model=TransactionOut, status_code=status.HTTP_201_CREATED)
@@ -44,9 +318,15 @@ def add_transaction(transaction_in: TransactionCreate, user: User = Depends(get_
         type=transaction_in.type,
         description=transaction_in.description,
         date=transaction_in.date or None,
+        change_seq=bump_data_version(db, user.id),
     )
     db.add(transaction)
+    db.flush()
+    # Reload the stored date so the rollup bucket matches what the database holds.
+    db.refresh(transaction, ["date"])
+    add_to_rollup(db, transaction)
     db.commit()
+    transactions_changed(user.id)
     db.refresh(transaction)
     return transaction
 
@@ -58,22 +338,263 @@ def edit_transaction(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    # Take the users row lock before reading anything: it queues this user's
+    # writers, so the row and the rollup buckets are read after any concurrent
+    # write has committed and the recomputed buckets cannot miss its change.
+    change_seq = bump_data_version(db, user.id)
     transaction = db.query(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).first()
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
+    old_bucket = (transaction.category, transaction.type, transaction.date.date())
     for attr, value in transaction_in.dict(exclude_unset=True).items():
         setattr(transaction, attr, value)
+    db.flush()
+    db.refresh(transaction, ["date"])
+    new_bucket = (transaction.category, transaction.type, transaction.date.date())
+    refresh_rollup(db, user.id, *old_bucket)
+    if new_bucket != old_bucket:
+        refresh_rollup(db, user.id, *new_bucket)
+    transaction.change_seq = change_seq
     db.commit()
+    transactions_changed(user.id)
     db.refresh(transaction)
     return transaction
 
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_transaction(transaction_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    change_seq = bump_data_version(db, user.id)  # the row lock first, as in edit_transaction
     transaction = db.query(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).first()
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
+    bucket = (transaction.category, transaction.type, transaction.date.date())
     db.delete(transaction)
+    db.flush()
+    refresh_rollup(db, user.id, *bucket)
+    db.add(TransactionTombstone(user_id=user.id, transaction_id=transaction_id, change_seq=change_seq))
     db.commit()
-    return None 
\ No newline at end of file
+    transactions_changed(user.id)
+    return None
+
+
+def _insert_import_batch(db: Session, user_id: int, batch: list, occurrences: dict) -> int:
+    rows = []
+    for tx in batch:
+        key = import_key(tx.date, tx.amount, tx.description)
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        rows.append({
+            "user_id": user_id,
+            "amount": tx.amount,
+            "category": tx.category,
+            "type": tx.type,
+            "description": tx.description,
+            "date": tx.date,
+            "import_hash": import_fingerprint(key, occurrence),
+        })
+
+    existing = set(db.scalars(
+        select(Transaction.import_hash).filter(
+            Transaction.user_id == user_id, Transaction.import_hash.in_([r["import_hash"] for r in rows])
+        )
+    ))
+    rows = [r for r in rows if r["import_hash"] not in existing]
+    if not rows:
+        return 0
+    change_seq = bump_data_version(db, user_id)
+    for row in rows:
+        row["change_seq"] = change_seq
+
+    stmt = pg_insert(Transaction) if db.bind.dialect.name == "postgresql" else sqlite_insert(Transaction)
+    stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "import_hash"]).returning(
+        Transaction.user_id, Transaction.category, Transaction.type, Transaction.date, Transaction.amount
+    )
+    inserted = db.execute(stmt, rows).all()
+    add_to_rollups(db, inserted)
+    db.commit()
+    return len(inserted)
+
+
+@router.post("/import", response_model=ImportReport)
+def import_transactions(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv, ofx/qfx or qif; guessed from the file name if omitted"),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    bulk_request()  # a statement group per IMPORT_BATCH_SIZE rows, by design
+    format = (format or detect_format(file.filename)).lower()
+    if format not in PARSERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported import format: {format}")
+
+    report = {"format": format, "rows": 0, "imported": 0, "duplicates": 0, "failed": 0, "errors": []}
+    occurrences = {}
+    batch = []
+
+    def flush():
+        imported = _insert_import_batch(db, user.id, batch, occurrences)
+        report["imported"] += imported
+        report["duplicates"] += len(batch) - imported
+        logger.info("Import for user %s: %d rows read, %d imported", user.id, report["rows"], report["imported"])
+        batch.clear()
+
+    for row_number, raw in PARSERS[format](file.file):
+        report["rows"] += 1
+        try:
+            tx = TransactionCreate(**raw)
+            if tx.date is None:
+                raise ValueError("date is required")
+        except (ValidationError, ValueError) as exc:
+            report["failed"] += 1
+            if len(report["errors"]) < settings.IMPORT_MAX_REPORTED_ERRORS:
+                message = "; ".join(e["msg"] for e in exc.errors()) if isinstance(exc, ValidationError) else str(exc)
+                report["errors"].append({"row": row_number, "error": message})
+            continue
+        batch.append(tx)
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+    if report["imported"]:
+        transactions_changed(user.id)
+    return report
+
+
+_BATCH_OPS = ("create", "update", "delete")
+_NOT_NULL_FIELDS = ("amount", "category", "type", "date")
+
+
+def _insert_created(db: Session, user_id: int, items: List[TransactionCreate], change_seq: int) -> list:
+    """Bulk INSERT ... RETURNING, in input order. Items without a date go in a
+    separate statement so they still get the server-side default."""
+    stmt = insert(Transaction).returning(*TRANSACTION_COLUMNS, sort_by_parameter_order=True)
+    rows = [None] * len(items)
+    for dated in (True, False):
+        indexes = [i for i, item in enumerate(items) if (item.date is not None) == dated]
+        if not indexes:
+            continue
+        params = [
+            {**items[i].dict(exclude=None if dated else {"date"}), "user_id": user_id, "change_seq": change_seq}
+            for i in indexes
+        ]
+        for i, row in zip(indexes, db.execute(stmt, params)):
+            rows[i] = row
+    return rows
+
+
+@router.post("/batch", response_model=TransactionBatchResult)
+def batch_transactions(batch: TransactionBatch, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Apply creates, partial updates and deletes in one DB transaction.
+
+    In atomic mode any item that fails validation (unknown id, duplicate id,
+    null for a required field) rejects the whole batch with 409 and nothing is
+    written. In best_effort mode those items are reported and the rest is
+    applied. Database errors abort the batch in both modes.
+    """
+    bulk_request()
+    if len(batch.create) + len(batch.update) + len(batch.delete) > settings.TRANSACTIONS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.TRANSACTIONS_BATCH_MAX_ITEMS} items per batch",
+        )
+
+    results = []
+
+    def fail(op, index, status_code, error, item_id=None):
+        results.append({"op": op, "index": index, "status": status_code, "id": item_id, "error": error})
+
+    # The users row lock comes first, as in edit_transaction, so the targets and
+    # the rollup buckets are read after any concurrent write has committed.
+    change_seq = bump_data_version(db, user.id)
+    ids = {item.id for item in batch.update} | set(batch.delete)
+    targets = {}
+    if ids:
+        targets = {
+            t.id: t for t in db.scalars(select(Transaction).filter(Transaction.user_id == user.id, Transaction.id.in_(ids)))
+        }
+    seen = set()
+    updates, deletes = [], []
+    for index, item in enumerate(batch.update):
+        changes = item.dict(exclude_unset=True, exclude={"id"})
+        if item.id in seen:
+            fail("update", index, 409, "Transaction appears more than once in the batch", item.id)
+        elif item.id not in targets:
+            fail("update", index, 404, "Transaction not found", item.id)
+        elif any(changes.get(field, "") is None for field in _NOT_NULL_FIELDS):
+            fail("update", index, 422, "amount, category, type and date cannot be null", item.id)
+        else:
+            seen.add(item.id)
+            updates.append((index, item.id, changes))
+    for index, transaction_id in enumerate(batch.delete):
+        if transaction_id in seen:
+            fail("delete", index, 409, "Transaction appears more than once in the batch", transaction_id)
+        elif transaction_id not in targets:
+            fail("delete", index, 404, "Transaction not found", transaction_id)
+        else:
+            seen.add(transaction_id)
+            deletes.append((index, transaction_id))
+
+    if results and batch.mode == BatchMode.atomic:
+        db.rollback()
+        results.sort(key=lambda r: (_BATCH_OPS.index(r["op"]), r["index"]))
+        return FastJSONResponse(
+            {"mode": batch.mode, "applied": False, "results": results}, status_code=status.HTTP_409_CONFLICT
+        )
+
+    if batch.create or updates or deletes:
+        buckets = set()
+
+        if deletes:
+            delete_ids = [transaction_id for _, transaction_id in deletes]
+            for transaction_id in delete_ids:
+                t = targets.pop(transaction_id)
+                buckets.add((t.category, t.type, t.date.date()))
+                db.expunge(t)
+            db.execute(delete(Transaction).filter(Transaction.user_id == user.id, Transaction.id.in_(delete_ids)))
+            db.execute(insert(TransactionTombstone), [
+                {"user_id": user.id, "transaction_id": transaction_id, "change_seq": change_seq}
+                for transaction_id in delete_ids
+            ])
+            results += [
+                {"op": "delete", "index": index, "status": 204, "id": transaction_id}
+                for index, transaction_id in deletes
+            ]
+
+        if updates:
+            for _, transaction_id, changes in updates:
+                t = targets[transaction_id]
+                buckets.add((t.category, t.type, t.date.date()))
+                for attr, value in changes.items():
+                    setattr(t, attr, value)
+                t.change_seq = change_seq
+            db.flush()  # the unit of work groups these into executemany UPDATEs
+            stored_dates = dict(db.execute(
+                select(Transaction.id, Transaction.date).filter(Transaction.id.in_([u[1] for u in updates]))
+            ).all())
+            for index, transaction_id, _ in updates:
+                t = targets[transaction_id]
+                buckets.add((t.category, t.type, stored_dates[transaction_id].date()))
+                results.append({
+                    "op": "update", "index": index, "status": 200, "id": transaction_id,
+                    "transaction": {name: getattr(t, name) for name in TransactionOut.model_fields},
+                })
+
+        if batch.create:
+            created = _insert_created(db, user.id, batch.create, change_seq)
+            add_to_rollups(db, created)
+            results += [
+                {"op": "create", "index": index, "status": 201, "id": row.id, "transaction": row._asdict()}
+                for index, row in enumerate(created)
+            ]
+
+        for bucket in buckets:
+            refresh_rollup(db, user.id, *bucket)
+        db.commit()
+        transactions_changed(user.id)
+    else:
+        db.rollback()  # nothing applied: leave data_version, and so the ETags, as they were
+
+    results.sort(key=lambda r: (_BATCH_OPS.index(r["op"]), r["index"]))
+    return FastJSONResponse({"mode": batch.mode, "applied": True, "results": results})
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, constr
 from enum import Enum
 from typing import Optional
+from datetime import date
 
 
 class BudgetCycle(str, Enum):
@@ -23,4 +24,16 @@ class BudgetOut(BudgetBase):
     user_id: int
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+
+class BudgetStatus(BaseModel):
+    budget_id: int
+    category: Optional[str] = None
+    cycle: BudgetCycle
+    amount_limit: float
+    spent: float
+    remaining: float
+    percent_used: float
+    period_start: date
+    period_end: date
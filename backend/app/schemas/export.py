@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+    xlsx = "xlsx"
+
+
+class ExportLogOut(BaseModel):
+    id: int
+    format: ExportFormat
+    status: str
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, EmailStr
+from datetime import date, datetime
 from typing import List, Optional
 
+from app.schemas.transaction import CategoryTotal, PeriodTotal, SummaryBucket, TransactionTotals
+
 
 class FamilyCreate(BaseModel):
     name: str
@@ -16,6 +19,35 @@ class FamilyMemberOut(BaseModel):
     family_group_id: int
     user_id: int
     is_admin: bool
+    accepted_at: Optional[datetime] = None  # None while the invitation is pending
+
+    class Config:
+        orm_mode = True
+
+
+class FamilyGroupOut(BaseModel):
+    id: int
+    name: str
+    created_at: Optional[datetime] = None
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+
+class MemberTotal(BaseModel):
+    user_id: int
+    email: str
+    income: float
+    expense: float
+    count: int
+
+
+class FamilySummary(BaseModel):
+    group_id: int
+    bucket: SummaryBucket
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    totals: TransactionTotals
+    members: List[MemberTotal]
+    categories: List[CategoryTotal]
+    periods: List[PeriodTotal]
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Optional
+
+from app.schemas.transaction import SummaryBucket
+
+
+class ForecastModel(str, Enum):
+    seasonal = "seasonal"  # mean of past periods at the same point of the season
+    smoothing = "smoothing"  # simple exponential smoothing
+    trend = "trend"  # least-squares line
+
+
+class CategoryForecast(BaseModel):
+    category: str
+    model: ForecastModel
+    mean_absolute_error: Optional[float] = None  # of the chosen model on the holdout periods
+    forecast: List[float]
+
+
+class SpendingForecastOut(BaseModel):
+    bucket: SummaryBucket
+    horizon: int
+    periods: List[date]  # start of each forecast period; the first is the current one
+    totals: List[float]
+    categories: List[CategoryForecast]
+    history_periods: int
+    computed_at: datetime
@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+
+class CategoryStats(BaseModel):
+    category: str
+    count: int
+    total: float
+    mean: float
+    std: float
+    p50: float
+    p90: float
+    p99: float
+    recent_total: float  # over the last INSIGHTS_SPIKE_DAYS days
+
+
+class OutlierTransaction(BaseModel):
+    id: int
+    date: date
+    category: str
+    description: Optional[str] = None
+    amount: float
+    typical: float  # mean of the category's preceding transactions
+    z_score: float
+
+
+class CategorySpike(BaseModel):
+    category: str
+    recent_total: float
+    typical_total: float  # mean over the earlier windows of the same length
+    ratio: float
+    z_score: float
+
+
+class RecurringCharge(BaseModel):
+    description: str
+    category: str
+    cadence: str  # weekly, biweekly, monthly, quarterly, yearly
+    interval_days: float
+    amount: float
+    count: int
+    last_date: date
+    next_date: date
+    active: bool  # seen within one and a half intervals
+
+
+class SpendingInsightsOut(BaseModel):
+    transactions: int
+    categories: List[CategoryStats]
+    outliers: List[OutlierTransaction]
+    spikes: List[CategorySpike]
+    recurring: List[RecurringCharge]
+    computed_at: datetime
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
 
 
 class NotificationOut(BaseModel):
@@ -10,4 +11,22 @@ class NotificationOut(BaseModel):
     created_at: datetime
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationOut]
+    next_cursor: Optional[str] = None
+
+
+class NotificationIds(BaseModel):
+    ids: List[int]
+
+
+class UnreadCount(BaseModel):
+    unread: int
+
+
+class MarkReadResult(BaseModel):
+    updated: int
+    unread: int
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, constr
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 
@@ -35,4 +35,113 @@ class TransactionOut(TransactionBase):
     created_at: datetime
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+
+class TransactionPage(BaseModel):
+    items: List[TransactionOut]
+    next_cursor: Optional[str] = None
+
+
+class TransactionSearchHit(TransactionOut):
+    score: float
+
+
+class TransactionSearchPage(BaseModel):
+    items: List[TransactionSearchHit]
+    next_offset: Optional[int] = None
+
+
+class SearchOrder(str, Enum):
+    rank = "rank"  # best matches first
+    date = "date"  # newest matches first
+
+
+class TransactionChange(TransactionOut):
+    updated_at: Optional[datetime] = None
+    change_seq: int
+
+
+class TransactionChanges(BaseModel):
+    changes: List[TransactionChange]
+    deleted: List[int]
+    next_cursor: str
+    has_more: bool
+
+
+
+class SummaryBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class TransactionTotals(BaseModel):
+    income: float
+    expense: float
+    net: float
+    count: int
+
+
+class CategoryTotal(BaseModel):
+    category: str
+    type: TransactionType
+    total: float
+    count: int
+
+
+class PeriodTotal(BaseModel):
+    period: str
+    income: float
+    expense: float
+
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    format: str
+    rows: int
+    imported: int
+    duplicates: int
+    failed: int
+    errors: List[ImportRowError]
+
+
+class BatchMode(str, Enum):
+    atomic = "atomic"  # all-or-nothing: any failed item rejects the whole batch
+    best_effort = "best_effort"  # failed items are reported, the rest is applied
+
+
+class TransactionBatchUpdate(BaseModel):
+    id: int
+    amount: Optional[float] = None
+    category: Optional[constr(strip_whitespace=True, max_length=100)] = None
+    type: Optional[TransactionType] = None
+    description: Optional[constr(max_length=255)] = None
+    date: Optional[datetime] = None
+
+
+class TransactionBatch(BaseModel):
+    mode: BatchMode = BatchMode.atomic
+    create: List[TransactionCreate] = []
+    update: List[TransactionBatchUpdate] = []
+    delete: List[int] = []
+
+
+class BatchItemResult(BaseModel):
+    op: str
+    index: int
+    status: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+    transaction: Optional[TransactionOut] = None
+
+
+class TransactionBatchResult(BaseModel):
+    mode: BatchMode
+    applied: bool
+    results: List[BatchItemResult]
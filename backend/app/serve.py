@@ -0,0 +1,161 @@
+"""Production server: one preloaded parent forking N uvicorn worker processes.
+
+Usage (from backend/, after `alembic upgrade head`):
+    SERVER_WORKERS=4 DB_CREATE_TABLES=false python -m app.serve
+
+The parent imports the application and binds the listening socket once, then
+forks the workers, which share the imported code copy-on-write and start
+serving immediately. Importing app.main opens no connection and starts no
+thread, so nothing unsafe is inherited across the fork; with DB_CREATE_TABLES
+on, the parent creates the tables once before forking. uvloop and httptools
+are used when installed.
+
+SIGTERM or SIGINT drains the server: every worker stops accepting, finishes
+its in-flight requests (at most SERVER_GRACEFUL_TIMEOUT_SECONDS), runs the
+lifespan shutdown and exits; workers still running after that are killed.
+A worker that exits on its own (a crash, or SERVER_MAX_REQUESTS) is replaced.
+"""
+import gc
+import logging
+import os
+import signal
+import sys
+import time
+
+import uvicorn
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.db import DATABASE_URL, get_engine, init_db
+from app.main import app
+
+logger = logging.getLogger("uvicorn.error")
+
+# A worker that dies this soon after starting is probably failing at boot; wait before replacing it
+RESPAWN_BACKOFF_SECONDS = 1.0
+
+
+def worker_count() -> int:
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def server_options() -> dict:
+    return {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "loop": "auto",
+        "http": "auto",
+        "lifespan": "on",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "limit_max_requests": settings.SERVER_MAX_REQUESTS or None,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.SERVER_FORWARDED_ALLOW_IPS,
+        "access_log": settings.SERVER_ACCESS_LOG,
+        "server_header": False,
+    }
+
+
+def spawn_worker(config: uvicorn.Config, sock) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    # Own process group, so a terminal's Ctrl+C reaches only the parent, which
+    # then stops each worker exactly once (a second signal makes uvicorn skip draining).
+    os.setpgid(0, 0)
+    # uvicorn installs its own handlers while serving and re-raises the stop
+    # signal once it has drained; this no-op lets the worker exit with status 0.
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: None)
+    code = 0
+    try:
+        server = uvicorn.Server(config)
+        server.run(sockets=[sock])
+        if not server.started:
+            code = 3  # lifespan startup failed
+    except BaseException:
+        logger.exception("Worker %s crashed", os.getpid())
+        code = 1
+    finally:
+        logging.shutdown()
+        os._exit(code)
+
+
+def reap(workers: dict) -> list:
+    """Collect exited workers without blocking; returns their start times."""
+    exited = []
+    while workers:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if not pid:
+            break
+        started = workers.pop(pid, None)
+        if started is not None:
+            logger.info("Worker %s exited with status %s", pid, os.waitstatus_to_exitcode(status))
+            exited.append(started)
+    return exited
+
+
+def drain(workers: dict) -> None:
+    for pid in workers:
+        os.kill(pid, signal.SIGTERM)
+    deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + 5
+    while workers and time.monotonic() < deadline:
+        reap(workers)
+        time.sleep(0.1)
+    for pid in workers:
+        logger.warning("Worker %s did not stop in time; killing it", pid)
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+
+def main():
+    count = worker_count()
+    if not hasattr(os, "fork"):
+        # Windows: no preloading, uvicorn's own supervisor spawns the workers
+        uvicorn.run("app.main:app", workers=count, **server_options())
+        return
+
+    config = uvicorn.Config(app, **server_options())
+    if settings.DB_CREATE_TABLES:
+        # Once, here, instead of racing in every worker's lifespan; the pool is
+        # emptied so that no connection is shared with the forked workers.
+        init_db()
+        get_engine().dispose()
+        settings.DB_CREATE_TABLES = False
+    sock = config.bind_socket()
+    # Import the database driver here as well (without connecting), so the workers share it
+    make_url(DATABASE_URL).get_dialect().import_dbapi()
+    # Build the OpenAPI schema once here rather than in every worker, and move
+    # everything imported so far out of the garbage collector's reach so that
+    # collections in the workers do not dirty the shared pages.
+    app.openapi()
+    gc.freeze()
+
+    stopping = []
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, _frame: stopping.append(signum))
+
+    workers = {}
+    for _ in range(count):
+        workers[spawn_worker(config, sock)] = time.monotonic()
+    logger.info("Started %d workers (%s)", count, ", ".join(map(str, workers)))
+
+    while not stopping:
+        for started in reap(workers):
+            if stopping:
+                break
+            if time.monotonic() - started < RESPAWN_BACKOFF_SECONDS:
+                time.sleep(RESPAWN_BACKOFF_SECONDS)
+            pid = spawn_worker(config, sock)
+            workers[pid] = time.monotonic()
+            logger.info("Started replacement worker %s", pid)
+        time.sleep(0.2)
+
+    logger.info("Stopping %d workers", len(workers))
+    drain(workers)
+    sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.jwt import decode_access_token
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a User the request path needs, safe to share between requests."""
+
+    id: int
+    email: str
+    is_active: bool
+    is_superuser: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, email=user.email, is_active=user.is_active, is_superuser=user.is_superuser)
+
+
+_token_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS)
+_principal_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def decode_token_cached(token: str) -> Optional[dict]:
+    """decode_access_token, memoised until the token's own exp at the latest."""
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        _token_cache.set(token, payload, ttl=min(remaining, settings.AUTH_TOKEN_CACHE_TTL_SECONDS))
+    return payload
+
+
+def get_cached_principal(user_id: int) -> Optional[Principal]:
+    return _principal_cache.get(user_id)
+
+
+def cache_principal(user) -> Principal:
+    principal = Principal.from_user(user)
+    _principal_cache.set(principal.id, principal)
+    return principal
+
+
+def invalidate_user(user_id: int) -> None:
+    """Call after deactivating a user or changing their password; other workers expire theirs by TTL."""
+    _principal_cache.delete(user_id)
@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.budget import Budget, BudgetCycle
+from app.models.transaction import TransactionType
+from app.models.transaction_rollup import TransactionDailyRollup as Rollup
+from app.utils.cache import TTLCache
+from app.utils.etag import data_version_stmt
+
+# Statuses are cached per (user, data_version, day). Every budget and
+# transaction write bumps data_version in the database, so a write in any
+# worker makes every worker's entry miss; the day is part of the key because
+# the cycle windows move with the calendar.
+_cache = TTLCache(maxsize=settings.BUDGET_STATUS_CACHE_SIZE, ttl=settings.BUDGET_STATUS_CACHE_TTL_SECONDS)
+
+
+def cycle_window(cycle: BudgetCycle, today: date) -> Tuple[date, date]:
+    if cycle == BudgetCycle.weekly:
+        start = today - timedelta(days=today.weekday())
+        return start, start + timedelta(days=6)
+    start = today.replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+
+def _spend_by_category(db: Session, user_id: int, start: date, end: date) -> dict:
+    rows = db.execute(
+        select(Rollup.category, func.sum(Rollup.total))
+        .filter(
+            Rollup.user_id == user_id,
+            Rollup.type == TransactionType.expense,
+            Rollup.day >= start,
+            Rollup.day <= end,
+        )
+        .group_by(Rollup.category)
+    )
+    return dict(rows.all())
+
+
+def compute_budget_status(db: Session, user_id: int, today: date = None) -> List[dict]:
+    """Spent/remaining for every budget, with one grouped rollup query per cycle window."""
+    today = today or date.today()
+    budgets = db.query(Budget).filter(Budget.user_id == user_id).order_by(Budget.id).all()
+
+    windows = {cycle: cycle_window(cycle, today) for cycle in {b.cycle for b in budgets}}
+    spend = {cycle: _spend_by_category(db, user_id, *window) for cycle, window in windows.items()}
+
+    statuses = []
+    for budget in budgets:
+        by_category = spend[budget.cycle]
+        spent = by_category.get(budget.category, 0.0) if budget.category else sum(by_category.values())
+        start, end = windows[budget.cycle]
+        statuses.append({
+            "budget_id": budget.id,
+            "category": budget.category,
+            "cycle": budget.cycle,
+            "amount_limit": budget.amount_limit,
+            "spent": spent,
+            "remaining": budget.amount_limit - spent,
+            "percent_used": round(spent / budget.amount_limit * 100, 2) if budget.amount_limit else 0.0,
+            "period_start": start,
+            "period_end": end,
+        })
+    return statuses
+
+
+def get_budget_status(db: Session, user_id: int) -> List[dict]:
+    today = date.today()
+    # Read before the rollups, so a write in between makes the entry miss rather than go stale
+    key = (user_id, db.scalar(data_version_stmt(user_id)) or 0, today)
+    statuses = _cache.get(key)
+    if statuses is None:
+        statuses = compute_budget_status(db, user_id, today)
+        _cache.set(key, statuses)
+    return statuses
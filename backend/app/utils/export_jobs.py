@@ -0,0 +1,114 @@
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models.export_log import ExportLog
+
+logger = logging.getLogger(__name__)
+
+# Export jobs run as background tasks inside the worker that accepted them, so
+# a job is lost with its process. Each job records its worker ("host:pid");
+# a starting worker fails the pending jobs whose process on this host has
+# exited, leaving its siblings' jobs alone. Jobs pending longer than
+# EXPORT_JOB_TIMEOUT_SECONDS (their worker ran on another host, or its pid was
+# reused) are failed by the periodic sweep, which also deletes files older
+# than EXPORT_RETENTION_HOURS and marks their jobs expired.
+
+
+def worker_id() -> str:
+    # Read on every call: the serve.py parent imports this before forking
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        import ctypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.get_last_error() == 5  # ERROR_ACCESS_DENIED: it exists, under another user
+        code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # it exists, under another user
+    return True
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass  # never written, or another worker got there first
+
+
+def _fail(db, exports: list) -> int:
+    for export in exports:
+        _remove(export.file_path + ".part")
+        export.status = "failed"
+    db.commit()
+    if exports:
+        logger.warning("Marked %d interrupted export jobs failed", len(exports))
+    return len(exports)
+
+
+def fail_orphaned_exports(session_factory=SessionLocal) -> int:
+    """Fail pending jobs whose worker process on this host has exited, and remove their partial files."""
+    host = socket.gethostname()
+    db = session_factory()
+    try:
+        pending = db.scalars(
+            select(ExportLog).filter(ExportLog.status == "pending", ExportLog.worker.like(f"{host}:%"))
+        ).all()
+        orphaned = []
+        for export in pending:
+            pid = export.worker.rsplit(":", 1)[1]
+            if pid.isdigit() and int(pid) != os.getpid() and not _process_alive(int(pid)):
+                orphaned.append(export)
+        return _fail(db, orphaned)
+    finally:
+        db.close()
+
+
+def fail_pending_exports(created_before: datetime, session_factory=SessionLocal) -> int:
+    """Mark jobs still pending from before the given time failed and remove their partial files."""
+    db = session_factory()
+    try:
+        return _fail(db, db.scalars(
+            select(ExportLog).filter(ExportLog.status == "pending", ExportLog.created_at < created_before)
+        ).all())
+    finally:
+        db.close()
+
+
+def sweep_exports(session_factory=SessionLocal) -> int:
+    """Fail interrupted jobs, then delete finished exports past their retention; returns how many expired."""
+    now = datetime.now(timezone.utc)
+    fail_orphaned_exports(session_factory)
+    fail_pending_exports(now - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT_SECONDS), session_factory)
+    db = session_factory()
+    try:
+        exports = db.scalars(
+            select(ExportLog).filter(
+                ExportLog.status.in_(("completed", "failed")),
+                ExportLog.created_at < now - timedelta(hours=settings.EXPORT_RETENTION_HOURS),
+            )
+        ).all()
+        for export in exports:
+            _remove(export.file_path)
+            export.status = "expired"
+        db.commit()
+        return len(exports)
+    finally:
+        db.close()
@@ -0,0 +1,178 @@
+import csv
+import io
+import json
+import zipfile
+from datetime import datetime
+from typing import Iterable, Iterator
+from xml.sax.saxutils import escape
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models.transaction import Transaction
+from app.utils.metrics import count_rows
+
+EXPORT_COLUMNS = ("id", "date", "type", "category", "amount", "description")
+
+
+def export_statement(user_id: int):
+    return (
+        select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.type,
+            Transaction.category,
+            Transaction.amount,
+            Transaction.description,
+        )
+        .filter(Transaction.user_id == user_id)
+        .order_by(Transaction.date, Transaction.id)
+    )
+
+
+def stream_rows(stmt, session_factory=SessionLocal) -> Iterator[tuple]:
+    """Yield plain row tuples from a server-side cursor, yield_per rows at a time."""
+    db = session_factory()
+    count = 0
+    try:
+        result = db.execute(stmt.execution_options(yield_per=settings.TRANSACTIONS_STREAM_CHUNK_SIZE))
+        for row in result:
+            count += 1
+            yield tuple(row)
+    finally:
+        db.close()
+        count_rows(count)
+
+
+def _cell(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):  # enums
+        return value.value
+    return value
+
+
+def csv_chunks(rows: Iterable[tuple], rows_per_chunk: int = 1000) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_cell(v) for v in row])
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(rows: Iterable[tuple], rows_per_chunk: int = 1000) -> Iterator[bytes]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(EXPORT_COLUMNS, map(_cell, row))), separators=(",", ":")))
+        if len(lines) >= rows_per_chunk:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Transactions" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+def _xlsx_row(values) -> str:
+    cells = []
+    for value in values:
+        value = _cell(value)
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c t="n"><v>{value}</v></c>')
+        else:
+            cells.append(f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+    return "<row>" + "".join(cells) + "</row>"
+
+
+def xlsx_chunks(rows: Iterable[tuple], rows_per_chunk: int = 1000) -> Iterator[bytes]:
+    """Minimal single-sheet XLSX (inline strings, no styles) written through a streaming zip."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(EXPORT_COLUMNS).encode())
+            lines = []
+            for row in rows:
+                lines.append(_xlsx_row(row))
+                if len(lines) >= rows_per_chunk:
+                    sheet.write("".join(lines).encode())
+                    lines = []
+                    yield sink.drain()
+            sheet.write("".join(lines).encode())
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", csv_chunks),
+    "ndjson": ("application/x-ndjson", ndjson_chunks),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", xlsx_chunks),
+}
@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.family_member import FamilyMember
+from app.models.transaction import TransactionType
+from app.models.transaction_rollup import TransactionDailyRollup as Rollup
+from app.models.user import User
+from app.schemas.transaction import SummaryBucket
+from app.utils.cache import TTLCache
+from app.utils.rollups import period_expr
+
+# Group summaries are cached per (group, range, bucket) together with the
+# members' (user id, data_version) pairs they were computed from. Members are
+# read from the database on every request, so the check is shared by every
+# worker: a member's write bumps their data_version and a membership change
+# alters the pairs, and either makes the cached summary miss.
+
+_summaries = TTLCache(maxsize=settings.FAMILY_SUMMARY_CACHE_SIZE, ttl=settings.FAMILY_SUMMARY_CACHE_TTL_SECONDS)
+
+
+def get_members(db: Session, group_id: int) -> List[dict]:
+    """The group's accepted members with their current data_version, from one indexed query."""
+    rows = db.execute(
+        select(FamilyMember.user_id, User.email, FamilyMember.is_admin, User.data_version)
+        .join(User, User.id == FamilyMember.user_id)
+        .filter(FamilyMember.family_group_id == group_id, FamilyMember.accepted_at.isnot(None))
+        .order_by(FamilyMember.id)
+    )
+    return [
+        {"user_id": user_id, "email": email, "is_admin": bool(is_admin), "data_version": data_version}
+        for user_id, email, is_admin, data_version in rows
+    ]
+
+
+def compute_family_summary(
+    db: Session, group_id: int, members: List[dict], start: Optional[date], end: Optional[date], bucket: SummaryBucket
+) -> dict:
+    """Totals per member, per category and per period, from one grouped query over the members' daily rollups."""
+    period = period_expr(db.bind.dialect.name, bucket, Rollup.day).label("period")
+    stmt = (
+        select(Rollup.user_id, Rollup.category, Rollup.type, period, func.sum(Rollup.total), func.sum(Rollup.count))
+        .join(FamilyMember, FamilyMember.user_id == Rollup.user_id)
+        .filter(FamilyMember.family_group_id == group_id, FamilyMember.accepted_at.isnot(None))
+        .group_by(Rollup.user_id, Rollup.category, Rollup.type, period)
+    )
+    if start:
+        stmt = stmt.filter(Rollup.day >= start)
+    if end:
+        stmt = stmt.filter(Rollup.day <= end)
+
+    by_member = {m["user_id"]: {**m, "income": 0.0, "expense": 0.0, "count": 0} for m in members}
+    by_category: Dict[tuple, list] = defaultdict(lambda: [0.0, 0])
+    by_period: Dict[str, list] = defaultdict(lambda: [0.0, 0.0])
+    totals = {"income": 0.0, "expense": 0.0, "count": 0}
+    for user_id, category, tx_type, bucket_start, total, count in db.execute(stmt):
+        key = "income" if tx_type == TransactionType.income else "expense"
+        member = by_member.get(user_id)
+        if member is not None:
+            member[key] += total
+            member["count"] += count
+        category_total = by_category[(category, tx_type)]
+        category_total[0] += total
+        category_total[1] += count
+        by_period[bucket_start][0 if key == "income" else 1] += total
+        totals[key] += total
+        totals["count"] += count
+
+    return {
+        "group_id": group_id,
+        "bucket": bucket,
+        "start_date": start,
+        "end_date": end,
+        "totals": {**totals, "net": totals["income"] - totals["expense"]},
+        "members": [
+            {k: v for k, v in m.items() if k not in ("is_admin", "data_version")} for m in by_member.values()
+        ],
+        "categories": sorted(
+            (
+                {"category": category, "type": tx_type, "total": total, "count": count}
+                for (category, tx_type), (total, count) in by_category.items()
+            ),
+            key=lambda c: c["total"],
+            reverse=True,
+        ),
+        "periods": [
+            {"period": p, "income": income, "expense": expense} for p, (income, expense) in sorted(by_period.items())
+        ],
+    }
+
+
+def get_family_summary(
+    db: Session, group_id: int, members: List[dict], start: Optional[date], end: Optional[date], bucket: SummaryBucket
+) -> dict:
+    key = (group_id, start, end, bucket)
+    # Read before the rollups, so a write in between makes the entry miss rather than go stale
+    versions = tuple((m["user_id"], m["data_version"]) for m in members)
+    cached = _summaries.get(key)
+    if cached is not None and cached[0] == versions:
+        return cached[1]
+    summary = compute_family_summary(db, group_id, members, start, end, bucket)
+    _summaries.set(key, (versions, summary))
+    return summary
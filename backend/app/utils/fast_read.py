@@ -0,0 +1,34 @@
+from typing import List, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from app.utils.metrics import count_rows
+
+# Read path for the list endpoints: select only the columns the response schema
+# exposes, keep each row as a plain dict and let orjson encode it. This skips
+# ORM hydration and per-row Pydantic validation; the data comes straight from
+# our own tables, so there is nothing to validate.
+
+
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        # OPT_UTC_Z matches Pydantic's "Z" suffix for UTC datetimes
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def columns_for(model, schema: Type[BaseModel]) -> list:
+    """The mapped columns of `model` named by the fields of `schema`, in field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def as_dicts(result) -> List[dict]:
+    keys = list(result.keys())
+    rows = [dict(zip(keys, row)) for row in result]
+    count_rows(len(rows))
+    return rows
+
+
+def ndjson_line(keys, row) -> bytes:
+    return orjson.dumps(dict(zip(keys, row)), option=orjson.OPT_UTC_Z) + b"\n"
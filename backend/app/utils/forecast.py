@@ -0,0 +1,338 @@
+"""Per-category spending forecasts, fitted with NumPy.
+
+A user's expense history is read from the daily rollups into a
+(categories x periods) matrix, and every model is fitted to all the rows at
+once:
+
+  * seasonal: the mean of past periods at the same point of the season
+    (weekday, week of the year or month of the year);
+  * smoothing: simple exponential smoothing, its alpha chosen per category
+    from a grid by one-step-ahead error;
+  * trend: a least-squares line, extrapolated and floored at zero.
+
+Each category gets the model with the lowest error on its last few periods,
+refitted on the whole history. A category's series starts at its first
+transaction, so a new category is not dragged towards zero by the months
+before it existed.
+
+Results are stored in spending_forecasts with the user's data_version and
+served until it changes (a write to their transactions) or a new period
+starts. `python -m app.refresh_forecasts` recomputes every stale forecast in
+one pass, with a process pool.
+"""
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.spending_forecast import SpendingForecast
+from app.models.transaction import TransactionType
+from app.models.transaction_rollup import TransactionDailyRollup as Rollup
+from app.models.user import User
+from app.schemas.forecast import ForecastModel
+from app.schemas.transaction import SummaryBucket
+from app.utils.etag import data_version_stmt
+
+SEASON = {SummaryBucket.day: 7, SummaryBucket.week: 52, SummaryBucket.month: 12}
+DEFAULT_HORIZON = {SummaryBucket.day: 30, SummaryBucket.week: 8, SummaryBucket.month: 3}
+ALPHAS = np.linspace(0.1, 0.9, 9)[:, None]
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def period_start(bucket: SummaryBucket, day: date) -> date:
+    """Start of the period containing day; weeks start on Monday."""
+    if bucket == SummaryBucket.month:
+        return day.replace(day=1)
+    if bucket == SummaryBucket.week:
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def period_starts(bucket: SummaryBucket, today: date, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Starts of the history periods (complete ones within FORECAST_HISTORY_DAYS) and of the forecast periods."""
+    first = period_start(bucket, today - timedelta(days=settings.FORECAST_HISTORY_DAYS))
+    current = period_start(bucket, today)
+    if bucket == SummaryBucket.month:
+        months = np.arange(np.datetime64(first, "M"), np.datetime64(current, "M") + horizon)
+        starts = months.astype("datetime64[D]")
+    else:
+        step = 7 if bucket == SummaryBucket.week else 1
+        starts = np.arange(np.datetime64(first), np.datetime64(current) + step * horizon, step)
+    history = len(starts) - horizon
+    return starts[:history], starts[history:]
+
+
+def expense_matrix(rows: Sequence[tuple], history: np.ndarray, end: np.datetime64) -> Tuple[List[str], np.ndarray]:
+    """(category, day, total) rows summed into a (categories x history periods) matrix."""
+    if not rows:
+        return [], np.zeros((0, len(history)))
+    categories, days, totals = zip(*rows)
+    # Through ordinals: numpy converts date objects one slow call at a time
+    days = (np.fromiter((day.toordinal() for day in days), dtype=np.int64, count=len(days)) - _EPOCH_ORDINAL).astype("datetime64[D]")
+    period = np.searchsorted(history, days, side="right") - 1
+    keep = (period >= 0) & (days < end)
+    names, index = np.unique(np.array(categories)[keep], return_inverse=True)
+    matrix = np.zeros((len(names), len(history)))
+    np.add.at(matrix, (index, period[keep]), np.asarray(totals, dtype=float)[keep])
+    return names.tolist(), matrix
+
+
+def _observed_mean(y: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    return (y * observed).sum(axis=1) / np.maximum(observed.sum(axis=1), 1)
+
+
+def seasonal_average(y: np.ndarray, observed: np.ndarray, season: int, horizon: int) -> np.ndarray:
+    periods = y.shape[1]
+    # Phase of each history period, counted so that forecast period h has phase h % season
+    phase = (np.arange(periods) - periods) % season
+    by_phase = (phase[:, None] == np.arange(season)).astype(float)
+    sums = (y * observed) @ by_phase
+    counts = observed.astype(float) @ by_phase
+    mean = np.broadcast_to(_observed_mean(y, observed)[:, None], sums.shape)
+    averages = np.divide(sums, counts, out=mean.copy(), where=counts > 0)
+    return averages[:, np.arange(horizon) % season]
+
+
+def exponential_smoothing(y: np.ndarray, observed: np.ndarray, season: int, horizon: int) -> np.ndarray:
+    # One pass over time for every (alpha, category) pair at once
+    level = np.zeros((len(ALPHAS), y.shape[0]))
+    squared_error = np.zeros_like(level)
+    started = np.zeros(y.shape[0], dtype=bool)
+    for t in range(y.shape[1]):
+        value, seen = y[:, t], observed[:, t]
+        error = value - level
+        squared_error += np.where(seen & started, error * error, 0.0)
+        level = np.where(seen, np.where(started, level + ALPHAS * error, value), level)
+        started |= seen
+    best = squared_error.argmin(axis=0)
+    return np.repeat(level[best, np.arange(y.shape[0])][:, None], horizon, axis=1)
+
+
+def linear_trend(y: np.ndarray, observed: np.ndarray, season: int, horizon: int) -> np.ndarray:
+    periods = y.shape[1]
+    x = np.arange(periods, dtype=float)
+    w = observed.astype(float)
+    n, sx, sxx = w.sum(axis=1), w @ x, w @ (x * x)
+    sy, sxy = (w * y).sum(axis=1), (w * y) @ x
+    denominator = n * sxx - sx * sx
+    slope = np.divide(n * sxy - sx * sy, denominator, out=np.zeros_like(n), where=denominator > 0)
+    intercept = (sy - slope * sx) / np.maximum(n, 1)
+    ahead = periods + np.arange(horizon)
+    return np.maximum(intercept[:, None] + slope[:, None] * ahead, 0.0)
+
+
+MODELS = {
+    ForecastModel.seasonal: seasonal_average,
+    ForecastModel.smoothing: exponential_smoothing,
+    ForecastModel.trend: linear_trend,
+}
+
+
+def fit_forecasts(y: np.ndarray, season: int, horizon: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per row: the index of the chosen model, its mean absolute error on the holdout (NaN if none), its forecast."""
+    rows, periods = y.shape
+    observed = np.arange(periods) >= np.argmax(y != 0, axis=1)[:, None]
+    models = list(MODELS.values())
+    holdout = min(horizon, max(periods // 4, 1)) if periods > 1 else 0
+    choice, error = np.zeros(rows, dtype=int), np.full(rows, np.nan)
+    if holdout:
+        train, seen = (y[:, :-holdout], observed[:, :-holdout]), observed[:, -holdout:]
+        counts = seen.sum(axis=1)
+        errors = np.stack([
+            np.divide((np.abs(model(*train, season, holdout) - y[:, -holdout:]) * seen).sum(axis=1), counts,
+                      out=np.full(rows, np.nan), where=counts > 0)
+            for model in models
+        ])
+        if rows:
+            choice = np.argmin(np.where(np.isnan(errors), np.inf, errors), axis=0)
+        error = errors[choice, np.arange(rows)]
+    forecasts = np.stack([model(y, observed, season, horizon) for model in models])
+    return choice, error, forecasts[choice, np.arange(rows)]
+
+
+def compute_forecasts(histories: Sequence[Sequence[tuple]], bucket: SummaryBucket, horizon: int, today: date) -> List[dict]:
+    """Forecast payloads for several users' (category, day, total) expense rows.
+
+    Every model works row by row, so all the users' categories are stacked
+    into one matrix and fitted together.
+    """
+    history, ahead = period_starts(bucket, today, horizon)
+    matrices = [expense_matrix(rows, history, ahead[0]) for rows in histories]
+    if not matrices:
+        return []
+    choice, error, forecast = fit_forecasts(np.vstack([y for _, y in matrices]), SEASON[bucket], horizon)
+    forecast = np.round(forecast, 2)
+    models = list(MODELS)
+    computed_at = datetime.now(timezone.utc).isoformat()
+    payloads, end = [], 0
+    for names, _ in matrices:
+        start, end = end, end + len(names)
+        payloads.append({
+            "bucket": bucket.value,
+            "horizon": horizon,
+            "periods": ahead.astype(str).tolist(),
+            "totals": np.round(forecast[start:end].sum(axis=0), 2).tolist(),
+            "categories": [
+                {
+                    "category": names[i - start],
+                    "model": models[choice[i]].value,
+                    "mean_absolute_error": None if np.isnan(error[i]) else round(float(error[i]), 2),
+                    "forecast": forecast[i].tolist(),
+                }
+                for i in start + np.argsort(-forecast[start:end].sum(axis=1), kind="stable")
+            ],
+            "history_periods": len(history),
+            "computed_at": computed_at,
+        })
+    return payloads
+
+
+def compute_forecast(rows: Sequence[tuple], bucket: SummaryBucket, horizon: int, today: date) -> dict:
+    """The forecast payload for one user's (category, day, total) expense rows."""
+    return compute_forecasts([rows], bucket, horizon, today)[0]
+
+
+def _history_stmt(user_ids: Sequence[int], buckets, today: date):
+    start = min(period_start(bucket, today - timedelta(days=settings.FORECAST_HISTORY_DAYS)) for bucket in buckets)
+    return (
+        select(Rollup.user_id, Rollup.category, Rollup.day, Rollup.total)
+        .filter(Rollup.user_id.in_(user_ids), Rollup.type == TransactionType.expense)
+        .filter(Rollup.day >= start, Rollup.day < today)
+    )
+
+
+def store_forecasts(db: Session, results: Sequence[tuple]) -> None:
+    """Upsert (user_id, data_version, bucket, horizon, payload) results."""
+    if not results:
+        return
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(SpendingForecast)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "bucket", "horizon"],
+        set_={
+            "data_version": stmt.excluded.data_version,
+            "start": stmt.excluded.start,
+            "payload": stmt.excluded.payload,
+            "computed_at": func.now(),
+        },
+    )
+    db.execute(stmt, [
+        {
+            "user_id": user_id, "data_version": version, "bucket": bucket, "horizon": horizon,
+            "start": date.fromisoformat(payload["periods"][0]), "payload": payload,
+        }
+        for user_id, version, bucket, horizon, payload in results
+    ])
+
+
+def get_forecast(db: Session, user_id: int, bucket: SummaryBucket, horizon: int) -> dict:
+    """The stored forecast if it is still current, otherwise a freshly computed (and stored) one."""
+    today = date.today()
+    # Read the version before the history, so a write in between leaves the result stale rather than wrong
+    version = db.scalar(data_version_stmt(user_id)) or 0
+    cached = db.execute(
+        select(SpendingForecast.data_version, SpendingForecast.start, SpendingForecast.payload).filter(
+            SpendingForecast.user_id == user_id,
+            SpendingForecast.bucket == bucket.value,
+            SpendingForecast.horizon == horizon,
+        )
+    ).first()
+    if cached is not None and cached.data_version == version and cached.start == period_start(bucket, today):
+        return cached.payload
+    rows = [(category, day, total) for _, category, day, total in db.execute(_history_stmt([user_id], [bucket], today))]
+    payload = compute_forecast(rows, bucket, horizon, today)
+    store_forecasts(db, [(user_id, version, bucket.value, horizon, payload)])
+    db.commit()
+    return payload
+
+
+def _forecast_users(users: Sequence[tuple], targets: Sequence[tuple], today: date) -> List[tuple]:
+    """Process pool task: every target forecast for each (user_id, data_version, rows)."""
+    results = []
+    for bucket, horizon in targets:
+        payloads = compute_forecasts([rows for _, _, rows in users], bucket, horizon, today)
+        results.extend(
+            (user_id, version, bucket.value, horizon, payload)
+            for (user_id, version, _), payload in zip(users, payloads)
+        )
+    return results
+
+
+def stale_users(db: Session, targets: Sequence[tuple], today: date, force: bool = False) -> List[tuple]:
+    """(user_id, data_version) of users missing a current forecast for any target, in id order."""
+    fresh: Dict[int, int] = defaultdict(int)
+    if not force:
+        stmt = (
+            select(SpendingForecast.user_id, SpendingForecast.bucket, SpendingForecast.horizon, SpendingForecast.start)
+            .join(User, User.id == SpendingForecast.user_id)
+            .filter(SpendingForecast.data_version == User.data_version)
+        )
+        wanted = {(bucket.value, horizon): period_start(bucket, today) for bucket, horizon in targets}
+        for user_id, bucket, horizon, start in db.execute(stmt):
+            if wanted.get((bucket, horizon)) == start:
+                fresh[user_id] += 1
+    users = db.execute(select(User.id, User.data_version).order_by(User.id))
+    return [(user_id, version or 0) for user_id, version in users if fresh[user_id] < len(targets)]
+
+
+def refresh_forecasts(db: Session, targets: Sequence[tuple], workers: int = 0, force: bool = False) -> int:
+    """Recompute the stale (or, with force, all) forecasts of every user; returns how many were written.
+
+    Users are read FORECAST_BATCH_USERS at a time (one rollup query per batch)
+    and fitted in a process pool while the next batch is read; results are
+    written as they come back.
+    """
+    today = date.today()
+    users = stale_users(db, targets, today, force)
+    workers = workers or settings.FORECAST_WORKERS or os.cpu_count() or 1
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    written, pending = 0, set()
+
+    def collect() -> None:
+        nonlocal written, pending
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            results = future.result()
+            store_forecasts(db, results)
+            db.commit()
+            written += len(results)
+
+    try:
+        for offset in range(0, len(users), settings.FORECAST_BATCH_USERS):
+            batch = users[offset:offset + settings.FORECAST_BATCH_USERS]
+            history = defaultdict(list)
+            for user_id, category, day, total in db.execute(
+                _history_stmt([user_id for user_id, _ in batch], [bucket for bucket, _ in targets], today)
+            ):
+                history[user_id].append((category, day, total))
+            db.rollback()  # no transaction held open while the batch is fitted
+            task = [(user_id, version, history.get(user_id, [])) for user_id, version in batch]
+            if pool is None:
+                results = _forecast_users(task, targets, today)
+                store_forecasts(db, results)
+                db.commit()
+                written += len(results)
+                continue
+            # One task per worker, so that even a single batch keeps them all busy
+            size = -(-len(task) // workers)
+            for first in range(0, len(task), size):
+                pending.add(pool.submit(_forecast_users, task[first:first + size], targets, today))
+            while len(pending) >= 2 * workers:
+                collect()
+        while pending:
+            collect()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    return written
@@ -1,9 +1,135 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config import settings
 
-def hash_password(password: str) -> str:
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt costs 100-300 ms of CPU per call. It runs in a small dedicated process
+# pool so a burst of logins cannot hold every request thread; once
+# HASH_POOL_MAX_PENDING calls are queued, new ones fail fast with 503. If a
+# pool process dies (OOM kill, a crash in the C extension) the executor is
+# broken for good, so it is replaced and the call retried once in a new pool.
+_pool: Optional[ProcessPoolExecutor] = None
+_pending = 0
+_lock = threading.Lock()
+
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.HASH_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _lock:
+        if _pool is broken:  # another call may already have replaced it
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_in_pool(fn, args: tuple, result: Future, retries: int = 1) -> None:
+    """Submit fn to the pool and pass its outcome to `result`, retrying once in a fresh pool if it broke."""
+    pool = _get_pool()
+    try:
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        if not retries:
+            raise
+        return _run_in_pool(fn, args, result, retries - 1)
+
+    def done(future: Future) -> None:
+        if future.cancelled():
+            result.cancel()
+            return
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool) and retries:
+            _discard_pool(pool)
+            try:
+                _run_in_pool(fn, args, result, retries - 1)
+            except Exception as exc:
+                result.set_exception(exc)
+        elif error is not None:
+            result.set_exception(error)
+        else:
+            result.set_result(future.result())
+
+    future.add_done_callback(done)
+
+
+def _release(_future: Future) -> None:
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+def _submit(fn, *args) -> Future:
+    """Run fn in the hashing pool, or inline when HASH_POOL_WORKERS is 0."""
+    global _pending
+    if settings.HASH_POOL_WORKERS <= 0:
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+    with _lock:
+        if _pending >= settings.HASH_POOL_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    future = Future()
+    future.add_done_callback(_release)
+    try:
+        _run_in_pool(fn, args, future)
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def submit_hash(password: str) -> Future:
+    return _submit(_hash, password)
+
+
+def submit_verify_and_update(plain_password: str, hashed_password: str) -> Future:
+    return _submit(_verify_and_update, plain_password, hashed_password)
+
+
+def hash_password(password: str) -> str:
+    return submit_hash(password).result()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return submit_verify_and_update(plain_password, hashed_password).result()[0]
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and return a new hash when the stored one uses outdated cost parameters."""
+    return submit_verify_and_update(plain_password, hashed_password).result()
+
+
+def shutdown_hash_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,120 @@
+import csv
+import hashlib
+import io
+import re
+from datetime import datetime
+from typing import IO, Iterator, Optional, Tuple
+
+# Each parser yields (row_number, raw_row) pairs where raw_row uses the
+# TransactionCreate field names. Values stay as strings; validation happens
+# in the import route so CSV, OFX and QIF rows share one code path.
+
+DEFAULT_CATEGORY = "Uncategorized"
+
+
+def _text_stream(binary: IO[bytes]) -> io.TextIOWrapper:
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def _normalize(row: dict) -> dict:
+    # Bank exports often omit the type and sign the amount instead.
+    amount = (row.get("amount") or "").replace(",", "").strip()
+    if not row.get("type") and amount:
+        row["type"] = "expense" if amount.startswith("-") else "income"
+    row["amount"] = amount.lstrip("-+")
+    if not row.get("category"):
+        row["category"] = DEFAULT_CATEGORY
+    return row
+
+
+def parse_csv(binary: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    reader = csv.DictReader(_text_stream(binary))
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    for row_number, row in enumerate(reader, start=2):
+        row = {key: (value or "").strip() for key, value in row.items() if key}
+        yield row_number, _normalize(row)
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<\r\n]*)")
+
+
+def _ofx_date(value: str) -> str:
+    # DTPOSTED looks like 20240131 or 20240131120000[-5:EST]
+    return datetime.strptime(value[:8], "%Y%m%d").date().isoformat()
+
+
+def parse_ofx(binary: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    current: Optional[dict] = None
+    start_line = 0
+    for line_number, line in enumerate(_text_stream(binary), start=1):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            value = value.strip()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    yield start_line, _normalize(current)
+                    current = None
+                elif not closing:
+                    current, start_line = {}, line_number
+            elif current is not None and not closing and value:
+                if tag == "DTPOSTED":
+                    current["date"] = _ofx_date(value)
+                elif tag == "TRNAMT":
+                    current["amount"] = value
+                elif tag in ("NAME", "MEMO") and not current.get("description"):
+                    current["description"] = value
+
+
+def _qif_date(value: str) -> str:
+    value = value.replace("'", "/").replace(" ", "")
+    for fmt in ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return value
+
+
+def parse_qif(binary: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    current: dict = {}
+    start_line = 0
+    for line_number, line in enumerate(_text_stream(binary), start=1):
+        line = line.strip()
+        if not line or line.startswith("!"):
+            continue
+        code, value = line[0], line[1:].strip()
+        if not current:
+            start_line = line_number
+        if code == "^":
+            if current:
+                yield start_line, _normalize(current)
+            current = {}
+        elif code == "D":
+            current["date"] = _qif_date(value)
+        elif code == "T":
+            current["amount"] = value
+        elif code == "P":
+            current["description"] = value
+        elif code == "L":
+            current["category"] = value
+    if current:
+        yield start_line, _normalize(current)
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qfx": parse_ofx, "qif": parse_qif}
+
+
+def detect_format(filename: Optional[str]) -> str:
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    return extension if extension in PARSERS else "csv"
+
+
+def import_key(date: datetime, amount: float, description: Optional[str]) -> str:
+    normalized = " ".join((description or "").lower().split())
+    return f"{date.date().isoformat()}|{amount:.2f}|{normalized}"
+
+
+def import_fingerprint(key: str, occurrence: int) -> str:
+    # The occurrence number keeps genuinely repeated rows (two identical coffees
+    # on the same day) while re-importing the same file stays idempotent.
+    return hashlib.sha256(f"{key}|{occurrence}".encode()).hexdigest()
@@ -0,0 +1,390 @@
+"""Spending insights: per-category statistics, outliers, spikes and recurring charges.
+
+Computed from a user's whole expense history with NumPy, grouping by sorting
+instead of looping over rows:
+
+  * category statistics: count, mean, std and percentiles of the amounts;
+  * outliers: each transaction against the INSIGHTS_ROLLING_WINDOW earlier
+    transactions of its category (rolling sums over the sorted amounts), so a
+    flag depends only on what was known when the transaction arrived;
+  * spikes: a category's last INSIGHTS_SPIKE_DAYS days against the earlier
+    windows of the same length;
+  * recurring charges: transactions grouped by normalized description and
+    category whose intervals follow a cadence, for a steady amount.
+
+The result is stored in spending_insights with the user's data_version, so
+GET /insights is a one-row read. A transaction write schedules a recompute on
+a background thread of the worker that handled it; a read that still finds
+the stored result stale (a new day, or the recompute has not finished)
+computes it inline.
+"""
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models.spending_insights import SpendingInsights
+from app.models.transaction import Transaction, TransactionType
+from app.utils.cache import on_transactions_changed
+from app.utils.etag import data_version_stmt
+from app.utils.rollups import day_expr
+
+logger = logging.getLogger(__name__)
+
+# cadence: (typical interval, tolerance) in days
+CADENCES = {
+    "weekly": (7.0, 1.0),
+    "biweekly": (14.0, 2.0),
+    "monthly": (30.44, 4.0),
+    "quarterly": (91.31, 7.0),
+    "yearly": (365.25, 12.0),
+}
+RECURRING_MIN_COUNT = 3
+RECURRING_MIN_ON_CADENCE = 0.75  # share of intervals within the tolerance
+RECURRING_MAX_AMOUNT_CV = 0.2  # std / mean of the amounts
+SPIKE_WINDOWS = 12  # earlier windows compared against
+SPIKE_MIN_WINDOWS = 3
+SPIKE_MIN_RATIO = 1.5
+# Standard deviations are floored at this share of the mean, so that a steady
+# charge (rent) is not an outlier the first time it changes by a few percent
+MIN_RELATIVE_STD = 0.1
+
+_NOT_A_WORD = re.compile(r"[\W\d_]+")
+_EPOCH = date(1970, 1, 1)
+
+
+def normalize_description(description: str) -> str:
+    """Lower-cased words only: "NETFLIX.COM 12/03" and "Netflix.com 01/04" are the same payee."""
+    return " ".join(_NOT_A_WORD.sub(" ", description.lower()).split())
+
+
+def _factorize(values) -> Tuple[np.ndarray, list]:
+    """Integer codes for values, and the distinct values in order of first appearance.
+
+    One dict lookup per value: np.unique on an object array sorts with Python
+    comparisons, which is several times slower on a long history.
+    """
+    index: dict = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64, count=len(values))
+    return codes, list(index)
+
+
+def _groups(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start index and length of each run of equal values in sorted keys."""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, dtype=int)
+    return starts, np.diff(np.r_[starts, len(keys)])
+
+
+def _quantile(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Per-group quantile (linear interpolation) of values sorted within each group."""
+    position = (counts - 1) * q
+    lower = np.floor(position).astype(int)
+    upper = np.ceil(position).astype(int)
+    low, high = values[starts + lower], values[starts + upper]
+    return low + (high - low) * (position - lower)
+
+
+def _day(epoch_day) -> str:
+    return (_EPOCH + timedelta(days=int(epoch_day))).isoformat()
+
+
+def _round(values: np.ndarray) -> list:
+    return np.round(values, 2).tolist()
+
+
+def category_statistics(amounts: np.ndarray, category: np.ndarray, count: int) -> dict:
+    """count, total, mean, std and percentiles per category code (0..count-1)."""
+    order = np.lexsort((amounts, category))
+    sorted_amounts = amounts[order]
+    starts, sizes = _groups(category[order])
+    total = np.add.reduceat(sorted_amounts, starts)
+    mean = total / sizes
+    squares = np.add.reduceat((sorted_amounts - np.repeat(mean, sizes)) ** 2, starts)
+    return {
+        "count": sizes,
+        "total": total,
+        "mean": mean,
+        "std": np.sqrt(squares / np.maximum(sizes - 1, 1)),
+        "p50": _quantile(sorted_amounts, starts, sizes, 0.5),
+        "p90": _quantile(sorted_amounts, starts, sizes, 0.9),
+        "p99": _quantile(sorted_amounts, starts, sizes, 0.99),
+    }
+
+
+def find_outliers(ids, days, amounts, category, mean: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Indexes of transactions far above the rolling mean of their category's preceding ones, with that mean and the z-score."""
+    order = np.lexsort((ids, days, category))
+    amount, code = amounts[order], category[order]
+    starts, sizes = _groups(code)
+    rank = np.arange(len(order)) - np.repeat(starts, sizes)  # earlier transactions in the same category
+    window = np.minimum(rank, settings.INSIGHTS_ROLLING_WINDOW)
+    # Rolling sums as differences of running sums; centring on the category
+    # mean first keeps the sums of squares small enough to stay precise
+    centred = amount - mean[code]
+    sums = np.r_[0.0, np.cumsum(centred)]
+    squares = np.r_[0.0, np.cumsum(centred * centred)]
+    row = np.arange(len(order))
+    n = np.maximum(window, 1)
+    prior_centred = (sums[row] - sums[row - window]) / n
+    variance = (squares[row] - squares[row - window] - n * prior_centred ** 2) / np.maximum(window - 1, 1)
+    prior_mean = prior_centred + mean[code]
+    scale = np.maximum(np.sqrt(np.maximum(variance, 0.0)), np.maximum(MIN_RELATIVE_STD * np.abs(prior_mean), 0.01))
+    z_score = (amount - prior_mean) / scale
+    flagged = np.flatnonzero((window >= settings.INSIGHTS_MIN_HISTORY) & (z_score >= settings.INSIGHTS_OUTLIER_Z))
+    return order[flagged], prior_mean[flagged], z_score[flagged]
+
+
+def find_spikes(days, amounts, category, count: int, today: int) -> dict:
+    """Per category: the last INSIGHTS_SPIKE_DAYS days' total against the complete earlier windows."""
+    length = settings.INSIGHTS_SPIKE_DAYS
+    age = today - days
+    window = age // length
+    keep = (age >= 0) & (window <= SPIKE_WINDOWS)
+    totals = np.zeros((count, SPIKE_WINDOWS + 1))
+    np.add.at(totals, (category[keep], window[keep]), amounts[keep])
+    oldest = np.full(count, -1)
+    np.maximum.at(oldest, category, age)
+    # Earlier windows that lie entirely after the category's first transaction
+    observed = np.arange(1, SPIKE_WINDOWS + 1) <= ((oldest - (length - 1)) // length)[:, None]
+    earlier = totals[:, 1:]
+    n = observed.sum(axis=1)
+    typical = (earlier * observed).sum(axis=1) / np.maximum(n, 1)
+    std = np.sqrt(((earlier - typical[:, None]) ** 2 * observed).sum(axis=1) / np.maximum(n - 1, 1))
+    scale = np.maximum(std, np.maximum(MIN_RELATIVE_STD * typical, 0.01))
+    recent = totals[:, 0]
+    z_score = (recent - typical) / scale
+    spike = (
+        (n >= SPIKE_MIN_WINDOWS) & (typical > 0)
+        & (z_score >= settings.INSIGHTS_SPIKE_Z) & (recent >= SPIKE_MIN_RATIO * typical)
+    )
+    return {"recent": recent, "typical": typical, "z_score": z_score, "spike": spike}
+
+
+def find_recurring(days, amounts, category, count: int, descriptions: np.ndarray, today: int) -> list:
+    """Groups of (normalized description, category) charged on a steady cadence with a steady amount."""
+    # Normalize each distinct description once rather than every row
+    description, distinct = _factorize(descriptions)
+    payee_of, payees = _factorize([normalize_description(d) for d in distinct])
+    payee = payee_of[description]
+    named = np.array([p != "" for p in payees], dtype=bool)[payee]
+    key = (payee * count + category)[named]
+    day, amount, row = days[named], amounts[named], np.flatnonzero(named)
+    order = np.lexsort((day, key))
+    key, day, amount, row = key[order], day[order], amount[order], row[order]
+    starts, sizes = _groups(key)
+    candidates = sizes >= RECURRING_MIN_COUNT
+    if not candidates.any():
+        return []
+
+    group = np.repeat(np.arange(len(starts)), sizes)
+    same = group[1:] == group[:-1]
+    gaps, gap_group = np.diff(day)[same].astype(float), group[1:][same]
+    gap_order = np.lexsort((gaps, gap_group))
+    gap_starts, gap_sizes = _groups(gap_group[gap_order])
+    median = np.zeros(len(starts))
+    with_gaps = gap_group[gap_order][gap_starts]
+    median[with_gaps] = _quantile(gaps[gap_order], gap_starts, gap_sizes, 0.5)
+
+    names = list(CADENCES)
+    intervals = np.array([interval for interval, _ in CADENCES.values()])
+    tolerances = np.array([tolerance for _, tolerance in CADENCES.values()])
+    distance = np.abs(median[:, None] - intervals)
+    cadence = distance.argmin(axis=1)
+    candidates &= distance[np.arange(len(starts)), cadence] <= tolerances[cadence]
+    on_cadence = np.abs(gaps - intervals[cadence[gap_group]]) <= tolerances[cadence[gap_group]]
+    share = np.bincount(gap_group, weights=on_cadence, minlength=len(starts)) / np.maximum(sizes - 1, 1)
+    mean = np.add.reduceat(amount, starts) / sizes
+    spread = np.sqrt(np.add.reduceat((amount - np.repeat(mean, sizes)) ** 2, starts) / sizes)
+    candidates &= (share >= RECURRING_MIN_ON_CADENCE) & (spread <= RECURRING_MAX_AMOUNT_CV * mean)
+
+    last = starts + sizes - 1
+    charges = []
+    for g in np.flatnonzero(candidates):
+        last_day = int(day[last[g]])
+        charges.append({
+            "description": descriptions[row[last[g]]],
+            "category": int(category[row[last[g]]]),
+            "cadence": names[cadence[g]],
+            "interval_days": round(float(median[g]), 1),
+            "amount": round(float(mean[g]), 2),
+            "count": int(sizes[g]),
+            "last_date": _day(last_day),
+            "next_date": _day(last_day + round(median[g])),
+            "active": bool(today - last_day <= 1.5 * median[g]),
+        })
+    charges.sort(key=lambda charge: (not charge["active"], charge["next_date"]))
+    return charges
+
+
+def compute_insights(ids, days, amounts, categories, descriptions, today: int) -> dict:
+    """The insights payload for one user's expenses, given as parallel arrays (days since 1970-01-01)."""
+    computed_at = datetime.now(timezone.utc).isoformat()
+    if not len(ids):
+        return {"transactions": 0, "categories": [], "outliers": [], "spikes": [], "recurring": [], "computed_at": computed_at}
+    category, names = _factorize(categories)
+    count = len(names)
+    stats = category_statistics(amounts, category, count)
+    spikes = find_spikes(days, amounts, category, count, today)
+
+    flagged, typical, z_score = find_outliers(ids, days, amounts, category, stats["mean"])
+    newest = np.lexsort((ids[flagged], days[flagged]))[::-1][:settings.INSIGHTS_MAX_OUTLIERS]
+    outliers = [
+        {
+            "id": int(ids[i]),
+            "date": _day(days[i]),
+            "category": names[category[i]],
+            "description": descriptions[i] or None,
+            "amount": round(float(amounts[i]), 2),
+            "typical": round(float(typical[k]), 2),
+            "z_score": round(float(z_score[k]), 2),
+        }
+        for i, k in zip(flagged[newest], newest)
+    ]
+
+    recurring = find_recurring(days, amounts, category, count, descriptions, today)
+    for charge in recurring:
+        charge["category"] = names[charge["category"]]
+
+    columns = {key: _round(values) for key, values in stats.items() if key != "count"}
+    recent = _round(spikes["recent"])
+    return {
+        "transactions": len(ids),
+        "categories": sorted(
+            (
+                {"category": names[c], "count": int(stats["count"][c]),
+                 **{key: values[c] for key, values in columns.items()}, "recent_total": recent[c]}
+                for c in range(count)
+            ),
+            key=lambda stat: stat["total"],
+            reverse=True,
+        ),
+        "outliers": outliers,
+        "spikes": sorted(
+            (
+                {
+                    "category": names[c],
+                    "recent_total": recent[c],
+                    "typical_total": round(float(spikes["typical"][c]), 2),
+                    "ratio": round(float(spikes["recent"][c] / spikes["typical"][c]), 2),
+                    "z_score": round(float(spikes["z_score"][c]), 2),
+                }
+                for c in np.flatnonzero(spikes["spike"])
+            ),
+            key=lambda spike: spike["z_score"],
+            reverse=True,
+        ),
+        "recurring": recurring,
+        "computed_at": computed_at,
+    }
+
+
+def load_expenses(db: Session, user_id: int) -> tuple:
+    """(ids, days since 1970-01-01, amounts, categories, descriptions) arrays of the user's expenses."""
+    dialect = db.bind.dialect.name
+    day = day_expr(dialect)
+    epoch_day = func.extract("epoch", day) / 86400 if dialect == "postgresql" else func.julianday(day) - 2440587.5
+    rows = db.connection().execute(
+        select(Transaction.id, epoch_day, Transaction.amount, Transaction.category, Transaction.description)
+        .filter(Transaction.user_id == user_id, Transaction.type == TransactionType.expense)
+    ).all()
+    if not rows:
+        empty = np.zeros(0)
+        return empty.astype(np.int64), empty.astype(np.int64), empty, empty.astype(object), empty.astype(object)
+    ids, days, amounts, categories, descriptions = zip(*rows)
+    descriptions = np.array(descriptions, dtype=object)
+    descriptions[np.equal(descriptions, None)] = ""
+    return (
+        np.array(ids, dtype=np.int64),
+        np.rint(np.array(days, dtype=float)).astype(np.int64),
+        np.array(amounts, dtype=float),
+        np.array(categories, dtype=object),
+        descriptions,
+    )
+
+
+def store_insights(db: Session, user_id: int, version: int, today: date, payload: dict) -> None:
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(SpendingInsights).values(user_id=user_id, data_version=version, computed_on=today, payload=payload)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "data_version": stmt.excluded.data_version,
+            "computed_on": stmt.excluded.computed_on,
+            "payload": stmt.excluded.payload,
+            "computed_at": func.now(),
+        },
+    ))
+
+
+def refresh_insights(db: Session, user_id: int) -> dict:
+    today = date.today()
+    # Read the version before the history, so a write in between leaves the result stale rather than wrong
+    version = db.scalar(data_version_stmt(user_id)) or 0
+    payload = compute_insights(*load_expenses(db, user_id), (today - _EPOCH).days)
+    store_insights(db, user_id, version, today, payload)
+    db.commit()
+    return payload
+
+
+def get_insights(db: Session, user_id: int) -> dict:
+    """The stored insights if they are current, otherwise freshly computed (and stored) ones."""
+    stored = db.execute(
+        select(SpendingInsights.data_version, SpendingInsights.computed_on, SpendingInsights.payload)
+        .filter(SpendingInsights.user_id == user_id)
+    ).first()
+    if stored is not None and stored.computed_on == date.today():
+        if stored.data_version == (db.scalar(data_version_stmt(user_id)) or 0):
+            return stored.payload
+    return refresh_insights(db, user_id)
+
+
+# Recompute after writes, off the request thread: one background thread per
+# worker, and a user whose refresh is already queued is not queued twice.
+_refresher: Optional[ThreadPoolExecutor] = None
+_queued: Set[int] = set()
+_lock = threading.Lock()
+
+
+def _refresh_in_background(user_id: int) -> None:
+    with _lock:
+        _queued.discard(user_id)
+    db = SessionLocal()
+    try:
+        refresh_insights(db, user_id)
+    except Exception:
+        logger.exception("Refreshing insights for user %s failed", user_id)
+    finally:
+        db.close()
+
+
+@on_transactions_changed
+def schedule_insights_refresh(user_id: int) -> None:
+    global _refresher
+    if not settings.INSIGHTS_REFRESH_ON_WRITE:
+        return
+    with _lock:
+        if user_id in _queued:
+            return
+        _queued.add(user_id)
+        if _refresher is None:
+            _refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="insights")
+    _refresher.submit(_refresh_in_background, user_id)
+
+
+def shutdown_insights_refresher() -> None:
+    global _refresher
+    with _lock:
+        refresher, _refresher = _refresher, None
+        _queued.clear()
+    if refresher is not None:
+        refresher.shutdown(wait=True, cancel_futures=True)
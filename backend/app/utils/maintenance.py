@@ -0,0 +1,50 @@
+import asyncio
+import logging
+from typing import Callable, List, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJobs:
+    """Housekeeping that runs every few minutes in each worker, off the request path.
+
+    Each job is a blocking function run in the thread pool by its own asyncio
+    task, first right after startup and then every `interval` seconds. Jobs
+    must be safe to run in several workers at once.
+    """
+
+    def __init__(self):
+        self._jobs: List[Tuple[str, float, Callable[[], object]]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def add(self, name: str, interval: float, job: Callable[[], object]) -> None:
+        self._jobs.append((name, interval, job))
+
+    async def _run(self, name: str, interval: float, job: Callable[[], object]) -> None:
+        while True:
+            try:
+                await run_in_threadpool(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Periodic job %s failed", name)
+            await asyncio.sleep(interval)
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run(*job)) for job in self._jobs]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+periodic_jobs = PeriodicJobs()
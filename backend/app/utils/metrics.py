@@ -0,0 +1,263 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import ExecuteStyle
+from sqlalchemy.orm import Mapper
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    __slots__ = ("queries", "batched", "bulk", "db_seconds", "rows", "statements", "timings", "closed", "_started")
+
+    def __init__(self, keep_statements: bool):
+        self.queries = 0
+        self.batched = 0  # executions that are parts of one executemany / multi-row INSERT
+        self.bulk = False  # the route runs many statements on purpose (see bulk_request)
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.statements: Counter = Counter()
+        # (statement, seconds) in execution order; only kept for the slow-request log
+        self.timings: Optional[list] = [] if keep_statements else None
+        self.closed = False
+        self._started = 0.0
+
+    def looks_like_n_plus_one(self) -> bool:
+        return not self.bulk and self.queries - self.batched > settings.METRICS_N_PLUS_ONE_THRESHOLD
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    stats = _current.get()
+    return None if stats is None or stats.closed else stats
+
+
+def count_rows(count: int) -> None:
+    """Add rows read with Core (not through the ORM) to the current request's row count."""
+    stats = current_stats()
+    if stats is not None:
+        stats.rows += count
+
+
+def bulk_request() -> None:
+    """Mark the current request as running many statements on purpose (imports, batches), so it is not flagged as N+1."""
+    stats = current_stats()
+    if stats is not None:
+        stats.bulk = True
+
+
+# SQLAlchemy hooks. They listen on the Engine class, so the sync engine, the
+# async engine's sync_engine and any script engines are all covered; outside a
+# request (no RequestStats in context) they do nothing. Rows read are counted
+# where they are materialized: ORM instances here, Core rows by the read helpers
+# (as_dicts, the NDJSON and export streams) through count_rows.
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats()
+    if stats is not None:
+        stats._started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats()
+    if stats is None:
+        return
+    elapsed = time.perf_counter() - stats._started
+    stats.queries += 1
+    stats.db_seconds += elapsed
+    stats.statements[statement] += 1
+    if executemany or getattr(context, "execute_style", ExecuteStyle.EXECUTE) is not ExecuteStyle.EXECUTE:
+        stats.batched += 1
+    if cursor.rowcount > 0 and statement.lstrip()[:6].upper() != "SELECT":
+        stats.rows += cursor.rowcount
+    if stats.timings is not None:
+        stats.timings.append((statement, elapsed))
+
+
+@event.listens_for(Mapper, "load")
+def _on_instance_load(target, context):
+    stats = current_stats()
+    if stats is not None:
+        stats.rows += 1
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Per-route aggregates, rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Counter = Counter()  # (method, route, status) -> count
+        self._latency = {}  # (method, route) -> _Histogram
+        self._queries = {}  # (method, route) -> _Histogram
+        self._db_seconds: Counter = Counter()
+        self._rows: Counter = Counter()
+        self._response_bytes: Counter = Counter()
+        self._n_plus_one: Counter = Counter()
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats, size: int) -> None:
+        key = (method, route)
+        with self._lock:
+            self._requests[(method, route, str(status))] += 1
+            if key not in self._latency:
+                self._latency[key] = _Histogram(LATENCY_BUCKETS)
+                self._queries[key] = _Histogram(QUERY_COUNT_BUCKETS)
+            self._latency[key].observe(seconds)
+            self._queries[key].observe(stats.queries)
+            self._db_seconds[key] += stats.db_seconds
+            self._rows[key] += stats.rows
+            self._response_bytes[key] += size
+            if stats.looks_like_n_plus_one():
+                self._n_plus_one[key] += 1
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            _counter(lines, "http_requests_total", "Requests served", self._requests, ("method", "route", "status"))
+            _histogram(lines, "http_request_duration_seconds", "Request latency", self._latency)
+            _histogram(lines, "http_request_db_queries", "SQL statements per request", self._queries)
+            _counter(lines, "http_request_db_seconds_total", "Time spent in SQL statements", self._db_seconds)
+            _counter(lines, "http_request_db_rows_total", "Rows read (ORM and Core) plus rows written", self._rows)
+            _counter(lines, "http_response_size_bytes_total", "Response body bytes sent", self._response_bytes)
+            _counter(
+                lines,
+                "http_requests_n_plus_one_total",
+                f"Requests that ran more than {settings.METRICS_N_PLUS_ONE_THRESHOLD} separate SQL statements (bulk routes excepted)",
+                self._n_plus_one,
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names, values) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _counter(lines, name, help_text, values, label_names=("method", "route")) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for key, value in sorted(values.items()):
+        lines.append(f"{name}{{{_labels(label_names, key)}}} {_number(value)}")
+
+
+def _histogram(lines, name, help_text, histograms) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(histograms.items()):
+        labels = _labels(("method", "route"), key)
+        cumulative = 0
+        for bound, count in zip(histogram.bounds, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {_number(histogram.total)}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed bodies are timed and measured to their last chunk.
+
+    The request is recorded when the final body chunk is sent; background tasks
+    that run afterwards are not charged to it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        slow_ms = settings.METRICS_SLOW_REQUEST_MS
+        stats = RequestStats(keep_statements=slow_ms > 0)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+
+        def finish():
+            if stats.closed:
+                return
+            stats.closed = True
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            registry.record(scope["method"], route_path, response["status"], elapsed, stats, response["size"])
+            _log_request(scope["method"], route_path, elapsed, stats, slow_ms)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await send(message)
+                    finish()
+                    return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
+            _current.reset(token)
+
+
+def _log_request(method: str, route: str, elapsed: float, stats: RequestStats, slow_ms: int) -> None:
+    if stats.looks_like_n_plus_one():
+        statement, repeats = stats.statements.most_common(1)[0]
+        logger.warning(
+            "Possible N+1: %s %s ran %d SQL statements (%d x %s)",
+            method, route, stats.queries, repeats, " ".join(statement.split())[:200],
+        )
+    if slow_ms > 0 and elapsed * 1000 >= slow_ms:
+        details = "\n".join(
+            f"  {seconds * 1000:8.2f} ms  {' '.join(statement.split())}" for statement, seconds in stats.timings
+        )
+        logger.warning(
+            "Slow request: %s %s took %.1f ms, %d SQL statements in %.1f ms\n%s",
+            method, route, elapsed * 1000, stats.queries, stats.db_seconds * 1000, details,
+        )
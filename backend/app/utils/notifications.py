@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models.notification import Notification
+from app.models.user import User
+from app.utils.fast_read import as_dicts
+
+logger = logging.getLogger(__name__)
+
+# users.unread_notifications is a counter kept in step with the notifications
+# table: creating an unread notification adds one and marking one read takes
+# one away, in the same DB transaction. The badge endpoint reads it with a
+# primary-key lookup instead of a COUNT(*) over the user's notifications.
+
+NOTIFICATION_STREAM_COLUMNS = (
+    Notification.id, Notification.user_id, Notification.title, Notification.message,
+    Notification.is_read, Notification.created_at,
+)
+
+_users = User.__table__
+
+
+def add_unread(db: Session, counts: Dict[int, int]) -> None:
+    """Add counts[user_id] to each user's unread counter, bumping their data_version too.
+
+    A negative count records notifications being marked read.
+    """
+    if not counts:
+        return
+    db.execute(
+        update(_users)
+        .where(_users.c.id == bindparam("b_user_id"))
+        .values(
+            unread_notifications=_users.c.unread_notifications + bindparam("b_delta"),
+            data_version=_users.c.data_version + 1,
+        ),
+        [{"b_user_id": user_id, "b_delta": delta} for user_id, delta in sorted(counts.items())],
+    )
+
+
+def recount_unread(db: Session, user_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute unread counters from the notifications table; returns how many users changed."""
+    actual = (
+        select(func.count(Notification.id))
+        .filter(Notification.user_id == User.id, Notification.is_read == False)  # noqa: E712
+        .scalar_subquery()
+    )
+    stmt = update(User).filter(User.unread_notifications != actual).values(unread_notifications=actual)
+    if user_ids is not None:
+        stmt = stmt.filter(User.id.in_(list(user_ids)))
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+def sse_event(row: dict) -> bytes:
+    data = orjson.dumps({key: value for key, value in row.items() if key != "user_id"}, option=orjson.OPT_UTC_Z)
+    return b"id: %d\nevent: notification\ndata: %s\n\n" % (row["id"], data)
+
+
+SSE_HEARTBEAT = b": keep-alive\n\n"
+# Gaps remembered at most, which bounds the primary-key re-read on each poll
+_MAX_GAPS = settings.SSE_POLL_BATCH_SIZE // 2
+
+
+class NotificationHub:
+    """Fans new notifications out to the Server-Sent Events streams open on this worker.
+
+    Each open stream costs one bounded asyncio.Queue and nothing else: there
+    are no per-connection timers or queries. A single task per worker reads
+    notifications past the last id it has seen (a primary-key range scan)
+    every SSE_POLL_SECONDS, and straight away when the reminder scheduler on
+    this worker fires, and puts them on the queues of the users who are
+    listening. Reading the table rather than relaying in memory means
+    notifications created by other workers arrive too; with nobody subscribed
+    it only reads MAX(id). The same task sends the keep-alive comments.
+
+    Ids are handed out when a row is inserted, not when it commits, so a lower
+    id can become visible after a higher one. Ids skipped over below the
+    position are remembered as gaps and read again by primary key on each
+    poll until they show up or SSE_GAP_SECONDS pass (a rolled-back insert
+    leaves a gap that never fills).
+
+    A stream whose queue fills up is dropped; the browser reconnects with
+    Last-Event-ID and catches up from the database.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._last_id = 0
+        self._gaps: Dict[int, float] = {}  # id below _last_id not seen yet -> when it was skipped
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """A queue of (notification id, encoded SSE event) for the user; None means the stream must end.
+
+        Everything committed after this call is delivered, possibly together
+        with rows the caller reads from the database itself, so streams skip
+        ids they have already sent.
+        """
+        queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def __len__(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def wake(self, _fired=None) -> None:
+        """Poll now; usable as a reminder scheduler listener, from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _offer(self, queue: asyncio.Queue, item: Optional[Tuple[int, bytes]]) -> bool:
+        try:
+            queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _publish(self, user_id: int, item: Tuple[int, bytes]) -> None:
+        for queue in list(self._subscribers.get(user_id, ())):
+            if not self._offer(queue, item):
+                # Too far behind: end the stream (None) so the client reconnects and catches up
+                self.unsubscribe(user_id, queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _latest_id(self) -> int:
+        db = self.session_factory()
+        try:
+            return db.scalar(select(func.max(Notification.id))) or 0
+        finally:
+            db.close()
+
+    def _read_after(self, last_id: int, gaps: Sequence[int] = ()) -> Tuple[list, list]:
+        """(rows filling the given gaps, up to SSE_POLL_BATCH_SIZE rows past last_id), each in id order."""
+        db = self.session_factory()
+        try:
+            # Two primary-key reads: an OR of both conditions is planned as a full scan
+            filled = as_dicts(db.execute(
+                select(*NOTIFICATION_STREAM_COLUMNS).filter(Notification.id.in_(gaps)).order_by(Notification.id)
+            )) if gaps else []
+            new = as_dicts(db.execute(
+                select(*NOTIFICATION_STREAM_COLUMNS)
+                .filter(Notification.id > last_id)
+                .order_by(Notification.id)
+                .limit(settings.SSE_POLL_BATCH_SIZE)
+            ))
+            return filled, new
+        finally:
+            db.close()
+
+    async def _tick(self) -> bool:
+        """One poll; returns True when there may be more rows to read straight away."""
+        if not self._subscribers:
+            # Nobody listening: only move the position forward. If someone
+            # subscribed while the query ran the result is not trusted, since
+            # rows committed after they subscribed would be skipped.
+            latest = await run_in_threadpool(self._latest_id)
+            if not self._subscribers:
+                self._last_id = latest
+                self._gaps.clear()
+            return False
+        filled, new = await run_in_threadpool(self._read_after, self._last_id, sorted(self._gaps))
+        now = time.monotonic()
+        for row in filled + new:
+            row_id = row["id"]
+            if row_id > self._last_id:
+                for missing in range(max(self._last_id + 1, row_id - _MAX_GAPS), row_id):
+                    self._gaps[missing] = now
+                self._last_id = row_id
+            elif self._gaps.pop(row_id, None) is None:
+                continue  # already published
+            if row["user_id"] in self._subscribers:
+                self._publish(row["user_id"], (row_id, sse_event(row)))
+        self._expire_gaps(now)
+        return len(new) == settings.SSE_POLL_BATCH_SIZE
+
+    def _expire_gaps(self, now: float) -> None:
+        expired = [gap for gap, skipped_at in self._gaps.items() if now - skipped_at > settings.SSE_GAP_SECONDS]
+        excess = len(self._gaps) - len(expired) - _MAX_GAPS
+        if excess > 0:
+            expired += sorted(set(self._gaps) - set(expired))[:excess]
+        for gap in expired:
+            del self._gaps[gap]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_heartbeat = loop.time() + settings.SSE_HEARTBEAT_SECONDS
+        while True:
+            try:
+                self._wakeup.clear()
+                if await self._tick():
+                    continue
+                if loop.time() >= next_heartbeat:
+                    for user_id in list(self._subscribers):
+                        self._publish(user_id, (0, SSE_HEARTBEAT))
+                    next_heartbeat = loop.time() + settings.SSE_HEARTBEAT_SECONDS
+                timeout = min(settings.SSE_POLL_SECONDS, max(0.0, next_heartbeat - loop.time()))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification hub poll failed")
+                await asyncio.sleep(settings.SSE_POLL_SECONDS)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._last_id = await run_in_threadpool(self._latest_id)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = self._loop = None
+        # End the open streams so the server can shut down
+        for user_id in list(self._subscribers):
+            for queue in list(self._subscribers[user_id]):
+                self._offer(queue, None)
+        self._subscribers.clear()
+
+
+notification_hub = NotificationHub()
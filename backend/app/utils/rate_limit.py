@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Token buckets keyed by (scope, "ip"/"email", value). Every check is a dict
+# lookup plus a little arithmetic under one shard lock, so a rejected request
+# costs microseconds and never reaches the database or bcrypt. Each shard is an
+# LRU bounded to RATE_LIMIT_MAX_KEYS / RATE_LIMIT_SHARDS entries; dropping an
+# idle key only forgets a bucket that would have refilled anyway.
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: "OrderedDict[tuple, list]" = OrderedDict()
+
+
+class TokenBucketLimiter:
+    """In-process limiter: `capacity` hits per `window` seconds per key, refilled continuously."""
+
+    def __init__(self, capacity: int, window: float, max_keys: int = 100000, shards: int = 16):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.shard_size = max(1, max_keys // shards)
+        self._shards = [_Shard() for _ in range(shards)]
+
+    def hit(self, key: tuple) -> Tuple[bool, float]:
+        """Take one token for key; returns (allowed, seconds until a token is available)."""
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = shard.buckets[key] = [float(self.capacity), now]
+                if len(shard.buckets) > self.shard_size:
+                    shard.buckets.popitem(last=False)
+            else:
+                shard.buckets.move_to_end(key)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0.0
+            return False, (1 - bucket[0]) / self.rate
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+
+class RedisWindowLimiter:
+    """Shared limiter for multi-worker deployments: fixed-window counters in Redis.
+
+    A window is opened with SET NX EX and counted with INCR, which every Redis
+    version since 2.6.12 supports. When Redis cannot be reached the attempt is
+    counted by `fallback` (an in-process limiter) instead: the limit weakens to
+    one per worker for the outage rather than login and register failing.
+    """
+
+    def __init__(self, url: str, capacity: int, window: int, fallback: TokenBucketLimiter):
+        import redis  # optional dependency, only needed when RATE_LIMIT_REDIS_URL is set
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.errors = redis.RedisError
+        self.capacity = capacity
+        self.window = window
+        self.fallback = fallback
+        self._failing = False
+
+    def hit(self, key: tuple) -> Tuple[bool, float]:
+        name = "ratelimit:" + ":".join(str(part) for part in key)
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(name, 0, ex=self.window, nx=True)
+            pipe.incr(name)
+            pipe.ttl(name)
+            _, count, ttl = pipe.execute()
+        except self.errors:
+            if not self._failing:
+                logger.warning("Rate limit counters unavailable in Redis; counting per worker", exc_info=True)
+                self._failing = True
+            return self.fallback.hit(key)
+        if self._failing:
+            logger.info("Rate limit counters back in Redis")
+            self._failing = False
+        if count <= self.capacity:
+            return True, 0.0
+        return False, float(max(ttl, 1))
+
+    def clear(self) -> None:
+        self.fallback.clear()
+        for name in self.client.scan_iter("ratelimit:*"):
+            self.client.delete(name)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                local = TokenBucketLimiter(
+                    settings.LOGIN_RATE_LIMIT,
+                    settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+                    settings.RATE_LIMIT_MAX_KEYS,
+                    settings.RATE_LIMIT_SHARDS,
+                )
+                if settings.RATE_LIMIT_REDIS_URL:
+                    _limiter = RedisWindowLimiter(
+                        settings.RATE_LIMIT_REDIS_URL,
+                        settings.LOGIN_RATE_LIMIT,
+                        settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+                        fallback=local,
+                    )
+                else:
+                    _limiter = local
+    return _limiter
+
+
+def enforce_rate_limit(scope: str, request: Request, email: Optional[str] = None) -> None:
+    """Count one attempt against the client IP and (when given) the email; 429 once either is exhausted."""
+    if settings.LOGIN_RATE_LIMIT <= 0:
+        return
+    limiter = get_limiter()
+    keys = [(scope, "ip", request.client.host if request.client else "unknown")]
+    if email:
+        keys.append((scope, "email", email.strip().lower()))
+    for key in keys:
+        allowed, retry_after = limiter.hit(key)
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
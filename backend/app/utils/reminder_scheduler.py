@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select, update
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models.notification import Notification
+from app.models.reminder import Reminder
+from app.utils.notifications import add_unread
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive UTC throughout: SQLite hands back naive datetimes, PostgreSQL aware ones.
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def fire_due_reminders(ids: List[int], session_factory=SessionLocal) -> List[dict]:
+    """Claim the given reminders and create their notifications in one transaction.
+
+    The claim is a conditional UPDATE (is_completed false -> true), so when
+    several workers hold the same reminder only the first one to commit gets
+    it back and writes the notification; deleted reminders are simply absent.
+    """
+    db = session_factory()
+    try:
+        claimed = db.execute(
+            update(Reminder)
+            .filter(Reminder.id.in_(ids), Reminder.is_completed == False)  # noqa: E712
+            .values(is_completed=True)
+            .returning(Reminder.id, Reminder.user_id, Reminder.title, Reminder.description)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not claimed:
+            db.rollback()
+            return []
+        notifications = [
+            {"user_id": user_id, "title": title, "message": description or f"Reminder: {title}", "is_read": False}
+            for _, user_id, title, description in claimed
+        ]
+        db.execute(insert(Notification), notifications)
+        # Unread counters go up, and data_version with them: reminder lists changed too.
+        add_unread(db, Counter(n["user_id"] for n in notifications))
+        db.commit()
+        return notifications
+    finally:
+        db.close()
+
+
+class ReminderScheduler:
+    """Fires reminders from an in-memory min-heap instead of polling the table.
+
+    Only reminders due within REMINDER_SCHEDULER_HORIZON_SECONDS are held. That
+    window is reloaded every REMINDER_SCHEDULER_RELOAD_SECONDS with a range scan
+    on the (is_completed, remind_at) index, which also picks up reminders
+    created by other workers. Reminders created or deleted through this worker
+    are applied to the heap immediately.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._heap: List[tuple] = []
+        self._due_at: Dict[int, datetime] = {}  # reminder id -> due time; heap entries not matching are stale
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._window_end = datetime.min
+        self.listeners: List[Callable[[List[dict]], None]] = []
+
+    # Incremental updates, called from request handlers (any thread)
+
+    def schedule(self, reminder_id: int, remind_at: datetime) -> None:
+        remind_at = _utc(remind_at)
+        with self._lock:
+            if remind_at > self._window_end:
+                return  # picked up by a later reload
+            self._due_at[reminder_id] = remind_at
+            heapq.heappush(self._heap, (remind_at, reminder_id))
+            earliest = self._heap[0][1] == reminder_id
+        if earliest and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def unschedule(self, reminder_id: int) -> None:
+        with self._lock:
+            self._due_at.pop(reminder_id, None)
+
+    def __len__(self) -> int:
+        return len(self._due_at)
+
+    # Loop
+
+    def _reload(self) -> None:
+        window_end = _now() + timedelta(seconds=settings.REMINDER_SCHEDULER_HORIZON_SECONDS)
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(Reminder.id, Reminder.remind_at).filter(
+                    Reminder.is_completed == False, Reminder.remind_at <= window_end  # noqa: E712
+                )
+            ).all()
+        finally:
+            db.close()
+        due_at = {reminder_id: _utc(remind_at) for reminder_id, remind_at in rows}
+        heap = [(remind_at, reminder_id) for reminder_id, remind_at in due_at.items()]
+        heapq.heapify(heap)
+        with self._lock:
+            self._heap, self._due_at, self._window_end = heap, due_at, window_end
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(due) < settings.REMINDER_SCHEDULER_BATCH_SIZE:
+                remind_at, reminder_id = heapq.heappop(self._heap)
+                if self._due_at.get(reminder_id) == remind_at:
+                    del self._due_at[reminder_id]
+                    due.append(reminder_id)
+        return due
+
+    def _seconds_until_next(self, now: datetime, next_reload: datetime) -> float:
+        with self._lock:
+            wake_at = min(self._heap[0][0], next_reload) if self._heap else next_reload
+        return max(0.0, (wake_at - now).total_seconds())
+
+    async def _run(self) -> None:
+        next_reload = datetime.min
+        while True:
+            try:
+                now = _now()
+                if now >= next_reload:
+                    await run_in_threadpool(self._reload)
+                    next_reload = now + timedelta(seconds=settings.REMINDER_SCHEDULER_RELOAD_SECONDS)
+                due = self._pop_due(now)
+                if due:
+                    fired = await run_in_threadpool(fire_due_reminders, due, self.session_factory)
+                    if fired:
+                        logger.info("Fired %d reminders", len(fired))
+                        for listener in self.listeners:
+                            listener(fired)
+                    continue  # there may be more due than one batch
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._seconds_until_next(_now(), next_reload))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Reminder scheduler tick failed")
+                await asyncio.sleep(settings.REMINDER_SCHEDULER_RELOAD_SECONDS)
+                next_reload = datetime.min
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = self._loop = None
+
+
+reminder_scheduler = ReminderScheduler()
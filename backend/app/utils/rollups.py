@@ -0,0 +1,157 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import Date, cast, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionDailyRollup as Rollup
+from app.schemas.transaction import SummaryBucket
+
+
+def day_expr(dialect: str, column=Transaction.date):
+    if dialect == "postgresql":
+        return cast(column, Date)
+    return func.date(column)
+
+
+def period_expr(dialect: str, bucket: SummaryBucket, column):
+    # Bucket start as a YYYY-MM-DD string; weeks start on Monday.
+    if dialect == "postgresql":
+        return func.to_char(func.date_trunc(bucket.value, column), "YYYY-MM-DD")
+    if bucket == SummaryBucket.day:
+        return func.date(column)
+    if bucket == SummaryBucket.week:
+        return func.date(column, "-6 days", "weekday 1")
+    return func.strftime("%Y-%m-01", column)
+
+
+def add_to_rollups(db: Session, transactions) -> None:
+    """Fold newly inserted transactions into their daily buckets.
+
+    Rows are pre-aggregated per bucket and applied with one executemany upsert.
+    """
+    buckets = {}
+    for t in transactions:
+        key = (t.user_id, t.category, t.type, t.date.date())
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [t.amount, 1, t.amount, t.amount]
+        else:
+            bucket[0] += t.amount
+            bucket[1] += 1
+            bucket[2] = min(bucket[2], t.amount)
+            bucket[3] = max(bucket[3], t.amount)
+    if not buckets:
+        return
+
+    if db.bind.dialect.name == "postgresql":
+        stmt, smaller, larger = pg_insert(Rollup), func.least, func.greatest
+    else:
+        stmt, smaller, larger = sqlite_insert(Rollup), func.min, func.max
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "category", "type", "day"],
+        set_={
+            "total": Rollup.total + stmt.excluded.total,
+            "count": Rollup.count + stmt.excluded.count,
+            "min_amount": smaller(Rollup.min_amount, stmt.excluded.min_amount),
+            "max_amount": larger(Rollup.max_amount, stmt.excluded.max_amount),
+        },
+    )
+    db.execute(stmt, [
+        {
+            "user_id": user_id, "category": category, "type": tx_type, "day": day,
+            "total": total, "count": count, "min_amount": low, "max_amount": high,
+        }
+        for (user_id, category, tx_type, day), (total, count, low, high) in buckets.items()
+    ])
+
+
+def add_to_rollup(db: Session, transaction: Transaction) -> None:
+    add_to_rollups(db, [transaction])
+
+
+def refresh_rollup(db: Session, user_id: int, category: str, type, day: date):
+    """Recompute one bucket from the raw rows. Used after edits and deletes,
+    where min/max cannot be derived from the old aggregate."""
+    start = datetime.combine(day, time.min)
+    total, count, min_amount, max_amount = db.execute(
+        select(
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+            func.min(Transaction.amount),
+            func.max(Transaction.amount),
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.category == category,
+            Transaction.type == type,
+            Transaction.date >= start,
+            Transaction.date < start + timedelta(days=1),
+        )
+    ).one()
+    bucket = db.query(Rollup).filter(
+        Rollup.user_id == user_id, Rollup.category == category, Rollup.type == type, Rollup.day == day
+    ).first()
+    if not count:
+        if bucket:
+            db.delete(bucket)
+        return
+    if bucket is None:
+        bucket = Rollup(user_id=user_id, category=category, type=type, day=day)
+        db.add(bucket)
+    bucket.total, bucket.count, bucket.min_amount, bucket.max_amount = total, count, min_amount, max_amount
+
+
+def _raw_buckets(db: Session, user_id: Optional[int] = None):
+    day = day_expr(db.bind.dialect.name)
+    stmt = select(
+        Transaction.user_id,
+        Transaction.category,
+        Transaction.type,
+        day,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id),
+        func.min(Transaction.amount),
+        func.max(Transaction.amount),
+    ).group_by(Transaction.user_id, Transaction.category, Transaction.type, day)
+    if user_id is not None:
+        stmt = stmt.filter(Transaction.user_id == user_id)
+    return stmt
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """Backfill the rollup table from transactions in one INSERT ... SELECT."""
+    wipe = delete(Rollup)
+    if user_id is not None:
+        wipe = wipe.filter(Rollup.user_id == user_id)
+    db.execute(wipe)
+    columns = ["user_id", "category", "type", "day", "total", "count", "min_amount", "max_amount"]
+    result = db.execute(insert(Rollup).from_select(columns, _raw_buckets(db, user_id)))
+    db.commit()
+    return result.rowcount
+
+
+def find_rollup_mismatches(db: Session, user_id: Optional[int] = None, tolerance: float = 1e-6) -> list:
+    """Compare every rollup bucket with the raw table; returns (key, expected, actual) tuples."""
+    expected = {}
+    for uid, category, tx_type, day, *values in db.execute(_raw_buckets(db, user_id)):
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        expected[(uid, category, tx_type, day)] = tuple(values)
+
+    stmt = select(
+        Rollup.user_id, Rollup.category, Rollup.type, Rollup.day,
+        Rollup.total, Rollup.count, Rollup.min_amount, Rollup.max_amount,
+    )
+    if user_id is not None:
+        stmt = stmt.filter(Rollup.user_id == user_id)
+    actual = {(uid, category, tx_type, day): tuple(values) for uid, category, tx_type, day, *values in db.execute(stmt)}
+
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        want, got = expected.get(key), actual.get(key)
+        if want is None or got is None or any(abs(w - g) > tolerance for w, g in zip(want, got)):
+            mismatches.append((key, want, got))
+    return mismatches
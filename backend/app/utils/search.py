@@ -0,0 +1,160 @@
+"""Full-text search over transaction descriptions and categories.
+
+SQLite keeps an FTS5 index (transactions_fts) over the transactions table,
+maintained by triggers, so every write path (ORM, bulk insert, import, batch)
+stays in sync without application code. The owner's id is indexed as a third
+column, so a search only ever walks that user's postings. PostgreSQL uses a
+stored, generated tsvector column with a GIN index. Any other database gets
+an unindexed LIKE test of each word over the user's rows: correct, but its
+cost grows with the ledger.
+
+A search considers only the newest SEARCH_WINDOW matches (after the other
+filters); ranking and date ordering happen within that window. On SQLite the
+scan stops there, so a word that matches half of a million-row ledger costs
+no more than one that matches a few thousand rows.
+
+Neither object is on Base.metadata: init_db installs them after create_all,
+and alembic revision 0004 does the same for migrated databases. On SQLite,
+an alembic batch operation that rebuilds the transactions table drops the
+triggers; run install_search_index again afterwards.
+"""
+import re
+from typing import List
+
+from sqlalchemy import case, column, func, literal, literal_column, or_, select, table
+from sqlalchemy.engine import Connection
+
+from app.config import settings
+from app.models.transaction import Transaction
+
+FTS_TABLE = "transactions_fts"
+SEARCH_VECTOR = "search_vector"
+
+# setweight / _word_score: a hit in the description counts double one in the category
+SQLITE_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        description, category, user_id,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description, category, user_id)
+        VALUES (new.id, new.description, new.category, new.user_id);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, category, user_id)
+        VALUES ('delete', old.id, old.description, old.category, old.user_id);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF description, category, user_id ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, category, user_id)
+        VALUES ('delete', old.id, old.description, old.category, old.user_id);
+        INSERT INTO {FTS_TABLE}(rowid, description, category, user_id)
+        VALUES (new.id, new.description, new.category, new.user_id);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+# 'simple': merchant names and categories are not English prose, so no stemming or stop words
+POSTGRES_SEARCH_DDL = [
+    f"""ALTER TABLE transactions ADD COLUMN {SEARCH_VECTOR} tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(description, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(category, '')), 'B')
+    ) STORED""",
+    f"CREATE INDEX ix_transactions_search ON transactions USING gin ({SEARCH_VECTOR})",
+]
+
+_fts = table(FTS_TABLE, column("rowid"))
+_WORD = re.compile(r"\w+")
+
+
+def install_search_index(connection: Connection) -> bool:
+    """Create the search index if it is missing (building it from existing rows); True if it was created."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).first()
+        statements = SQLITE_SEARCH_DDL
+    elif dialect == "postgresql":
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = 'transactions' AND column_name = %s",
+            (SEARCH_VECTOR,),
+        ).first()
+        statements = POSTGRES_SEARCH_DDL
+    else:
+        return False
+    if exists:
+        return False
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    return True
+
+
+def search_terms(query: str) -> List[str]:
+    """The words of a user's query, lower-cased; punctuation and operators are dropped."""
+    return _WORD.findall(query.lower())[:settings.SEARCH_MAX_TERMS]
+
+
+def search_statement(dialect: str, user_id: int, terms: List[str], columns):
+    """SELECT columns plus a `score` (higher is better) for the user's rows matching every term as a prefix."""
+    if dialect == "sqlite":
+        # Terms are \w+ only, so quoting them is enough to keep FTS5 syntax out of user input
+        words = " AND ".join(f'"{term}"*' for term in terms)
+        expression = f'user_id : "{int(user_id)}" AND {{description category}} : ({words})'
+        # Not bm25(): it counts every row containing each phrase (the user_id
+        # one included) before scoring, so its cost grows with the ledger
+        score = sum(
+            2 * _word_score(Transaction.description, term) + _word_score(Transaction.category, term) for term in terms
+        ).label("score")
+        return (
+            select(*columns, score)
+            .join_from(_fts, Transaction, Transaction.id == _fts.c.rowid)
+            .where(literal_column(FTS_TABLE).op("MATCH")(expression))
+        )
+    if dialect == "postgresql":
+        vector = literal_column(f"transactions.{SEARCH_VECTOR}")
+        query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        return select(*columns, func.ts_rank(vector, query).label("score")).where(vector.op("@@")(query))
+    score = sum(
+        2 * case((_has_word(Transaction.description, term), 1), else_=0)
+        + case((_has_word(Transaction.category, term), 1), else_=0)
+        for term in terms
+    ).label("score")
+    return select(*columns, score).where(
+        *(or_(_has_word(Transaction.description, term), _has_word(Transaction.category, term)) for term in terms)
+    )
+
+
+def _has_word(text_column, term: str):
+    """A word of the column starts with term, as a portable LIKE (`_` in a term is literal)."""
+    words = literal(" ") + func.lower(func.coalesce(text_column, ""))
+    return words.like("% " + term.replace("_", "\\_") + "%", escape="\\")
+
+
+def _word_score(text_column, term: str):
+    """1 if a word of the column starts with term (the test FTS5 applied to the row), else 0.
+
+    SQLite's lower() folds ASCII only, so a match FTS5 made through case or
+    accent folding of other letters scores 0 here; the row is still returned.
+    """
+    words = literal(" ") + func.lower(func.coalesce(text_column, ""))
+    return case((func.instr(words, literal(" " + term)) > 0, 1), else_=0)
+
+
+def newest_matches(stmt, dialect: str):
+    """Limit a (filtered) search_statement to its newest SEARCH_WINDOW rows, as a subquery to order and page."""
+    if dialect == "sqlite":
+        # FTS5 hands back matches in rowid order, so this stops early; ordering
+        # by date instead would make SQLite walk the ledger and probe the index per row
+        return stmt.order_by(_fts.c.rowid.desc()).limit(settings.SEARCH_WINDOW).subquery("hits")
+    # PostgreSQL (other databases take the same path). GIN has no order. Given ORDER BY date, the planner would rather walk the
+    # user's rows newest first testing each one, which reads the whole ledger for
+    # a rare word; OFFSET 0 keeps the subquery on the index (cost grows with the
+    # user's matching rows, not the ledger) and the newest are sorted out of it.
+    matches = stmt.offset(0).subquery("matches")
+    return (
+        select(matches)
+        .order_by(matches.c.date.desc(), matches.c.id.desc())
+        .limit(settings.SEARCH_WINDOW)
+        .subquery("hits")
+    )
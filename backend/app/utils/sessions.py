@@ -0,0 +1,112 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.session import SessionModel
+from app.utils.jwt import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
+
+# jti -> expiry of every revoked, not yet expired token. A periodic job keeps it
+# in step with the sessions table by polling revoked_at every
+# SESSION_REVOCATION_REFRESH_SECONDS, so the check on the request path is only
+# a dict lookup and never blocks the event loop on a query.
+_revoked = {}
+_lock = threading.Lock()
+_state = {"watermark": None}
+
+
+def issue_session_token(db: Session, user_id: int, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> str:
+    jti = uuid.uuid4().hex
+    expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    db.add(SessionModel(
+        user_id=user_id,
+        jti=jti,
+        expired_at=datetime.utcnow() + expires_delta,
+        ip_address=ip_address,
+        user_agent=(user_agent or "")[:255] or None,
+        is_active=True,
+    ))
+    db.commit()
+    return create_access_token(data={"sub": str(user_id), "jti": jti}, expires_delta=expires_delta)
+
+
+def revoke_sessions(db: Session, user_id: int, jti: Optional[str] = None, keep_jti: Optional[str] = None) -> int:
+    """Revoke one session (by jti) or, without a jti, every active session of the user but `keep_jti`."""
+    criteria = [SessionModel.user_id == user_id, SessionModel.is_active == True]  # noqa: E712
+    if jti is not None:
+        criteria.append(SessionModel.jti == jti)
+    if keep_jti is not None:
+        criteria.append(SessionModel.jti != keep_jti)
+    revoked = db.execute(select(SessionModel.jti, SessionModel.expired_at).filter(*criteria)).all()
+    if revoked:
+        db.execute(
+            update(SessionModel)
+            .filter(SessionModel.jti.in_([r.jti for r in revoked]))
+            .values(is_active=False, revoked_at=datetime.utcnow())
+        )
+    db.commit()
+    with _lock:
+        for row in revoked:
+            _revoked[row.jti] = row.expired_at or datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    return len(revoked)
+
+
+def refresh_revocations() -> None:
+    """The periodic job: pull sessions revoked since the last poll (by any worker) and drop expired entries."""
+    if not _lock.acquire(blocking=False):
+        return  # another thread is already refreshing
+    try:
+        now = datetime.utcnow()
+        watermark = _state["watermark"]
+        stmt = select(SessionModel.jti, SessionModel.expired_at, SessionModel.revoked_at).filter(
+            SessionModel.revoked_at.isnot(None)
+        )
+        if watermark is None:
+            stmt = stmt.filter(SessionModel.expired_at > now)
+        else:
+            # Small overlap so rows committed slightly out of order are not missed.
+            stmt = stmt.filter(SessionModel.revoked_at >= watermark - timedelta(seconds=5))
+        db = SessionLocal()
+        try:
+            for jti, expired_at, revoked_at in db.execute(stmt):
+                _revoked[jti] = expired_at or now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+                if watermark is None or revoked_at > watermark:
+                    watermark = revoked_at
+            _state["watermark"] = watermark or now
+
+            for jti in [jti for jti, expires in _revoked.items() if expires <= now]:
+                del _revoked[jti]
+        finally:
+            db.close()
+    finally:
+        _lock.release()
+
+
+def is_revoked(jti: str) -> bool:
+    return jti in _revoked
+
+
+def sweep_expired_sessions(db: Session, batch_size: int = 1000) -> int:
+    """Delete expired sessions in small batches so the table stays small without long locks."""
+    now = datetime.utcnow()
+    deleted = 0
+    while True:
+        ids = db.scalars(select(SessionModel.id).filter(SessionModel.expired_at < now).limit(batch_size)).all()
+        if not ids:
+            return deleted
+        db.execute(delete(SessionModel).filter(SessionModel.id.in_(ids)))
+        db.commit()
+        deleted += len(ids)
+
+
+def sweep_sessions() -> int:
+    """The periodic job: sweep_expired_sessions in a session of its own, off the request path."""
+    db = SessionLocal()
+    try:
+        return sweep_expired_sessions(db)
+    finally:
+        db.close()
@@ -0,0 +1,112 @@
+"""Compare the sync (threadpool) and async (AsyncSession) database modes.
+
+Starts one uvicorn process per mode against the same database and fires
+concurrent GET /transactions requests at it.
+
+Usage (from backend/): python -m scripts.bench_db_modes --concurrency 200 --requests 4000
+Pass --url to benchmark against PostgreSQL; the default is a temporary SQLite file.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def run_load(base_url: str, mode: str, concurrency: int, total: int, seed_rows: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        credentials = {"email": f"bench-{mode}-{int(time.time())}@example.com", "password": "benchmark-password"}
+        await client.post("/auth/register", json=credentials)
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for i in range(seed_rows):
+            await client.post("/transactions", headers=headers, json={
+                "amount": i % 97 + 1, "category": f"cat{i % 8}", "type": "expense",
+            })
+
+        latencies = []
+        errors = 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/transactions", headers=headers, params={"limit": 50})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    return
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"{mode:5s} {total / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+        f"errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="DATABASE_URL to use (defaults to a temporary SQLite file)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--seed-rows", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--only", choices=["sync", "async"], default=None, help="Benchmark a single mode")
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_modes.db")
+    base_url = f"http://127.0.0.1:{args.port}"
+    modes = [("sync", "false"), ("async", "true")]
+    if args.only:
+        modes = [m for m in modes if m[0] == args.only]
+    for mode, flag in modes:
+        env = dict(os.environ, DATABASE_URL=url, DB_ASYNC=flag)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        try:
+            asyncio.run(wait_until_up(base_url))
+            asyncio.run(run_load(base_url, mode, args.concurrency, args.requests, args.seed_rows))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure export throughput and peak memory per format.
+
+Usage (from backend/): python -m scripts.bench_export --rows 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import budget, export_log, reminder  # noqa: F401  (register User relationships)
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.utils.exporters import EXPORT_FORMATS, export_statement, stream_rows
+
+CATEGORIES = ["groceries", "rent", "transport", "dining", "utilities", "salary", "shopping", "health"]
+
+
+def build_fixture(url: str, rows: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2015, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+        for offset in range(0, rows, 50_000):
+            conn.execute(insert(Transaction), [
+                {
+                    "user_id": 1,
+                    "amount": round(random.uniform(1, 500), 2),
+                    "category": random.choice(CATEGORIES),
+                    "type": TransactionType.expense if i % 10 else TransactionType.income,
+                    "description": f"Fixture transaction {i}",
+                    "date": start + timedelta(minutes=5 * i),
+                }
+                for i in range(offset, min(offset + 50_000, rows))
+            ])
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--url", default=None, help="Database URL (defaults to a temporary SQLite file)")
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_export.db")
+    if args.url is None:
+        print(f"Building {args.rows} row fixture in {url} ...")
+        build_fixture(url, args.rows)
+    session_factory = sessionmaker(bind=create_engine(url))
+
+    def run(writer):
+        size = 0
+        for chunk in writer(stream_rows(export_statement(1), session_factory)):
+            size += len(chunk)
+        return size
+
+    for name, (_, writer) in EXPORT_FORMATS.items():
+        started = time.perf_counter()
+        size = run(writer)
+        elapsed = time.perf_counter() - started
+        # Second pass under tracemalloc, which would otherwise distort the timing.
+        tracemalloc.start()
+        run(writer)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:7s} {elapsed:8.2f}s  {args.rows / elapsed:10.0f} rows/s  {size / 2**20:8.1f} MiB out  peak {peak / 2**20:6.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Measure spending forecast latency and batch refresh throughput.
+
+Seeds --users users (scripts.seed, two years of history each) into a
+temporary SQLite file or --url, then reports:
+  * fit: the vectorized fit of one user's categories against fitting them one
+    category at a time, per bucket;
+  * request: computing a forecast from the rollups (a cold /forecast), and
+    answering from the stored one;
+  * batch: refresh_forecasts for every user inline and with --workers processes.
+
+Usage (from backend/): python -m scripts.bench_forecast --users 2000 --workers 4
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import spending_forecast  # noqa: F401
+from app.models.spending_forecast import SpendingForecast
+from app.models.user import User
+from app.schemas.transaction import SummaryBucket
+from app.utils.forecast import DEFAULT_HORIZON, SEASON, _history_stmt, expense_matrix, fit_forecasts, get_forecast, period_starts, refresh_forecasts
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--transactions-per-user", type=int, default=1500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--url", default=None, help="Empty database to fill (defaults to a temporary SQLite file)")
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_forecast.db")
+    print(f"Seeding {args.users} users x {args.transactions_per_user} transactions into {url} ...")
+    subprocess.run(
+        [sys.executable, "-m", "scripts.seed", "--users", str(args.users), "--transactions-per-user",
+         str(args.transactions_per_user), "--budgets-per-user", "0", "--reminders-per-user", "0"],
+        cwd=BACKEND_DIR, env=dict(os.environ, DATABASE_URL=url), check=True, stdout=subprocess.DEVNULL,
+    )
+    engine = create_engine(url)
+    SpendingForecast.__table__.create(bind=engine, checkfirst=True)
+    db = sessionmaker(bind=engine)()
+    user_id = db.scalar(select(User.id).order_by(User.id))
+    today = date.today()
+
+    for bucket in SummaryBucket:
+        horizon = DEFAULT_HORIZON[bucket]
+        history, ahead = period_starts(bucket, today, horizon)
+        rows = [(c, d, t) for _, c, d, t in db.execute(_history_stmt([user_id], [bucket], today))]
+        _, y = expense_matrix(rows, history, ahead[0])
+        vectorized = timed(lambda: fit_forecasts(y, SEASON[bucket], horizon), args.repeat)
+        looped = timed(lambda: [fit_forecasts(y[i:i + 1], SEASON[bucket], horizon) for i in range(len(y))], args.repeat)
+
+        def cold():
+            db.execute(delete(SpendingForecast))
+            db.commit()
+            get_forecast(db, user_id, bucket, horizon)
+
+        cold_ms = timed(cold, args.repeat)
+        warm_ms = timed(lambda: get_forecast(db, user_id, bucket, horizon), args.repeat)
+        print(
+            f"{bucket.value:5s} {y.shape[0]:2d} categories x {y.shape[1]:3d} periods  "
+            f"fit {vectorized:6.2f} ms (one category at a time {looped:6.2f} ms)  "
+            f"request cold {cold_ms:6.2f} ms, stored {warm_ms:5.2f} ms"
+        )
+
+    targets = [(bucket, DEFAULT_HORIZON[bucket]) for bucket in SummaryBucket]
+    for workers in sorted({1, args.workers}):
+        started = time.perf_counter()
+        written = refresh_forecasts(db, targets, workers=workers, force=True)
+        elapsed = time.perf_counter() - started
+        print(f"batch, {workers} worker(s): {written} forecasts in {elapsed:.1f}s ({args.users / elapsed:.0f} users/s)")
+    started = time.perf_counter()
+    written = refresh_forecasts(db, targets, workers=args.workers)
+    print(f"batch with nothing stale: {written} written in {(time.perf_counter() - started) * 1000:.0f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    np.seterr(all="raise")  # a silent NaN or division by zero in the models is a bug
+    main()
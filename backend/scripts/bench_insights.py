@@ -0,0 +1,83 @@
+"""Measure how long computing and serving a user's spending insights takes.
+
+Seeds one user with --transactions transactions (scripts.seed) into a
+temporary SQLite file or --url, then reports, per history size:
+  * load: reading the user's expenses into arrays;
+  * compute: statistics, outliers, spikes and recurring charges over them;
+  * request: a cold /insights (load, compute and store) and a stored one.
+
+Usage (from backend/): python -m scripts.bench_insights --transactions 100000
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import spending_insights  # noqa: F401
+from app.models.spending_insights import SpendingInsights
+from app.models.user import User
+from app.utils.insights import compute_insights, get_insights, load_expenses
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", default=None, help="Empty database to fill (defaults to a temporary SQLite file)")
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_insights.db")
+    print(f"Seeding 1 user x {args.transactions} transactions into {url} ...")
+    subprocess.run(
+        [sys.executable, "-m", "scripts.seed", "--users", "1", "--transactions-per-user", str(args.transactions),
+         "--budgets-per-user", "0", "--reminders-per-user", "0"],
+        cwd=BACKEND_DIR, env=dict(os.environ, DATABASE_URL=url), check=True, stdout=subprocess.DEVNULL,
+    )
+    engine = create_engine(url)
+    SpendingInsights.__table__.create(bind=engine, checkfirst=True)
+    db = sessionmaker(bind=engine)()
+    user_id = db.scalar(select(User.id).order_by(User.id))
+    today = (date.today() - date(1970, 1, 1)).days
+
+    expenses = load_expenses(db, user_id)
+    payload = compute_insights(*expenses, today)
+    load_ms = timed(lambda: load_expenses(db, user_id), args.repeat)
+    compute_ms = timed(lambda: compute_insights(*expenses, today), args.repeat)
+
+    def cold():
+        db.execute(delete(SpendingInsights))
+        db.commit()
+        get_insights(db, user_id)
+
+    cold_ms = timed(cold, args.repeat)
+    stored_ms = timed(lambda: get_insights(db, user_id), args.repeat * 10)
+    print(
+        f"{payload['transactions']} expenses in {len(payload['categories'])} categories: "
+        f"{len(payload['outliers'])} outliers, {len(payload['spikes'])} spikes, {len(payload['recurring'])} recurring"
+    )
+    print(f"load {load_ms:7.1f} ms  compute {compute_ms:7.1f} ms  request cold {cold_ms:7.1f} ms, stored {stored_ms:5.2f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    np.seterr(all="raise")  # a silent NaN or division by zero is a bug
+    main()
@@ -0,0 +1,96 @@
+"""Check that a login storm does not degrade the rest of the API.
+
+Starts uvicorn, measures GET /transactions latency at rest, then again while
+--storm concurrent clients hammer POST /auth/login for --seconds seconds.
+
+Usage (from backend/): python -m scripts.bench_login_storm --storm 100 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from scripts.bench_db_modes import BACKEND_DIR, percentile, wait_until_up
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, seconds: float, interval: float = 0.05) -> list:
+    latencies = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/transactions", headers=headers, params={"limit": 20})
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def storm(client: httpx.AsyncClient, credentials: dict, seconds: float, counts: dict):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        response = await client.post("/auth/login", json=credentials)
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("retry-after", "1")) / 10)
+
+
+def describe(label: str, latencies: list) -> str:
+    return (
+        f"{label:14s} p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms  ({len(latencies)} probes)"
+    )
+
+
+async def run(base_url: str, storm_size: int, seconds: float):
+    limits = httpx.Limits(max_connections=storm_size + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        credentials = {"email": f"storm-{int(time.time())}@example.com", "password": "benchmark-password"}
+        await client.post("/auth/register", json=credentials)
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        at_rest = await probe(client, headers, seconds)
+        counts = {}
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            probe(client, headers, seconds),
+            *(storm(client, credentials, seconds, counts) for _ in range(storm_size)),
+        )
+        elapsed = time.perf_counter() - started
+
+    print(describe("at rest", at_rest))
+    print(describe("during storm", results[0]))
+    print(f"logins: {counts.get(200, 0) / elapsed:.1f}/s ok, {counts.get(503, 0)} rejected with 503, other {counts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="DATABASE_URL to use (defaults to a temporary SQLite file)")
+    parser.add_argument("--storm", type=int, default=100, help="Concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_login.db")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ, DATABASE_URL=url),
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_up(base_url))
+        asyncio.run(run(base_url, args.storm, args.seconds))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure /transactions/search query latency on a large ledger.
+
+Builds one user with --rows transactions (plus --other-users with a tenth as
+many each, so the index is shared as in production), then times the search
+statement for rare, common, prefix and multi-word queries.
+
+Usage (from backend/): python -m scripts.bench_search --rows 1000000
+Pass --url to benchmark an empty PostgreSQL database; the default is a temporary SQLite file.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import transaction_rollup  # noqa: F401
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.routes.transactions import TRANSACTION_COLUMNS
+from app.utils.search import install_search_index, newest_matches, search_statement, search_terms
+from scripts.bench_db_modes import percentile
+from scripts.seed import user_transactions
+
+QUERIES = [
+    ("rare merchant", "amtrak"),
+    ("common merchant", "starbucks"),
+    ("category", "groceries"),
+    ("short prefix", "st"),
+    ("two words", "whole foods"),
+    ("no match", "zzzz"),
+]
+
+
+def build_fixture(url: str, rows: int, other_users: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(1)
+    end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    days = 3650
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": n + 1, "email": f"search-{n}@example.com", "hashed_password": "x"} for n in range(other_users + 1)
+        ])
+        for user_id in range(1, other_users + 2):
+            batch = []
+            for row in user_transactions(rng, user_id, rows if user_id == 1 else rows // 10, end - timedelta(days=days), days):
+                batch.append(row)
+                if len(batch) == 50_000:
+                    conn.execute(insert(Transaction), batch)
+                    batch = []
+            if batch:
+                conn.execute(insert(Transaction), batch)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        install_search_index(conn)
+    print(f"Search index built in {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--other-users", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--url", default=None, help="Empty database to fill (defaults to a temporary SQLite file)")
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_search.db")
+    print(f"Building {args.rows} row ledger in {url} ...")
+    build_fixture(url, args.rows, args.other_users)
+    engine = create_engine(url)
+    session = sessionmaker(bind=engine)()
+    dialect = engine.dialect.name
+
+    for label, query in QUERIES:
+        for order in ("rank", "date"):
+            matches = search_statement(dialect, 1, search_terms(query), TRANSACTION_COLUMNS)
+            hits = newest_matches(matches.filter(Transaction.user_id == 1), dialect)
+            stmt = select(hits).order_by(hits.c.score.desc() if order == "rank" else hits.c.date.desc()).limit(args.limit)
+            timings, hits = [], 0
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                hits = len(session.execute(stmt).all())
+                timings.append(time.perf_counter() - started)
+            print(
+                f"{label:16s} {query!r:14s} by {order:4s}  {hits:3d} hits  "
+                f"p50 {statistics.median(timings) * 1000:7.2f} ms  p95 {percentile(timings, 95) * 1000:7.2f} ms"
+            )
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare the ORM + Pydantic list path with the Core + orjson fast read path.
+
+Builds a response body for --rows transactions three ways and reports rows/second:
+  orm+pydantic   ORM objects validated through TransactionOut, encoded by Pydantic (the old path)
+  core+adapter   Core column rows validated by a precompiled TypeAdapter, encoded by Pydantic
+  core+orjson    Core column rows kept as dicts and encoded by orjson (what the list endpoints use)
+
+Usage (from backend/): python -m scripts.bench_serialization --rows 10000
+Set DATABASE_URL to benchmark against PostgreSQL; the default is a temporary SQLite file.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.models import budget, export_log, reminder, transaction_rollup  # noqa: E402,F401
+from app.models.transaction import Transaction, TransactionType  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routes.transactions import TRANSACTION_COLUMNS  # noqa: E402
+from app.schemas.transaction import TransactionOut  # noqa: E402
+from app.utils.fast_read import FastJSONResponse, as_dicts  # noqa: E402
+
+TRANSACTION_LIST = TypeAdapter(List[TransactionOut])
+
+
+def orm_pydantic(db, user_id):
+    rows = db.execute(select(Transaction).filter(Transaction.user_id == user_id)).scalars().all()
+    items = [TransactionOut.model_validate(row, from_attributes=True) for row in rows]
+    return TRANSACTION_LIST.dump_json(items)
+
+
+def core_adapter(db, user_id):
+    rows = as_dicts(db.execute(select(*TRANSACTION_COLUMNS).filter(Transaction.user_id == user_id)))
+    return TRANSACTION_LIST.dump_json(TRANSACTION_LIST.validate_python(rows))
+
+
+def core_orjson(db, user_id):
+    rows = as_dicts(db.execute(select(*TRANSACTION_COLUMNS).filter(Transaction.user_id == user_id)))
+    return FastJSONResponse(rows).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email=f"bench-serialization-{time.time()}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    start = datetime(2024, 1, 1)
+    db.execute(insert(Transaction), [
+        {"user_id": user_id, "amount": i % 500 + 0.99, "category": f"cat{i % 12}",
+         "type": TransactionType.expense, "description": f"purchase {i}", "date": start + timedelta(minutes=i)}
+        for i in range(args.rows)
+    ])
+    db.commit()
+
+    for name, build in (("orm+pydantic", orm_pydantic), ("core+adapter", core_adapter), ("core+orjson", core_orjson)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            db.expunge_all()
+            started = time.perf_counter()
+            body = build(db, user_id)
+            best = min(best, time.perf_counter() - started)
+        print(f"{name:14s} {best * 1000:8.1f} ms  {args.rows / best:10,.0f} rows/s  {len(body) / 1024:8.0f} KiB")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
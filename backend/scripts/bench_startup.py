@@ -0,0 +1,146 @@
+"""Track cold-start time and steady-state throughput, so startup cost does not creep back.
+
+Each measurement uses a fresh interpreter:
+  * import: wall time of `import app.main` (median of --runs), the packages that
+    account for it, and a check that importing did not touch the database;
+  * ready: from launching `python -m app.serve` until GET / answers;
+  * steady state: requests/s and latency for GET / and GET /transactions
+    against that server.
+
+Usage (from backend/): python -m scripts.bench_startup --workers 2 --duration 10
+Pass --max-import-ms and/or --max-ready-ms to exit non-zero when a budget is exceeded.
+"""
+import argparse
+import asyncio
+import os
+import re
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from scripts.bench_db_modes import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_PROBE = "import time; started = time.perf_counter(); import app.main; print((time.perf_counter() - started) * 1000)"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|( *)(\S+)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold imports to take the median of")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per endpoint")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-ready-ms", type=float, default=None)
+    return parser.parse_args()
+
+
+def measure_import(env: dict, runs: int, db_path: str) -> float:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.split()[-1]))
+    if os.path.exists(db_path):
+        sys.exit("importing app.main created the database: something connects at import time")
+
+    # Self time per top-level package, from one more run under -X importtime
+    trace = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR,
+                           env=env, capture_output=True, text=True, check=True).stderr
+    by_package = Counter()
+    for match in IMPORTTIME_LINE.finditer(trace):
+        by_package[match.group(3).split(".")[0]] += int(match.group(1))
+    median = statistics.median(timings)
+    print(f"import app.main  median {median:7.1f} ms  (min {min(timings):.1f}, max {max(timings):.1f})")
+    print("  " + ", ".join(f"{name} {micros / 1000:.0f}" for name, micros in by_package.most_common(10)) + " (ms)")
+    return median
+
+
+def start_server(env: dict, base_url: str):
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "app.serve"], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with httpx.Client(base_url=base_url) as client:
+        while time.perf_counter() - started < 60:
+            try:
+                if client.get("/").status_code == 200:
+                    ready = (time.perf_counter() - started) * 1000
+                    print(f"serve ready      {ready:7.1f} ms")
+                    return server, ready
+            except httpx.TransportError:
+                time.sleep(0.01)
+    server.kill()
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def steady_state(base_url: str, concurrency: int, duration: float):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        credentials = {"email": f"bench-startup-{int(time.time())}@example.com", "password": "benchmark-password"}
+        await client.post("/auth/register", json=credentials)
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        await client.post("/transactions/batch", headers=headers, json={"create": [
+            {"amount": i % 97 + 1, "category": f"cat{i % 8}", "type": "expense"} for i in range(200)
+        ]})
+
+        for path, request_headers in (("/", None), ("/transactions?limit=50", headers)):
+            latencies, errors = [], 0
+            deadline = time.perf_counter() + duration
+
+            async def worker():
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        (await client.get(path, headers=request_headers)).raise_for_status()
+                    except httpx.HTTPError:
+                        errors += 1
+                        continue
+                    latencies.append(time.perf_counter() - started)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            print(
+                f"GET {path:22s} {len(latencies) / duration:8.1f} req/s  "
+                f"p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+                f"p99 {percentile(latencies, 99) * 1000:6.1f} ms  errors {errors}"
+            )
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "bench_startup.db")
+    env = dict(
+        os.environ, DATABASE_URL=f"sqlite:///{db_path}", SERVER_WORKERS=str(args.workers),
+        SERVER_PORT=str(args.port), SERVER_HOST="127.0.0.1", LOGIN_RATE_LIMIT="0", REMINDER_SCHEDULER_ENABLED="false",
+    )
+
+    import_ms = measure_import(env, args.runs, db_path)
+    base_url = f"http://127.0.0.1:{args.port}"
+    server, ready_ms = start_server(env, base_url)
+    try:
+        asyncio.run(steady_state(base_url, args.concurrency, args.duration))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    over = []
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        over.append(f"import {import_ms:.0f} ms > {args.max_import_ms:.0f} ms")
+    if args.max_ready_ms is not None and ready_ms > args.max_ready_ms:
+        over.append(f"ready {ready_ms:.0f} ms > {args.max_ready_ms:.0f} ms")
+    if over:
+        sys.exit("Over budget: " + "; ".join(over))
+
+
+if __name__ == "__main__":
+    main()
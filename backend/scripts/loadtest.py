@@ -0,0 +1,188 @@
+"""Replay a mixed workload against the API and write a JSON latency baseline.
+
+Virtual users log in as seeded accounts (see scripts/seed.py), then loop over a
+weighted mix of requests: list, create, budget status, summaries and the
+occasional re-login. The report has, per endpoint, throughput and p50/p95/p99
+latency; --compare prints the change against an earlier report.
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:///./loadtest.db python -m scripts.seed --users 200 --transactions-per-user 1000
+    python -m scripts.loadtest --url sqlite:///./loadtest.db --users 200 --duration 60 --output baseline.json
+    python -m scripts.loadtest --url sqlite:///./loadtest.db --users 200 --compare baseline.json
+
+--url starts a uvicorn server against that database (with the login rate limit
+off). Use --base-url instead to target a server that is already running.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import httpx
+
+from scripts.bench_db_modes import BACKEND_DIR, percentile, wait_until_up
+from scripts.seed import EXPENSE_CATEGORIES, SEED_PASSWORD
+
+# name: (weight, method, path)
+WORKLOAD = {
+    "list": (35, "GET", "/transactions"),
+    "create": (15, "POST", "/transactions"),
+    "budget_status": (15, "GET", "/budgets/status"),
+    "summary": (15, "GET", "/transactions/summary"),
+    "summary_categories": (10, "GET", "/transactions/summary/categories"),
+    "summary_timeseries": (8, "GET", "/transactions/summary/timeseries"),
+    "login": (2, "POST", "/auth/login"),
+}
+
+
+def request_kwargs(name: str, rng: random.Random, email: str) -> dict:
+    if name == "list":
+        return {"params": {"limit": 50}}
+    if name == "create":
+        category = rng.choice(list(EXPENSE_CATEGORIES))
+        return {"json": {
+            "amount": round(rng.uniform(3, 120), 2), "category": category, "type": "expense",
+            "description": "load test", "date": (datetime.now() - timedelta(days=rng.randrange(30))).isoformat(),
+        }}
+    if name == "summary_timeseries":
+        return {"params": {"bucket": "month"}}
+    if name == "login":
+        return {"json": {"email": email, "password": SEED_PASSWORD}}
+    return {}
+
+
+async def virtual_user(client, email, rng, deadline, results, errors, think_time):
+    started = time.perf_counter()
+    response = await client.post("/auth/login", json={"email": email, "password": SEED_PASSWORD})
+    if response.status_code != 200:
+        errors["login"] += 1
+        return
+    results["login"].append(time.perf_counter() - started)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    names = list(WORKLOAD)
+    weights = [WORKLOAD[name][0] for name in names]
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights=weights)[0]
+        _, method, path = WORKLOAD[name]
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, headers=headers, **request_kwargs(name, rng, email))
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors[name] += 1
+        else:
+            results[name].append(time.perf_counter() - started)
+        if think_time:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+async def run(base_url: str, args) -> dict:
+    rng = random.Random(args.random_seed)
+    results, errors = defaultdict(list), defaultdict(int)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.monotonic() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            virtual_user(
+                client, f"{args.prefix}-{n % args.users}@example.com", random.Random(rng.random()),
+                deadline, results, errors, args.think_time,
+            )
+            for n in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in WORKLOAD:
+        latencies = results.get(name, [])
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": errors.get(name, 0),
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        }
+    total = sum(len(v) for v in results.values())
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "database": args.url or args.base_url,
+        "host": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "total": {"requests": total, "errors": sum(errors.values()), "rps": round(total / elapsed, 2)},
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict, baseline: dict = None):
+    header = f"{'endpoint':20s} {'req':>7s} {'err':>5s} {'req/s':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}"
+    print(header + ("   p95 vs baseline" if baseline else ""))
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, stats in rows:
+        line = f"{name:20s} {stats['requests']:7d} {stats['errors']:5d} {stats['rps']:8.1f}"
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            value = stats.get(key)
+            line += f" {value:9.1f}" if value is not None else f" {'-':>9s}"
+        old = (baseline or {}).get("endpoints", {}).get(name, {})
+        if old.get("p95_ms") and stats.get("p95_ms"):
+            line += f"   {(stats['p95_ms'] / old['p95_ms'] - 1) * 100:+6.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="DATABASE_URL to start a local server against")
+    target.add_argument("--base-url", help="URL of an already running server")
+    parser.add_argument("--users", type=int, default=100, help="How many seeded accounts to log in as")
+    parser.add_argument("--prefix", default="seed", help="Email prefix used when seeding")
+    parser.add_argument("--concurrency", type=int, default=50, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between requests, in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when --url is used")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier JSON report to compare p95 latencies against")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if args.url:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=dict(os.environ, DATABASE_URL=args.url, LOGIN_RATE_LIMIT="0"),
+        )
+    try:
+        asyncio.run(wait_until_up(base_url))
+        report = asyncio.run(run(base_url, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
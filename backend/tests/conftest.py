@@ -0,0 +1,78 @@
+import itertools
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Point the app at a scratch database before anything imports app.config (the
+# .env file names the production database): a temporary SQLite file, or the
+# database in TEST_DATABASE_URL, e.g. an empty PostgreSQL one for the
+# concurrency tests that SQLite's single writer cannot exercise.
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or "sqlite:///" + os.path.join(
+    tempfile.mkdtemp(prefix="expense-tests-"), "test.db"
+)
+os.environ["EXPORT_DIR"] = tempfile.mkdtemp(prefix="expense-tests-exports-")
+os.environ["HASH_POOL_WORKERS"] = "0"
+os.environ["LOGIN_RATE_LIMIT"] = "0"
+os.environ["REMINDER_SCHEDULER_ENABLED"] = "false"
+os.environ["INSIGHTS_REFRESH_ON_WRITE"] = "false"
+sys.path.insert(0, BACKEND_DIR)
+
+_emails = itertools.count()
+_run = uuid.uuid4().hex[:8]  # a reused TEST_DATABASE_URL keeps the users of earlier runs
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.db import init_db
+    from app.main import app
+
+    init_db()
+    # No context manager: the lifespan would start the scheduler, the SSE poller and the periodic jobs.
+    return TestClient(app)
+
+
+def login(client, email, password="password123"):
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def new_user(client):
+    """Registers a user on each call; returns (email, authorization headers)."""
+
+    def register():
+        email = f"user-{_run}-{next(_emails)}@example.com"
+        assert client.post("/auth/register", json={"email": email, "password": "password123"}).status_code == 201
+        return email, login(client, email)
+
+    return register
+
+
+@pytest.fixture
+def auth(new_user):
+    """Authorization headers for a freshly registered user."""
+    return new_user()[1]
+
+
+@pytest.fixture
+def postgresql_only(client):
+    from app.db import get_engine
+
+    if get_engine().dialect.name != "postgresql":
+        pytest.skip("needs TEST_DATABASE_URL pointing at PostgreSQL")
+
+
+@pytest.fixture
+def db(client):
+    from app.db import SessionLocal
+
+    with SessionLocal() as session:
+        yield session
@@ -0,0 +1,87 @@
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import update
+
+from app.config import settings
+from app.models.session import SessionModel
+from app.models.user import User
+from app.utils import cache
+from app.utils import hash as hashing
+from app.utils import sessions
+from app.utils.jwt import decode_access_token
+from tests.conftest import login
+
+
+def jti(headers):
+    return decode_access_token(headers["Authorization"].split(" ", 1)[1])["jti"]
+
+
+def test_logout_revokes_only_that_session(client, new_user):
+    email, first = new_user()
+    second = login(client, email)
+    assert client.post("/auth/logout", headers=first).status_code == 200
+    assert client.get("/auth/me", headers=first).status_code == 401
+    assert client.get("/auth/me", headers=second).status_code == 200
+
+
+def test_password_change_signs_out_every_other_session(client, new_user):
+    email, current = new_user()
+    other = login(client, email)
+    response = client.post("/auth/change-password", headers=current, json={
+        "old_password": "password123", "new_password": "password456",
+    })
+    assert response.status_code == 204
+    assert client.get("/auth/me", headers=current).status_code == 200
+    assert client.get("/auth/me", headers=other).status_code == 401
+    assert client.post("/auth/login", json={"email": email, "password": "password123"}).status_code == 400
+    login(client, email, "password456")
+
+
+def test_revocation_by_another_worker_applies_after_the_background_refresh(client, auth, db, monkeypatch):
+    assert client.get("/auth/me", headers=auth).status_code == 200
+    # Another worker logs this session out: only the sessions table changes here
+    db.execute(
+        update(SessionModel).filter(SessionModel.jti == jti(auth)).values(is_active=False, revoked_at=datetime.utcnow())
+    )
+    db.commit()
+
+    # The request path never queries for revocations, so it stays fast (and off
+    # the event loop) until the periodic job has polled the table.
+    def no_queries():
+        raise AssertionError("the request path queried the sessions table")
+
+    monkeypatch.setattr(sessions, "SessionLocal", no_queries)
+    monkeypatch.setattr(settings, "SESSION_REVOCATION_REFRESH_SECONDS", 0)
+    assert client.get("/auth/me", headers=auth).status_code == 200
+    monkeypatch.undo()
+
+    sessions.refresh_revocations()
+    assert client.get("/auth/me", headers=auth).status_code == 401
+
+
+def test_login_survives_a_dead_hashing_process(client, new_user, monkeypatch):
+    email, _ = new_user()
+    monkeypatch.setattr(settings, "HASH_POOL_WORKERS", 1)
+    try:
+        assert hashing.verify_password("password123", hashing.hash_password("password123"))
+        for process in list(hashing._get_pool()._processes.values()):
+            process.kill()  # as an OOM kill would
+
+        login(client, email)
+        login(client, email)  # and the replacement pool keeps serving
+    finally:
+        hashing.shutdown_hash_pool()
+
+
+def test_user_deactivated_by_another_worker_is_refused_once_the_principal_expires(client, auth, db, monkeypatch):
+    user_id = client.get("/auth/me", headers=auth).json()["id"]  # caches the principal in this worker
+    db.execute(update(User).filter(User.id == user_id).values(is_active=False))
+    db.commit()
+
+    assert settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS <= 5
+    now = time.monotonic()
+    later = SimpleNamespace(monotonic=lambda: now + settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS + 1)
+    monkeypatch.setattr(cache, "time", later)  # the TTL has run out
+    assert client.get("/auth/me", headers=auth).status_code == 403
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from app.models.transaction import Transaction, TransactionType
+from app.utils.etag import bump_data_version
+from app.utils.rollups import add_to_rollup
+
+
+def test_budget_status_counts_this_cycles_expenses(client, auth):
+    client.post("/budgets", headers=auth, json={"amount_limit": 100, "cycle": "monthly", "category": "Dining"})
+    client.post("/budgets", headers=auth, json={"amount_limit": 500, "cycle": "weekly"})
+    for amount, category, type in ((30, "Dining", "expense"), (12.5, "Transport", "expense"), (1000, "Salary", "income")):
+        client.post("/transactions", headers=auth, json={"amount": amount, "category": category, "type": type})
+    # Last year's spending is outside both cycle windows
+    client.post("/transactions", headers=auth, json={
+        "amount": 99, "category": "Dining", "type": "expense", "date": "2000-01-01T12:00:00",
+    })
+
+    statuses = client.get("/budgets/status", headers=auth).json()
+    dining = next(s for s in statuses if s["category"] == "Dining")
+    assert (dining["spent"], dining["remaining"], dining["percent_used"]) == (30, 70, 30.0)
+    assert next(s for s in statuses if s["category"] is None)["spent"] == 42.5
+
+
+def test_budget_status_sees_writes_made_by_another_worker(client, auth, db):
+    client.post("/budgets", headers=auth, json={"amount_limit": 100, "cycle": "monthly", "category": "Dining"})
+    client.post("/transactions", headers=auth, json={"amount": 10, "category": "Dining", "type": "expense"})
+    first = client.get("/budgets/status", headers=auth)
+    assert first.json()[0]["spent"] == 10
+
+    # A write through the database only, as another worker process makes it:
+    # no in-process cache listener runs here.
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+    transaction = Transaction(
+        user_id=user_id, amount=15, category="Dining", type=TransactionType.expense, date=datetime.now(),
+        change_seq=bump_data_version(db, user_id),
+    )
+    db.add(transaction)
+    db.flush()
+    add_to_rollup(db, transaction)
+    db.commit()
+
+    again = client.get("/budgets/status", headers={**auth, "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 200
+    assert again.json()[0]["spent"] == 25
+    assert again.headers["etag"] != first.headers["etag"]
@@ -0,0 +1,79 @@
+import os
+import socket
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.models.export_log import ExportLog
+from app.utils.export_jobs import fail_orphaned_exports, sweep_exports
+
+
+def pending_job(db, user_id, worker, name, created_at=None):
+    path = os.path.join(settings.EXPORT_DIR, name)
+    with open(path + ".part", "wb") as partial:
+        partial.write(b"date,amount\n")
+    export = ExportLog(user_id=user_id, format="csv", file_path=path, status="pending", worker=worker)
+    if created_at is not None:
+        export.created_at = created_at
+    db.add(export)
+    db.commit()
+    return export
+
+
+def test_export_job_writes_a_downloadable_file(client, auth):
+    client.post("/transactions", headers=auth, json={"amount": 12.5, "category": "Dining", "type": "expense"})
+    job = client.post("/export/jobs?format=csv", headers=auth)
+    assert job.status_code == 202
+    job_id = job.json()["id"]
+
+    # The test client runs background tasks before returning
+    assert client.get("/export/jobs", headers=auth).json()[0]["status"] == "completed"
+    download = client.get(f"/export/jobs/{job_id}/download", headers=auth)
+    assert download.status_code == 200
+    assert f"-{job_id}.csv" in download.headers["content-disposition"]
+    assert "Dining" in download.text
+
+
+def test_starting_worker_fails_only_jobs_whose_worker_has_exited(client, auth, db):
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+    host = socket.gethostname()
+    sibling = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    try:
+        running = pending_job(db, user_id, f"{host}:{sibling.pid}", "sibling.csv")
+        mine = pending_job(db, user_id, f"{host}:{os.getpid()}", "mine.csv")
+        elsewhere = pending_job(db, user_id, f"other-{host}:{exited.pid}", "elsewhere.csv")
+        orphaned = pending_job(db, user_id, f"{host}:{exited.pid}", "orphaned.csv")
+
+        assert fail_orphaned_exports() == 1
+        db.expire_all()
+        assert [e.status for e in (running, mine, elsewhere, orphaned)] == ["pending", "pending", "pending", "failed"]
+        assert os.path.exists(running.file_path + ".part")
+        assert not os.path.exists(orphaned.file_path + ".part")
+    finally:
+        sibling.kill()
+        sibling.wait()
+
+
+def test_sweep_fails_stuck_jobs_and_expires_old_files(client, auth, db):
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+    now = datetime.now(timezone.utc)
+    stuck = pending_job(
+        db, user_id, "gone-host:1", "stuck.csv", now - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT_SECONDS + 60)
+    )
+    recent = pending_job(db, user_id, "gone-host:1", "recent.csv")
+    old = ExportLog(
+        user_id=user_id, format="csv", file_path=os.path.join(settings.EXPORT_DIR, "old.csv"), status="completed",
+        created_at=now - timedelta(hours=settings.EXPORT_RETENTION_HOURS + 1),
+    )
+    with open(old.file_path, "wb") as out:
+        out.write(b"date,amount\n")
+    db.add(old)
+    db.commit()
+
+    assert sweep_exports() >= 1
+    db.expire_all()
+    assert (stuck.status, recent.status, old.status) == ("failed", "pending", "expired")
+    assert not os.path.exists(old.file_path)
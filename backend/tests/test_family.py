@@ -0,0 +1,64 @@
+def post_expense(client, headers, amount, category="Groceries"):
+    response = client.post("/transactions", headers=headers, json={
+        "amount": amount, "category": category, "type": "expense", "date": "2024-03-01T12:00:00",
+    })
+    assert response.status_code == 201, response.text
+
+
+def invite(client, admin, group_id, email):
+    response = client.post("/family/members", headers=admin, json={"family_group_id": group_id, "email": email})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_invited_user_stays_invisible_until_they_accept(client, new_user):
+    admin_email, admin = new_user()
+    invitee_email, invitee = new_user()
+    post_expense(client, admin, 10)
+    post_expense(client, invitee, 500, "Rent")
+    group_id = client.post("/family", headers=admin, json={"name": "Household"}).json()["id"]
+
+    assert invite(client, admin, group_id, invitee_email)["accepted_at"] is None
+    summary = client.get(f"/family/{group_id}/summary", headers=admin).json()
+    assert [m["email"] for m in summary["members"]] == [admin_email]
+    assert summary["totals"]["expense"] == 10
+    assert [c["category"] for c in summary["categories"]] == ["Groceries"]
+    # Nor can the invitee see the group before accepting
+    assert client.get(f"/family/{group_id}/summary", headers=invitee).status_code == 404
+    assert client.get("/family", headers=invitee).json() == []
+    assert [g["id"] for g in client.get("/family/invitations", headers=invitee).json()] == [group_id]
+
+    accepted = client.post(f"/family/{group_id}/accept", headers=invitee)
+    assert accepted.status_code == 200 and accepted.json()["accepted_at"] is not None
+    summary = client.get(f"/family/{group_id}/summary", headers=admin).json()
+    assert {m["email"]: m["expense"] for m in summary["members"]}[invitee_email] == 500
+    assert summary["totals"]["expense"] == 510
+    assert client.get("/family/invitations", headers=invitee).json() == []
+    assert client.post(f"/family/{group_id}/accept", headers=invitee).status_code == 404
+
+
+def test_only_the_invitee_can_accept_and_they_may_decline(client, new_user):
+    _, admin = new_user()
+    invitee_email, invitee = new_user()
+    _, stranger = new_user()
+    group_id = client.post("/family", headers=admin, json={"name": "Household"}).json()["id"]
+    invite(client, admin, group_id, invitee_email)
+
+    assert client.post(f"/family/{group_id}/accept", headers=stranger).status_code == 404
+    assert client.post(f"/family/{group_id}/accept", headers=admin).status_code == 404
+    invitee_id = client.get("/auth/me", headers=invitee).json()["id"]
+    assert client.delete(f"/family/{group_id}/members/{invitee_id}", headers=invitee).status_code == 204
+    assert client.get("/family/invitations", headers=invitee).json() == []
+    assert client.post(f"/family/{group_id}/accept", headers=invitee).status_code == 404
+
+
+def test_family_summary_follows_member_writes(client, new_user):
+    member_email, member = new_user()
+    _, admin = new_user()
+    group_id = client.post("/family", headers=admin, json={"name": "Household"}).json()["id"]
+    invite(client, admin, group_id, member_email)
+    client.post(f"/family/{group_id}/accept", headers=member)
+
+    assert client.get(f"/family/{group_id}/summary", headers=admin).json()["totals"]["expense"] == 0
+    post_expense(client, member, 25)
+    assert client.get(f"/family/{group_id}/summary", headers=admin).json()["totals"]["expense"] == 25
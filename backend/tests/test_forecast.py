@@ -0,0 +1,47 @@
+from datetime import date
+
+
+def months_ago(n, day):
+    year, month = divmod(date.today().year * 12 + date.today().month - 1 - n, 12)
+    return f"{year}-{month + 1:02d}-{day:02d}T12:00:00"
+
+
+def post(client, auth, amount, category, when):
+    response = client.post("/transactions", headers=auth, json={
+        "amount": amount, "category": category, "type": "expense", "date": when,
+    })
+    assert response.status_code == 201, response.text
+
+
+def test_steady_monthly_spending_is_forecast_flat(client, auth):
+    for n in range(1, 13):
+        post(client, auth, 100, "Rent", months_ago(n, 5))
+        post(client, auth, 15.99, "Subscriptions", months_ago(n, 10))
+
+    forecast = client.get("/forecast", headers=auth, params={"horizon": 3}).json()
+    assert (forecast["bucket"], forecast["horizon"], len(forecast["periods"])) == ("month", 3, 3)
+    assert forecast["periods"][0] == date.today().replace(day=1).isoformat()
+    by_category = {c["category"]: c for c in forecast["categories"]}
+    assert by_category["Rent"]["forecast"] == [100.0] * 3
+    assert by_category["Subscriptions"]["mean_absolute_error"] == 0.0
+    assert forecast["totals"] == [115.99] * 3
+
+
+def test_forecast_is_stored_until_the_next_write(client, auth):
+    for n in range(1, 7):
+        post(client, auth, 50, "Groceries", months_ago(n, 3))
+    first = client.get("/forecast", headers=auth)
+    again = client.get("/forecast", headers=auth)
+    assert again.json()["computed_at"] == first.json()["computed_at"]
+    assert client.get("/forecast", headers={**auth, "If-None-Match": first.headers["etag"]}).status_code == 304
+
+    post(client, auth, 50, "Transport", months_ago(1, 3))
+    after = client.get("/forecast", headers=auth).json()
+    assert after["computed_at"] != first.json()["computed_at"]
+    assert "Transport" in {c["category"] for c in after["categories"]}
+
+
+def test_forecast_without_history_is_empty(client, auth):
+    forecast = client.get("/forecast", headers=auth, params={"bucket": "week", "horizon": 4}).json()
+    assert forecast["categories"] == []
+    assert forecast["totals"] == [0.0] * 4
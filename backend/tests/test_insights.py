@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from tests.test_forecast import months_ago, post
+
+
+def test_insights_find_outliers_and_recurring_charges(client, auth):
+    for n in range(1, 13):
+        response = client.post("/transactions", headers=auth, json={
+            "amount": 15.99, "category": "Subscriptions", "type": "expense",
+            "description": f"NETFLIX.COM {1000 + n}", "date": months_ago(n, 10),
+        })
+        assert response.status_code == 201
+    for n in range(12):
+        post(client, auth, 20 + n % 3, "Dining", (datetime.now() - timedelta(days=60 - n * 4)).isoformat())
+    post(client, auth, 400, "Dining", (datetime.now() - timedelta(days=1)).isoformat())
+
+    insights = client.get("/insights", headers=auth).json()
+    assert insights["transactions"] == 25
+    assert [(o["category"], o["amount"]) for o in insights["outliers"]] == [("Dining", 400.0)]
+    [recurring] = insights["recurring"]
+    assert (recurring["category"], recurring["cadence"], recurring["amount"]) == ("Subscriptions", "monthly", 15.99)
+    assert recurring["active"] is True
+    dining = next(c for c in insights["categories"] if c["category"] == "Dining")
+    assert dining["count"] == 13
+
+
+def test_insights_follow_writes(client, auth):
+    post(client, auth, 10, "Dining", months_ago(1, 1))
+    first = client.get("/insights", headers=auth)
+    assert client.get("/insights", headers={**auth, "If-None-Match": first.headers["etag"]}).status_code == 304
+    post(client, auth, 12, "Dining", months_ago(1, 2))
+    assert client.get("/insights", headers=auth).json()["transactions"] == 2
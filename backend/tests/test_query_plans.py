@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+from tests.conftest import BACKEND_DIR
+
+
+def test_every_statement_uses_an_index(tmp_path):
+    # Its own process and database: the check migrates with Alembic and seeds a few hundred users.
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.check_query_plans", "--url", f"sqlite:///{tmp_path / 'plans.db'}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout[-4000:] + result.stderr[-4000:]
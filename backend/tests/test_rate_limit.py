@@ -0,0 +1,49 @@
+import pytest
+
+from app.config import settings
+from app.utils import rate_limit
+
+
+@pytest.fixture
+def limit(monkeypatch):
+    """Call with n to allow n login attempts per window from here on, with a fresh limiter."""
+
+    def set_limit(n):
+        monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT", n)
+        rate_limit._limiter = None
+
+    yield set_limit
+    rate_limit._limiter = None
+
+
+def test_login_attempts_past_the_limit_get_429(client, new_user, limit):
+    email, _ = new_user()
+    limit(3)
+    for _ in range(3):
+        assert client.post("/auth/login", json={"email": email, "password": "wrong-password"}).status_code == 400
+    response = client.post("/auth/login", json={"email": email, "password": "password123"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+def test_limits_are_kept_per_email_and_per_ip(client, new_user, limit):
+    first, _ = new_user()
+    second, _ = new_user()
+    limit(2)
+    client.post("/auth/login", json={"email": first, "password": "wrong-password"})
+    client.post("/auth/login", json={"email": first, "password": "wrong-password"})
+    assert client.post("/auth/login", json={"email": first, "password": "password123"}).status_code == 429
+    # The IP has used its two attempts too, so another account from it is refused as well
+    assert client.post("/auth/login", json={"email": second, "password": "password123"}).status_code == 429
+
+
+def test_login_keeps_working_when_redis_is_down(client, new_user, limit, monkeypatch):
+    pytest.importorskip("redis")
+    email, _ = new_user()
+    monkeypatch.setattr(settings, "RATE_LIMIT_REDIS_URL", "redis://127.0.0.1:1/0")  # nothing listens there
+    limit(3)
+    assert client.post("/auth/login", json={"email": email, "password": "password123"}).status_code == 200
+    for _ in range(2):
+        client.post("/auth/login", json={"email": email, "password": "wrong-password"})
+    # Counted per worker for the outage, but still counted
+    assert client.post("/auth/login", json={"email": email, "password": "password123"}).status_code == 429
@@ -0,0 +1,221 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.user import User
+from app.utils.rollups import find_rollup_mismatches
+
+START = datetime(2024, 3, 1, 12, 0)
+
+
+def create(client, auth, days=0, amount=10.0, category="Groceries", type="expense", description=None):
+    response = client.post("/transactions", headers=auth, json={
+        "amount": amount, "category": category, "type": type, "description": description,
+        "date": (START + timedelta(days=days)).isoformat(),
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def import_csv(client, auth, text):
+    response = client.post(
+        "/transactions/import", headers=auth, files={"file": ("bank.csv", io.BytesIO(text.encode()), "text/csv")}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def edit(client, auth, transaction, **changes):
+    # PUT replaces every field, so send the row back with the changes applied.
+    body = {key: transaction[key] for key in ("amount", "category", "type", "description", "date")}
+    response = client.put(f"/transactions/{transaction['id']}", headers=auth, json={**body, **changes})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def user_id(client, auth):
+    return client.get("/auth/me", headers=auth).json()["id"]
+
+
+def test_cursor_pagination_returns_every_row_once_newest_first(client, auth):
+    # Several rows share a date so the id tie-breaker is exercised too.
+    created = [create(client, auth, days=n // 3)["id"] for n in range(10)]
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3} if cursor is None else {"limit": 3, "cursor": cursor}
+        page = client.get("/transactions", headers=auth, params=params).json()
+        seen += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        # A row written while paging sorts before the cursor and must not shift later pages.
+        create(client, auth, days=30)
+
+    keys = [(item["date"], item["id"]) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert [item["id"] for item in seen if item["id"] in created] == sorted(
+        created, key=lambda i: (created.index(i) // 3, i), reverse=True
+    )
+    assert len({item["id"] for item in seen}) == len(seen)
+
+
+def test_cursor_pagination_respects_filters(client, auth):
+    for n in range(4):
+        create(client, auth, days=n, category="Dining" if n % 2 else "Transport")
+    page = client.get("/transactions", headers=auth, params={"category": "Dining", "limit": 1}).json()
+    rest = client.get("/transactions", headers=auth, params={"category": "Dining", "cursor": page["next_cursor"]}).json()
+    assert [item["category"] for item in page["items"] + rest["items"]] == ["Dining", "Dining"]
+    assert rest["next_cursor"] is None
+
+
+def test_rollups_match_raw_rows_after_every_kind_of_write(client, auth, db):
+    first = create(client, auth, amount=12.5)
+    second = create(client, auth, days=1, amount=40, category="Dining")
+    create(client, auth, days=1, amount=2500, category="Salary", type="income")
+    edit(client, auth, first, amount=99, category="Dining")
+    client.delete(f"/transactions/{second['id']}", headers=auth)
+    import_csv(client, auth, "date,amount,category,description\n2024-03-05,-7.25,Transport,Bus\n")
+    client.post("/transactions/batch", headers=auth, json={
+        "create": [{"amount": 3, "category": "Transport", "type": "expense", "date": START.isoformat()}],
+        "update": [{"id": first["id"], "date": (START + timedelta(days=2)).isoformat()}],
+    })
+
+    uid = user_id(client, auth)
+    assert find_rollup_mismatches(db, uid) == []
+    summary = client.get("/transactions/summary", headers=auth).json()
+    raw = db.scalars(select(User).filter(User.id == uid)).one().transactions
+    assert summary["expense"] == sum(t.amount for t in raw if t.type.value == "expense")
+    assert summary["count"] == len(raw)
+
+
+def test_concurrent_edits_and_deletes_in_one_bucket_keep_the_rollup_exact(client, auth, db, postgresql_only):
+    # Every row lands in the same (user, category, type, day) bucket, so each
+    # write recomputes it while the others are in flight.
+    rows = [create(client, auth, amount=n + 1) for n in range(40)]
+
+    def write(row):
+        if row["id"] % 2:
+            edit(client, auth, row, amount=row["amount"] * 10)
+        else:
+            assert client.delete(f"/transactions/{row['id']}", headers=auth).status_code == 204
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(write, rows))
+    assert find_rollup_mismatches(db, user_id(client, auth)) == []
+
+
+def test_import_skips_rows_already_imported(client, auth):
+    # The same purchase twice on one day is two transactions, not a duplicate.
+    csv = (
+        "date,amount,category,description\n"
+        "2024-01-02,-12.50,Dining,Lunch\n"
+        "2024-01-02,-12.50,Dining,Lunch\n"
+        "2024-01-03,2500,Salary,Pay\n"
+    )
+    first = import_csv(client, auth, csv)
+    assert (first["imported"], first["duplicates"]) == (3, 0)
+
+    again = import_csv(client, auth, csv + "2024-01-04,-3,Transport,Bus\n")
+    assert (again["rows"], again["imported"], again["duplicates"]) == (4, 1, 3)
+    assert len(client.get("/transactions", headers=auth).json()["items"]) == 4
+
+
+def test_import_reports_invalid_rows(client, auth):
+    report = import_csv(client, auth, "date,amount,category,description\nnot-a-date,-1,Dining,x\n2024-01-02,-1,Dining,y\n")
+    assert (report["imported"], report["failed"]) == (1, 1)
+    assert report["errors"][0]["row"] == 2  # the header is line 1
+
+
+def test_atomic_batch_with_a_bad_item_writes_nothing(client, auth):
+    existing = create(client, auth)
+    etag = client.get("/transactions", headers=auth).headers["etag"]
+
+    response = client.post("/transactions/batch", headers=auth, json={
+        "mode": "atomic",
+        "create": [{"amount": 5, "category": "Transport", "type": "expense"}],
+        "update": [{"id": existing["id"], "amount": 1}],
+        "delete": [existing["id"] + 10_000],
+    })
+    assert response.status_code == 409
+    body = response.json()
+    assert body["applied"] is False
+    assert [(r["op"], r["status"]) for r in body["results"]] == [("delete", 404)]
+
+    listing = client.get("/transactions", headers=auth)
+    assert [(item["id"], item["amount"]) for item in listing.json()["items"]] == [(existing["id"], 10.0)]
+    assert listing.headers["etag"] == etag
+
+
+def test_best_effort_batch_applies_the_valid_items(client, auth):
+    existing = create(client, auth)
+    response = client.post("/transactions/batch", headers=auth, json={
+        "mode": "best_effort",
+        "create": [{"amount": 5, "category": "Transport", "type": "expense"}],
+        "update": [{"id": existing["id"], "amount": 1}],
+        "delete": [existing["id"] + 10_000],
+    })
+    assert response.status_code == 200
+    assert response.json()["applied"] is True
+    statuses = {(r["op"], r["status"]) for r in response.json()["results"]}
+    assert statuses == {("create", 201), ("update", 200), ("delete", 404)}
+    amounts = sorted(item["amount"] for item in client.get("/transactions", headers=auth).json()["items"])
+    assert amounts == [1.0, 5.0]
+
+
+def test_unchanged_reads_answer_304_until_the_next_write(client, auth):
+    create(client, auth)
+    for path in ("/transactions", "/transactions/summary", "/transactions/summary/categories", "/budgets"):
+        first = client.get(path, headers=auth)
+        etag = first.headers["etag"]
+        again = client.get(path, headers={**auth, "If-None-Match": etag})
+        assert again.status_code == 304, path
+        assert again.content == b""
+
+    etag = client.get("/transactions/summary", headers=auth).headers["etag"]
+    create(client, auth, amount=1)
+    after = client.get("/transactions/summary", headers={**auth, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+
+
+def test_etags_differ_between_users_and_queries(client, auth, new_user):
+    _, other_auth = new_user()
+
+    mine = client.get("/transactions", headers=auth).headers["etag"]
+    assert client.get("/transactions", headers=other_auth).headers["etag"] != mine
+    assert client.get("/transactions?limit=5", headers=auth).headers["etag"] != mine
+
+
+def test_change_feed_reports_creates_updates_and_deletes_since_the_cursor(client, auth):
+    kept = create(client, auth)
+    removed = create(client, auth, days=1)
+    initial = client.get("/transactions/changes", headers=auth).json()
+    assert {row["id"] for row in initial["changes"]} == {kept["id"], removed["id"]}
+    assert initial["deleted"] == [] and initial["has_more"] is False
+
+    quiet = client.get("/transactions/changes", headers=auth, params={"since": initial["next_cursor"]}).json()
+    assert (quiet["changes"], quiet["deleted"]) == ([], [])
+
+    edit(client, auth, kept, amount=42)
+    client.delete(f"/transactions/{removed['id']}", headers=auth)
+    added = create(client, auth, days=2)
+    delta = client.get("/transactions/changes", headers=auth, params={"since": initial["next_cursor"]}).json()
+    assert [(row["id"], row["amount"]) for row in delta["changes"]] == [(kept["id"], 42.0), (added["id"], 10.0)]
+    assert delta["deleted"] == [removed["id"]]
+
+
+def test_change_feed_pages_in_change_order(client, auth):
+    created = [create(client, auth, days=n) for n in range(5)]
+    ids = [row["id"] for row in created]
+    edit(client, auth, created[0], amount=1)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "since": cursor}
+        page = client.get("/transactions/changes", headers=auth, params=params).json()
+        seen += [row["id"] for row in page["changes"]]
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+    assert seen == ids[1:] + ids[:1]